@@ -5,3 +5,30 @@ DB_CONFIG = {
     "host": "localhost",
     "port": "5432"
 }
+
+# Connection pool (per process)
+POOL_MIN_SIZE = 1
+POOL_MAX_SIZE = 10
+POOL_HEALTH_CHECK_SECONDS = 30   # idle time after which a checkout runs SELECT 1
+POOL_TIMEOUT_SECONDS = 30        # max wait for a free connection
+
+# Schedule read cache (per process), see backend/schedule_cache.py
+SCHEDULE_CACHE_STUDENT_ENTRIES = 5000
+SCHEDULE_CACHE_STUDENT_BYTES = 32 * 1024 * 1024
+SCHEDULE_CACHE_PROF_ENTRIES = 1000
+SCHEDULE_CACHE_PAGE_ENTRIES = 512
+
+# LISTEN/NOTIFY channel announcing schedule writes to every app process
+SCHEDULE_NOTIFY_CHANNEL = "schedule_changed"
+SCHEDULE_LISTENER_RECONNECT_SECONDS = 5
+
+# Schedule browsing (doyen / chef dashboards)
+SCHEDULE_PAGE_SIZE = 50
+
+# Background generation jobs (backend/jobs.py)
+JOB_START_METHOD = "spawn"      # multiprocessing start method of job processes
+JOB_POLL_SECONDS = 2            # dashboard refresh / cancellation check interval
+JOB_ADVISORY_LOCK_KEY = 4807     # pg_advisory_lock key held by the running generation
+
+# Schedule versions (backend/database.py): retired versions kept for rollback
+SCHEDULE_VERSIONS_KEPT = 2
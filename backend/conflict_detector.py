@@ -1,3 +1,5 @@
+from bisect import bisect_left, insort
+from collections import defaultdict
 from datetime import timedelta, datetime
 
 # =====================================
@@ -106,6 +108,157 @@ def equal_distribution_of_surveillance(existing_exams, prof_list):
         return False, "Professor exam load is unbalanced"
     return True, None
 
+# =====================================
+# INDEXED CONSTRAINT STATE
+# =====================================
+
+class ConstraintState:
+    """
+    Incremental index over accepted exams, so each proposal is checked
+    without rescanning them:
+    - per room: sorted (start, end) intervals -> overlap test in O(log n)
+    - per (student, day) and (professor, day): exam counters -> O(1)
+    - per professor: load, plus a load histogram for the running min/max
+    Exams are dicts with module_id, salle_id, prof_id, date_heure,
+    duree_minutes and students (same shape as existing_exams).
+    Building one costs a full pass over the exams, so the list-based
+    checkers scan instead; a scheduler placing exams one by one keeps its
+    own and add()s each accepted exam.
+    """
+
+    def __init__(self, prof_list=(), exams=()):
+        self.room_intervals = defaultdict(list)   # salle_id -> sorted [(start, end)]
+        self.room_longest = defaultdict(int)      # salle_id -> longest duration (minutes)
+        self.module_count = defaultdict(int)
+        self.student_day = defaultdict(int)       # (student, date) -> exams
+        self.prof_day = defaultdict(int)          # (prof_id, date) -> exams
+        self.prof_load = {}
+        self.load_histogram = defaultdict(int)    # load -> number of professors
+        self.min_load = 0
+        self.max_load = 0
+        self.register_professors(prof_list)
+        for exam in exams:
+            self.add(exam)
+
+    # ---------- MAINTENANCE ----------
+
+    def register_professors(self, prof_list):
+        for prof in prof_list:
+            if prof["id"] not in self.prof_load:
+                self._set_load(prof["id"], None, 0)
+
+    def _set_load(self, prof_id, old, new):
+        if old is not None:
+            self.load_histogram[old] -= 1
+            if self.load_histogram[old] == 0:
+                del self.load_histogram[old]
+        self.load_histogram[new] += 1
+        self.prof_load[prof_id] = new
+
+        if len(self.prof_load) == 1 and old is None:
+            self.min_load = self.max_load = new
+            return
+        self.max_load = max(self.max_load, new)
+        self.min_load = min(self.min_load, new)
+        while self.max_load not in self.load_histogram:
+            self.max_load -= 1
+        while self.min_load not in self.load_histogram:
+            self.min_load += 1
+
+    def add(self, exam):
+        start = exam["date_heure"]
+        end = start + timedelta(minutes=exam["duree_minutes"])
+        day = start.date()
+        insort(self.room_intervals[exam["salle_id"]], (start, end))
+        self.room_longest[exam["salle_id"]] = max(self.room_longest[exam["salle_id"]],
+                                                  exam["duree_minutes"])
+        self.module_count[exam["module_id"]] += 1
+        for student in exam.get("students", ()):
+            self.student_day[(student, day)] += 1
+        self.prof_day[(exam["prof_id"], day)] += 1
+        old = self.prof_load.get(exam["prof_id"])
+        self._set_load(exam["prof_id"], old, (old or 0) + 1)
+
+    def remove(self, exam):
+        start = exam["date_heure"]
+        end = start + timedelta(minutes=exam["duree_minutes"])
+        day = start.date()
+        intervals = self.room_intervals[exam["salle_id"]]
+        del intervals[bisect_left(intervals, (start, end))]
+        self._decrement(self.module_count, exam["module_id"])
+        for student in exam.get("students", ()):
+            self._decrement(self.student_day, (student, day))
+        self._decrement(self.prof_day, (exam["prof_id"], day))
+        old = self.prof_load[exam["prof_id"]]
+        self._set_load(exam["prof_id"], old, old - 1)
+
+    @staticmethod
+    def _decrement(counter, key):
+        counter[key] -= 1
+        if counter[key] <= 0:
+            del counter[key]
+
+    # ---------- CHECKS ----------
+
+    def room_not_occupied(self, salle_id, date_heure, duree):
+        intervals = self.room_intervals.get(salle_id)
+        if intervals:
+            new_end = date_heure + timedelta(minutes=duree)
+            i = bisect_left(intervals, (date_heure,))
+            # The next exam may start before the new one ends
+            if i < len(intervals) and intervals[i][0] < new_end:
+                return False, f"Salle {salle_id} is occupied"
+            # Earlier exams may still be running; only those that started
+            # within the room's longest duration can be
+            earliest = date_heure - timedelta(minutes=self.room_longest[salle_id])
+            j = i - 1
+            while j >= 0 and intervals[j][0] > earliest:
+                if intervals[j][1] > date_heure:
+                    return False, f"Salle {salle_id} is occupied"
+                j -= 1
+        return True, None
+
+    def module_only_once(self, module_id):
+        if self.module_count.get(module_id):
+            return False, "This module already has an exam scheduled"
+        return True, None
+
+    def students_one_exam_per_day(self, module_students, date_heure):
+        exam_day = date_heure.date()
+        for student in module_students:
+            if (student, exam_day) in self.student_day:
+                return False, "Student conflict: multiple exams in same day"
+        return True, None
+
+    def professors_max_three_per_day(self, prof_id, date_heure):
+        if self.prof_day.get((prof_id, date_heure.date()), 0) >= 3:
+            return False, f"Professor {prof_id} already has 3 exams scheduled that day"
+        return True, None
+
+    def equal_distribution_of_surveillance(self):
+        if self.prof_load and self.max_load - self.min_load > 1:
+            return False, "Professor exam load is unbalanced"
+        return True, None
+
+    def is_valid(self, module_id, module_students, salle, prof, date_heure, duree,
+                 module_department_id):
+        """Same checks, order and messages as is_exam_valid"""
+        checks = (
+            lambda: no_friday_constraint(date_heure),
+            lambda: self.module_only_once(module_id),
+            lambda: self.room_not_occupied(salle["salle_id"], date_heure, duree),
+            lambda: self.students_one_exam_per_day(module_students, date_heure),
+            lambda: self.professors_max_three_per_day(prof["id"], date_heure),
+            lambda: room_capacity_constraint(salle, len(module_students)),
+            lambda: professors_department_priority(prof, module_department_id),
+            lambda: self.equal_distribution_of_surveillance()
+        )
+        for check in checks:
+            ok, reason = check()
+            if not ok:
+                return False, reason
+        return True, None
+
 # =====================================
 # GLOBAL EXAM VALIDATION
 # =====================================
@@ -116,18 +269,19 @@ def is_exam_valid(existing_exams, module_id, module_students,
     """
     Checks all constraints for a proposed exam
     """
-    checks = [
-        no_friday_constraint(date_heure),
-        module_only_once(existing_exams, module_id),
-        room_not_occupied(existing_exams, salle["salle_id"], date_heure, duree),
-        students_one_exam_per_day(existing_exams, module_students, date_heure),
-        professors_max_three_per_day(existing_exams, prof["id"], date_heure),
-        room_capacity_constraint(salle, len(module_students)),
-        professors_department_priority(prof, module_department_id),
-        equal_distribution_of_surveillance(existing_exams, prof_list)
-    ]
-
-    for ok, reason in checks:
+    checks = (
+        lambda: no_friday_constraint(date_heure),
+        lambda: module_only_once(existing_exams, module_id),
+        lambda: room_not_occupied(existing_exams, salle["salle_id"], date_heure, duree),
+        lambda: students_one_exam_per_day(existing_exams, module_students, date_heure),
+        lambda: professors_max_three_per_day(existing_exams, prof["id"], date_heure),
+        lambda: room_capacity_constraint(salle, len(module_students)),
+        lambda: professors_department_priority(prof, module_department_id),
+        lambda: equal_distribution_of_surveillance(existing_exams, prof_list)
+    )
+    # Stop at the first failure: the later scans are not needed for the verdict
+    for check in checks:
+        ok, reason = check()
         if not ok:
             return False, reason
     return True, None
@@ -0,0 +1,126 @@
+from collections import defaultdict
+import heapq
+import random
+
+import numpy as np
+
+from backend.room_packing import RoomClasses
+
+# =====================================
+# CONFLICT GRAPH
+# =====================================
+
+def graph_from_pairs(module_ids, pairs):
+    """
+    Builds the module conflict graph from conflicting (module, module) pairs,
+    e.g. ScheduleProblem.conflict_pairs(): linked modules share at least one
+    student, so they can never be scheduled on the same day.
+    Pairs outside module_ids are ignored.
+    """
+    graph = {m: set() for m in module_ids}
+    for m1, m2 in pairs:
+        if m1 in graph and m2 in graph:
+            graph[m1].add(m2)
+            graph[m2].add(m1)
+    return graph
+
+# =====================================
+# DSATUR SLOT ASSIGNMENT
+# =====================================
+
+def dsatur_assign_slots(graph, demand, slots, room_count, prof_count,
+                        max_prof_per_day, rng=None, stats=None, seats=None, room_capacity=None):
+    """
+    Assigns a slot to every module with a saturation-ordered (DSATUR) coloring.
+    Colors are exam days: neighbours in the conflict graph never share a day.
+    A slot only accepts a module if its free rooms can seat the module and
+    enough proctors (one per room) remain free in it.
+
+    demand: module_id -> fewest rooms (and proctors) the module needs
+    seats / room_capacity: optional module_id -> students to seat, and the
+           capacity of every room; rooms are then packed per slot (see
+           RoomClasses). Without them every module needs demand[m] rooms.
+    slots: list of datetimes
+    stats: optional counter dict, incremented with "slots_tried",
+           "room_rejections" and "prof_rejections"
+    Returns (assignment, unscheduled) where assignment maps module_id -> slot index.
+    """
+    rng = rng or random.Random()
+    slots_tried = room_rejections = prof_rejections = 0
+
+    days = sorted({s.date() for s in slots})
+    day_index = {d: i for i, d in enumerate(days)}
+    slots_by_day = defaultdict(list)
+    for idx, s in enumerate(slots):
+        slots_by_day[day_index[s.date()]].append(idx)
+
+    if room_capacity is None:
+        room_capacity, seats = np.ones(room_count, dtype=np.int64), demand
+    rooms = RoomClasses(room_capacity, len(slots))
+    profs_left = [prof_count] * len(slots)
+    day_profs_left = [prof_count * max_prof_per_day] * len(days)
+    day_load = [0] * len(days)
+
+    saturation = {m: set() for m in graph}    # days blocked by scheduled neighbours
+    assignment = {}
+    unscheduled = []
+
+    # Max-heap on (saturation, degree, demand); stale entries are skipped on pop
+    tie = {m: rng.random() for m in graph}
+    heap = [(0, -len(graph[m]), -demand[m], tie[m], m) for m in graph]
+    heapq.heapify(heap)
+    done = set()
+
+    while heap:
+        neg_sat, _, _, _, m = heapq.heappop(heap)
+        if m in done or -neg_sat != len(saturation[m]):
+            continue
+        done.add(m)
+        need = demand[m]
+
+        # Least loaded days first, so exams spread over the session
+        candidate_days = [d for d in range(len(days)) if d not in saturation[m]]
+        candidate_days.sort(key=lambda d: (day_load[d], rng.random()))
+
+        chosen = None
+        for d in candidate_days:
+            if day_profs_left[d] < need:
+                prof_rejections += 1
+                continue
+            # Best fit: the fewest rooms, then the slot with the fewest seats left
+            fitting = []
+            for s in slots_by_day[d]:
+                used = rooms.pack(s, seats[m])
+                if used is None:
+                    room_rejections += 1
+                elif profs_left[s] < sum(used) or day_profs_left[d] < sum(used):
+                    prof_rejections += 1
+                else:
+                    fitting.append((sum(used), rooms.seats_left(s), s, used))
+            slots_tried += len(slots_by_day[d])
+            if fitting:
+                chosen = min(fitting)
+                break
+
+        if chosen is None:
+            unscheduled.append(m)
+            continue
+
+        n_rooms, _, chosen, used = chosen
+        d = day_index[slots[chosen].date()]
+        assignment[m] = chosen
+        rooms.take(chosen, used)
+        profs_left[chosen] -= n_rooms
+        day_profs_left[d] -= n_rooms
+        day_load[d] += 1
+
+        for n in graph[m]:
+            if n not in done and d not in saturation[n]:
+                saturation[n].add(d)
+                heapq.heappush(heap, (-len(saturation[n]), -len(graph[n]), -demand[n], tie[n], n))
+
+    if stats is not None:
+        for name, n in (("slots_tried", slots_tried), ("room_rejections", room_rejections),
+                        ("prof_rejections", prof_rejections)):
+            stats[name] = stats.get(name, 0) + n
+    return assignment, unscheduled
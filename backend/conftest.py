@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import psycopg2
+import pytest
+
+from backend import database
+from backend.schedule_cache import bump_schedule_version
+from backend.config import DB_CONFIG
+
+SCHEMA_FILE = Path(__file__).resolve().parent.parent / "database" / "schema.sql"
+TEST_DBNAME = f"{DB_CONFIG['dbname']}_test"
+
+
+@pytest.fixture
+def schema_db(monkeypatch):
+    """
+    A fresh database built from database/schema.sql, used by the whole
+    backend for the test (the pool is recreated on it). Skipped when no
+    PostgreSQL server answers at DB_CONFIG.
+    """
+    try:
+        admin = psycopg2.connect(**dict(DB_CONFIG, dbname="postgres"))
+    except psycopg2.OperationalError:
+        pytest.skip("no PostgreSQL server at DB_CONFIG")
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute(f'DROP DATABASE IF EXISTS "{TEST_DBNAME}" WITH (FORCE)')
+        cur.execute(f'CREATE DATABASE "{TEST_DBNAME}"')
+
+    monkeypatch.setitem(DB_CONFIG, "dbname", TEST_DBNAME)
+    monkeypatch.setattr(database, "_pool", None)
+    bump_schedule_version()   # cached reads belong to the previous database
+    conn = psycopg2.connect(**DB_CONFIG)
+    with conn.cursor() as cur:
+        cur.execute(SCHEMA_FILE.read_text())
+    conn.commit()
+    try:
+        yield conn
+    finally:
+        conn.close()
+        if database._pool is not None:
+            database._pool.closeall()
+        with admin.cursor() as cur:
+            cur.execute(f'DROP DATABASE IF EXISTS "{TEST_DBNAME}" WITH (FORCE)')
+        admin.close()
@@ -1,7 +1,32 @@
+import io
+import os
+import select
+import threading
+import time
+from contextlib import contextmanager
+
 import psycopg2
-from psycopg2.extras import RealDictCursor
-from backend.config import DB_CONFIG
-from datetime import datetime
+from psycopg2 import extensions, sql
+from psycopg2.extras import Json, RealDictCursor
+from psycopg2.pool import PoolError
+from backend.config import (
+    DB_CONFIG,
+    JOB_ADVISORY_LOCK_KEY,
+    POOL_MIN_SIZE,
+    POOL_MAX_SIZE,
+    POOL_HEALTH_CHECK_SECONDS,
+    POOL_TIMEOUT_SECONDS,
+    SCHEDULE_CACHE_STUDENT_ENTRIES,
+    SCHEDULE_CACHE_STUDENT_BYTES,
+    SCHEDULE_CACHE_PROF_ENTRIES,
+    SCHEDULE_CACHE_PAGE_ENTRIES,
+    SCHEDULE_PAGE_SIZE,
+    SCHEDULE_NOTIFY_CHANNEL,
+    SCHEDULE_LISTENER_RECONNECT_SECONDS,
+    SCHEDULE_VERSIONS_KEPT
+)
+from backend.schedule_cache import cached_schedule, bump_schedule_version
+from datetime import datetime, date, time as dtime
 
 def get_connection():
     return psycopg2.connect(
@@ -12,28 +37,231 @@ def get_connection():
         port=DB_CONFIG["port"]
     )
 
+# =====================================
+# CONNECTION POOL
+# =====================================
+
+class ConnectionPool:
+    """
+    Thread-safe pool of warm connections.
+    Checkout replaces closed connections and runs SELECT 1 on connections
+    idle for more than `health_check_after` seconds. Returned connections
+    are rolled back if a transaction was left open.
+    """
+
+    def __init__(self, minconn, maxconn, connect=get_connection,
+                 health_check_after=POOL_HEALTH_CHECK_SECONDS, timeout=POOL_TIMEOUT_SECONDS):
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.health_check_after = health_check_after
+        self.timeout = timeout
+        self.pid = os.getpid()
+        self._connect = connect
+        self._idle = []              # [(conn, last returned at)]
+        self._size = 0               # open connections, idle or checked out
+        self._cond = threading.Condition()
+        for _ in range(minconn):
+            self._idle.append((connect(), time.monotonic()))
+            self._size += 1
+
+    def getconn(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._cond:
+                while not self._idle and self._size >= self.maxconn:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolError("connection pool exhausted")
+                    self._cond.wait(remaining)
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                else:
+                    self._size += 1
+                    conn = None
+
+            if conn is None:
+                try:
+                    return self._connect()
+                except Exception:
+                    self._forget()
+                    raise
+
+            if self._healthy(conn, last_used):
+                return conn
+            self._discard(conn)
+
+    def putconn(self, conn):
+        if not conn.closed:
+            try:
+                if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                conn.close()
+        if conn.closed:
+            self._forget()
+            return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def closeall(self):
+        with self._cond:
+            for conn, _ in self._idle:
+                conn.close()
+            self._size -= len(self._idle)
+            self._idle = []
+
+    def _healthy(self, conn, last_used):
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used < self.health_check_after:
+            return True
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.close()
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+        self._forget()
+
+    def _forget(self):
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+_inherited_pools = []   # pools of a parent process: never closed from a child
+
+def get_pool():
+    """Process-wide pool, created on first use (and again after a fork)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.pid != os.getpid():
+            if _pool is not None:
+                _inherited_pools.append(_pool)
+            _pool = ConnectionPool(POOL_MIN_SIZE, POOL_MAX_SIZE)
+        return _pool
+
+@contextmanager
+def connection(conn=None):
+    """
+    `with connection() as conn:` borrows a pooled connection and hands it
+    back on exit (rolling back anything left uncommitted).
+    A connection passed in by the caller is used as is and left open.
+    """
+    if conn is not None:
+        yield conn
+        return
+
+    pool = get_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+    finally:
+        pool.putconn(conn)
+
+# =====================================
+# SCHEDULE CHANGE NOTIFICATIONS
+# =====================================
+# Schedule writes queue a NOTIFY in their transaction (delivered on commit
+# only); every app process runs one listener thread that drops its cached
+# schedule reads when another process changes the schedule.
+
+def _notify_schedule_change(cur, source):
+    cur.execute("SELECT pg_notify(%s, %s)", (SCHEDULE_NOTIFY_CHANNEL, source))
+
+
+class ScheduleListener(threading.Thread):
+    """
+    Daemon thread holding a dedicated (non pooled) LISTEN connection.
+    Reconnects after connection errors and invalidates on reconnect,
+    since notifications sent while disconnected are lost.
+    """
+
+    def __init__(self, on_change=bump_schedule_version, connect=get_connection,
+                 channel=SCHEDULE_NOTIFY_CHANNEL, poll_seconds=1.0):
+        super().__init__(name="schedule-listener", daemon=True)
+        self.on_change = on_change
+        self.connect = connect
+        self.channel = channel
+        self.poll_seconds = poll_seconds
+        self.notifications = 0
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            conn = None
+            try:
+                conn = self.connect()
+                conn.set_isolation_level(extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                cur = conn.cursor()
+                cur.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+                self.on_change()
+                self._listen(conn)
+            except psycopg2.Error as e:
+                print(f"⚠️ Schedule listener disconnected: {e}")
+                self._stop_event.wait(SCHEDULE_LISTENER_RECONNECT_SECONDS)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def _listen(self, conn):
+        while not self._stop_event.is_set():
+            if select.select([conn], [], [], self.poll_seconds) == ([], [], []):
+                continue
+            conn.poll()
+            if conn.notifies:
+                self.notifications += len(conn.notifies)
+                conn.notifies.clear()
+                self.on_change()
+
+
+_listener = None
+_listener_lock = threading.Lock()
+
+def start_schedule_listener():
+    """Starts this process's listener thread once (and again after a fork)"""
+    global _listener
+    with _listener_lock:
+        if _listener is None or not _listener.is_alive():
+            _listener = ScheduleListener()
+            _listener.start()
+        return _listener
+
 # =====================================
 # LOGIN FUNCTIONS (PLAIN PASSWORD - TESTING)
 # =====================================
 
 def validate_staff_login(email, password):
-    conn = get_connection()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
+    with connection() as conn:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
 
-    cur.execute("""
-        SELECT 
-            id,
-            nom,
-            prenom,
-            role,
-            departement_id
-        FROM staff
-        WHERE email = %s AND password = %s
-    """, (email, password))
-
-    user = cur.fetchone()
-    cur.close()
-    conn.close()
+        cur.execute("""
+            SELECT 
+                id,
+                nom,
+                prenom,
+                role,
+                departement_id
+            FROM staff
+            WHERE email = %s AND password = %s
+        """, (email, password))
+
+        user = cur.fetchone()
+        cur.close()
     return user
 
 # ---------- STUDENT LOGIN ----------
@@ -42,35 +270,33 @@ def validate_student_login(matricule, date_naissance):
     """
     Student login using matricule + date_naissance (YYYY-MM-DD)
     """
-    conn = get_connection()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
+    with connection() as conn:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
 
-    cur.execute("""
-        SELECT id, nom, prenom, formation_id
-        FROM etudiants
-        WHERE matricule = %s
-          AND date_naissance = %s
-    """, (matricule, date_naissance))
+        cur.execute("""
+            SELECT id, nom, prenom, formation_id
+            FROM etudiants
+            WHERE matricule = %s
+              AND date_naissance = %s
+        """, (matricule, date_naissance))
 
-    student = cur.fetchone()
-    cur.close()
-    conn.close()
+        student = cur.fetchone()
+        cur.close()
     return student
 
 # ---------- PROFESSOR LOGIN ----------
 
 def validate_prof_login(email, password):
-    conn = get_connection()
-    cur = conn.cursor()
+    with connection() as conn:
+        cur = conn.cursor()
 
-    cur.execute("""
-        SELECT id, nom, prenom, departement_id
-        FROM professeurs
-        WHERE email = %s AND password = %s
-    """, (email, password))
+        cur.execute("""
+            SELECT id, nom, prenom, departement_id
+            FROM professeurs
+            WHERE email = %s AND password = %s
+        """, (email, password))
 
-    row = cur.fetchone()
-    conn.close()
+        row = cur.fetchone()
 
     if row:
         return {
@@ -85,276 +311,971 @@ def validate_prof_login(email, password):
 
 
 # ---------- EXAM FETCH ----------
+# Schedule reads are cached per process until the next schedule write
+# (see backend/schedule_cache.py)
+
+@cached_schedule(SCHEDULE_CACHE_STUDENT_ENTRIES, SCHEDULE_CACHE_STUDENT_BYTES)
 def fetch_student_schedule(student_id):
-    conn = get_connection()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
-    cur.execute("""
-        SELECT
-    ex.id,
-    m.nom AS module,
-    f.nom AS formation,
-    s.nom AS salle,
-    ex.date_exam,
-    ex.heure_debut,
-    ex.duree_minutes
-FROM exam_groups eg
-JOIN examens ex ON eg.exam_id = ex.id
-JOIN modules m ON ex.module_id = m.id
-JOIN formations f ON m.formation_id = f.id
-JOIN salles s ON ex.salle_id = s.salle_id
-WHERE eg.student_id = %s
-ORDER BY ex.date_exam, ex.heure_debut;
+    """
+    Published timetable of a student (one primary-key lookup).
+    Before the first publication, falls back to the live schedule.
+    """
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT timetable FROM student_timetables WHERE student_id = %s", (student_id,))
+        row = cur.fetchone()
+        cur.close()
+        if row is None:
+            return _fetch_live_student_schedule(student_id, conn)
 
-    """, (student_id,))
-    data = cur.fetchall()
-    cur.close()
-    conn.close()
-    return data
+    return [
+        dict(exam, date_exam=date.fromisoformat(exam["date_exam"]),
+             heure_debut=dtime.fromisoformat(exam["heure_debut"]))
+        for exam in row[0]
+    ]
 
-def fetch_prof_schedule(prof_id):
-    conn = get_connection()
+def _fetch_live_student_schedule(student_id, conn):
     cur = conn.cursor(cursor_factory=RealDictCursor)
     cur.execute("""
-        SELECT e.id, m.nom AS module, f.nom AS formation, s.nom AS salle, e.date_exam, e.heure_debut, e.duree_minutes
-        FROM examens e
-        JOIN modules m ON e.module_id=m.id
-        JOIN formations f ON m.formation_id=f.id
-        JOIN salles s ON e.salle_id=s.salle_id
-        WHERE e.prof_id=%s
-        ORDER BY e.date_exam, e.heure_debut
-    """, (prof_id,))
+        SELECT ex.id, m.nom AS module, f.nom AS formation, s.nom AS salle,
+               ex.date_exam, ex.heure_debut, ex.duree_minutes
+        FROM exam_groups eg
+        JOIN examens ex ON eg.exam_id = ex.id
+        JOIN modules m ON ex.module_id = m.id
+        JOIN formations f ON m.formation_id = f.id
+        JOIN salles s ON ex.salle_id = s.salle_id
+        WHERE eg.student_id = %s
+        ORDER BY ex.date_exam, ex.heure_debut
+    """, (student_id,))
     data = cur.fetchall()
     cur.close()
-    conn.close()
     return data
 
-def fetch_department_schedule(department_id):
-    conn = get_connection()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
-    cur.execute("""
-        SELECT e.id AS exam_id, m.nom AS module_name, f.nom AS formation_name, f.id AS formation_id,
-               f.departement_id, f.approved AS formation_approved,
-               s.nom AS room_name, s.capacite AS room_capacity,
-               p.nom || ' ' || p.prenom AS professor_name,
-               e.date_exam, e.heure_debut, e.duree_minutes
-        FROM examens e
-        JOIN modules m ON e.module_id=m.id
-        JOIN formations f ON m.formation_id=f.id
-        JOIN salles s ON e.salle_id=s.salle_id
-        JOIN professeurs p ON e.prof_id=p.id
-        WHERE f.departement_id=%s
-        ORDER BY e.date_exam, e.heure_debut
-    """, (department_id,))
-    data = cur.fetchall()
-    cur.close()
-    conn.close()
+@cached_schedule(SCHEDULE_CACHE_PROF_ENTRIES)
+def fetch_prof_schedule(prof_id):
+    with connection() as conn:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur.execute("""
+            SELECT e.id, m.nom AS module, f.nom AS formation, s.nom AS salle, e.date_exam, e.heure_debut, e.duree_minutes
+            FROM examens e
+            JOIN modules m ON e.module_id=m.id
+            JOIN formations f ON m.formation_id=f.id
+            JOIN salles s ON e.salle_id=s.salle_id
+            WHERE e.prof_id=%s
+            ORDER BY e.date_exam, e.heure_debut
+        """, (prof_id,))
+        data = cur.fetchall()
+        cur.close()
     return data
 
 def approve_department_schedule(department_id):
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("UPDATE formations SET approved=TRUE WHERE departement_id=%s", (department_id,))
-    conn.commit()
-    cur.close()
-    conn.close()
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute("UPDATE formations SET approved=TRUE WHERE departement_id=%s", (department_id,))
+        cur.execute("""
+            SELECT e.id FROM etudiants e
+            JOIN formations f ON e.formation_id = f.id
+            WHERE f.departement_id = %s
+        """, (department_id,))
+        refresh_student_timetables([row[0] for row in cur.fetchall()], conn=conn, commit=False)
+        _notify_schedule_change(cur, "approve_department")
+        conn.commit()
+        cur.close()
+    bump_schedule_version()
     return True
 
-def fetch_all_departments_schedule():
-    conn = get_connection()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
-    cur.execute("""
-        SELECT e.id AS exam_id, m.nom AS module_name, f.nom AS formation_name,
-               f.departement_id, s.nom AS room_name, p.nom || ' ' || p.prenom AS professor_name,
-               e.date_exam, e.heure_debut, e.duree_minutes, f.approved AS formation_approved
-        FROM examens e
-        JOIN modules m ON e.module_id=m.id
-        JOIN formations f ON m.formation_id=f.id
-        JOIN salles s ON e.salle_id=s.salle_id
-        JOIN professeurs p ON e.prof_id=p.id
-        ORDER BY f.departement_id, e.date_exam, e.heure_debut
-    """)
-    data = cur.fetchall()
-    cur.close()
-    conn.close()
-    return data
-
 def approve_final_schedule():
-    conn = get_connection()
-    cur = conn.cursor()
-    cur.execute("UPDATE formations SET approved=TRUE")
-    conn.commit()
-    cur.close()
-    conn.close()
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute("UPDATE formations SET approved=TRUE")
+        publish_student_timetables(conn=conn, commit=False)
+        _notify_schedule_change(cur, "approve_final")
+        conn.commit()
+        cur.close()
+    bump_schedule_version()
     return True
 
+# ---------- PAGINATED SCHEDULE BROWSING ----------
+# Keyset pagination on (date_exam, heure_debut, exam id): a page is read
+# from the index position of the previous page's last row, never OFFSET.
+
+@cached_schedule(SCHEDULE_CACHE_PAGE_ENTRIES)
+def fetch_schedule_page(department_id=None, formation_id=None, date_from=None, date_to=None,
+                        salle_id=None, prof_id=None, after=None, page_size=SCHEDULE_PAGE_SIZE):
+    """
+    One page of the exam schedule, filtered server side.
+    after: (date_exam, heure_debut, exam_id) of the last row already shown
+    Returns {"rows", "total" (matching exams), "next" (cursor or None)}
+    """
+    conditions = []
+    params = []
+    for column, value in (("f.departement_id", department_id), ("f.id", formation_id),
+                          ("e.salle_id", salle_id), ("e.prof_id", prof_id)):
+        if value is not None:
+            conditions.append(f"{column} = %s")
+            params.append(value)
+    if date_from is not None:
+        conditions.append("e.date_exam >= %s")
+        params.append(date_from)
+    if date_to is not None:
+        conditions.append("e.date_exam <= %s")
+        params.append(date_to)
+    where = " AND ".join(conditions) or "TRUE"
+
+    with connection() as conn:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur.execute(f"""
+            SELECT COUNT(*) AS total
+            FROM examens e
+            JOIN modules m ON e.module_id=m.id
+            JOIN formations f ON m.formation_id=f.id
+            WHERE {where}
+        """, params)
+        total = cur.fetchone()["total"]
+
+        keyset = "AND (e.date_exam, e.heure_debut, e.id) > (%s, %s, %s)" if after else ""
+        cur.execute(f"""
+            SELECT e.id AS exam_id, m.id AS module_id, m.nom AS module_name, f.nom AS formation_name, f.id AS formation_id,
+                   f.departement_id, f.approved AS formation_approved,
+                   s.nom AS room_name, s.capacite AS room_capacity,
+                   p.nom || ' ' || p.prenom AS professor_name,
+                   e.date_exam, e.heure_debut, e.duree_minutes
+            FROM examens e
+            JOIN modules m ON e.module_id=m.id
+            JOIN formations f ON m.formation_id=f.id
+            JOIN salles s ON e.salle_id=s.salle_id
+            JOIN professeurs p ON e.prof_id=p.id
+            WHERE {where} {keyset}
+            ORDER BY e.date_exam, e.heure_debut, e.id
+            LIMIT %s
+        """, params + list(after or ()) + [page_size + 1])
+        rows = cur.fetchall()
+        cur.close()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = (last["date_exam"], last["heure_debut"], last["exam_id"])
+    return {"rows": rows, "total": total, "next": next_cursor}
+
+# ---------- PUBLISHED STUDENT TIMETABLES ----------
+# student_timetables holds one JSONB array per student, built in one
+# grouped pass over exam_groups; the student dashboard only reads it.
+
+_BUILD_TIMETABLES_SQL = """
+    INSERT INTO student_timetables (student_id, timetable, published_at)
+    SELECT st.id,
+           COALESCE(
+               jsonb_agg(jsonb_build_object(
+                   'id', ex.id, 'module', m.nom, 'formation', f.nom, 'salle', s.nom,
+                   'date_exam', ex.date_exam, 'heure_debut', ex.heure_debut,
+                   'duree_minutes', ex.duree_minutes
+               ) ORDER BY ex.date_exam, ex.heure_debut) FILTER (WHERE ex.id IS NOT NULL),
+               '[]'::jsonb),
+           NOW()
+    FROM etudiants st
+    LEFT JOIN (
+        exam_groups eg
+        JOIN examens ex ON eg.exam_id = ex.id
+        JOIN modules m ON ex.module_id = m.id
+        JOIN formations f ON m.formation_id = f.id
+        JOIN salles s ON ex.salle_id = s.salle_id
+    ) ON eg.student_id = st.id
+    {where}
+    GROUP BY st.id
+"""
+
+def publish_student_timetables(conn=None, commit=True):
+    """Rebuilds every student's published timetable; returns the row count"""
+    with connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM student_timetables")
+        cur.execute(_BUILD_TIMETABLES_SQL.format(where=""))
+        published = cur.rowcount
+        _notify_schedule_change(cur, "publish")
+        if commit:
+            conn.commit()
+        cur.close()
+    if commit:
+        bump_schedule_version()
+    return published
+
+def refresh_student_timetables(student_ids, conn=None, commit=True, published_only=False):
+    """
+    Rebuilds the published timetable of the given students only.
+    published_only: skip students whose timetable was never published
+    """
+    student_ids = sorted(set(student_ids))
+    if not student_ids:
+        return 0
+    with connection(conn) as conn:
+        cur = conn.cursor()
+        if published_only:
+            cur.execute("SELECT student_id FROM student_timetables WHERE student_id = ANY(%s)",
+                        (student_ids,))
+            student_ids = [row[0] for row in cur.fetchall()]
+        cur.execute("DELETE FROM student_timetables WHERE student_id = ANY(%s)", (student_ids,))
+        cur.execute(_BUILD_TIMETABLES_SQL.format(where="WHERE st.id = ANY(%s)"), (student_ids,))
+        refreshed = cur.rowcount
+        _notify_schedule_change(cur, "publish")
+        if commit:
+            conn.commit()
+        cur.close()
+    if commit:
+        bump_schedule_version()
+    return refreshed
+
+def unpublish_student_timetables(conn=None, commit=True):
+    """Drops the published timetables (students see the live schedule again)"""
+    with connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM student_timetables")
+        _notify_schedule_change(cur, "unpublish")
+        if commit:
+            conn.commit()
+        cur.close()
+    if commit:
+        bump_schedule_version()
+
+def fetch_students_of_modules(module_ids, conn=None):
+    """Ids of the students seated in the current exams of the given modules"""
+    with connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT DISTINCT eg.student_id
+            FROM exam_groups eg
+            JOIN examens ex ON eg.exam_id = ex.id
+            WHERE ex.module_id = ANY(%s)
+        """, (list(module_ids),))
+        students = [row[0] for row in cur.fetchall()]
+        cur.close()
+    return students
+
 #---------- FETCH FORMATIONS ----------
 
 def fetch_formations():
     """Return all formations from the database"""
-    conn = get_connection()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
-    cur.execute("SELECT * FROM formations ORDER BY nom")
-    formations = cur.fetchall()
-    cur.close()
-    conn.close()
+    with connection() as conn:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur.execute("SELECT * FROM formations ORDER BY nom")
+        formations = cur.fetchall()
+        cur.close()
     return formations
 
 
+# ---------- STUDENT EXAM DAY SUMMARY ----------
+# student_exam_day counts the exams every student sits per slot (see
+# database/schema.sql): triggers keep the published version up to date,
+# bulk_insert_schedule fills staging versions with _STUDENT_EXAM_DAY_SQL.
+
+_STUDENT_EXAM_DAY_SQL = """
+    INSERT INTO {days} (version_id, student_id, date_exam, heure_debut, nb_examens)
+    SELECT g.version_id, g.student_id, e.date_exam, e.heure_debut, COUNT(*)
+    FROM {groups} g
+    JOIN {exams} e ON e.version_id = g.version_id AND e.id = g.exam_id
+    WHERE g.exam_id = ANY(%s)
+    GROUP BY g.version_id, g.student_id, e.date_exam, e.heure_debut
+    ON CONFLICT (version_id, student_id, date_exam, heure_debut)
+    DO UPDATE SET nb_examens = {days}.nb_examens + EXCLUDED.nb_examens
+"""
+
+# Students seated in more than one exam of a slot (published version)
+_STUDENT_CONFLICTS_SQL = """
+    SELECT st.nom || ' ' || st.prenom AS student, d.date_exam, d.heure_debut,
+           d.nb_examens AS nb_conflicts
+    FROM student_exam_day d
+    JOIN etudiants st ON st.id = d.student_id
+    WHERE d.version_id = (SELECT version_id FROM schedule_pointer)
+      AND d.nb_examens > 1
+    ORDER BY nb_conflicts DESC
+"""
+
+# ---------- ANALYTICS ROLLUPS ----------
+# Materialized aggregates of the published schedule (database/schema.sql),
+# refreshed by every publish: dashboard reads cost the same whatever the
+# size of the schedule tables and the number of versions kept.
+
+_ROLLUPS = ("rollup_room_usage", "rollup_professor_load", "rollup_department_stats",
+            "rollup_exams_per_level", "rollup_exams_per_day")
+
+def refresh_rollups(conn=None, commit=True):
+    """
+    Refreshes every rollup CONCURRENTLY (readers keep the previous rows until
+    commit) and records when, and for which schedule version
+    """
+    with connection(conn) as conn:
+        cur = conn.cursor()
+        for name in _ROLLUPS:
+            cur.execute(sql.SQL("REFRESH MATERIALIZED VIEW CONCURRENTLY {}").format(sql.Identifier(name)))
+        cur.execute("""
+            INSERT INTO rollup_refreshes (name, version_id, refreshed_at)
+            SELECT name, (SELECT version_id FROM schedule_pointer), NOW()
+            FROM unnest(%s::text[]) AS name
+            ON CONFLICT (name) DO UPDATE
+            SET version_id = EXCLUDED.version_id, refreshed_at = EXCLUDED.refreshed_at
+        """, (list(_ROLLUPS),))
+        if commit:
+            conn.commit()
+        cur.close()
+
+def fetch_rollup_freshness(conn=None):
+    """Oldest rollup refresh, the version it reflects and the published version"""
+    with connection(conn) as conn:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur.execute("""
+            SELECT MIN(refreshed_at) AS refreshed_at, MIN(version_id) AS version_id,
+                   (SELECT version_id FROM schedule_pointer) AS published_version
+            FROM rollup_refreshes
+        """)
+        freshness = cur.fetchone()
+        cur.close()
+    return freshness
+
+def fetch_room_usage(conn=None):
+    with connection(conn) as conn:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur.execute("""
+            SELECT salle, capacite, nb_examens, total_capacity, nb_etudiants
+            FROM rollup_room_usage
+            ORDER BY nb_examens DESC, salle
+        """)
+        rooms = cur.fetchall()
+        cur.close()
+    return rooms
+
+def fetch_professor_load(conn=None):
+    with connection(conn) as conn:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur.execute("""
+            SELECT professeur, nb_examens, nb_jours
+            FROM rollup_professor_load
+            ORDER BY nb_examens DESC, professeur
+        """)
+        professors = cur.fetchall()
+        cur.close()
+    return professors
+
+def fetch_department_stats(conn=None):
+    with connection(conn) as conn:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur.execute("""
+            SELECT departement, total_exams, modules_scheduled, total_students
+            FROM rollup_department_stats
+            ORDER BY total_exams DESC, departement
+        """)
+        departments = cur.fetchall()
+        cur.close()
+    return departments
+
+def fetch_exams_per_level(conn=None):
+    with connection(conn) as conn:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur.execute("""
+            SELECT cycle, niveau, nb_examens, nb_modules
+            FROM rollup_exams_per_level
+            ORDER BY cycle, niveau
+        """)
+        levels = cur.fetchall()
+        cur.close()
+    return levels
+
+def fetch_exams_per_day(conn=None):
+    with connection(conn) as conn:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur.execute("""
+            SELECT date_exam, nb_examens, nb_etudiants
+            FROM rollup_exams_per_day
+            ORDER BY date_exam
+        """)
+        days = cur.fetchall()
+        cur.close()
+    return days
+
 # Optional admin dashboard
 def fetch_admin_dashboard_data():
-    conn = get_connection()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
-    cur.execute("""
-        SELECT s.nom AS salle, COUNT(e.id) AS nb_examens, SUM(s.capacite) AS total_capacity
-        FROM salles s
-        LEFT JOIN examens e ON s.salle_id=e.salle_id
-        GROUP BY s.nom
-        ORDER BY nb_examens DESC
-    """)
-    rooms = cur.fetchall()
-    cur.execute("""
-        SELECT p.nom || ' ' || p.prenom AS professeur, COUNT(e.id) AS nb_examens
-        FROM professeurs p
-        LEFT JOIN examens e ON p.id=e.prof_id
-        GROUP BY p.id
-        ORDER BY nb_examens DESC
-    """)
-    professors = cur.fetchall()
-    cur.execute("""
-        SELECT st.nom || ' ' || st.prenom AS student, e1.date_exam, e1.heure_debut, COUNT(*) AS nb_conflicts
-        FROM inscriptions i1
-        JOIN examens e1 ON i1.module_id=e1.module_id
-        JOIN inscriptions i2 ON i1.etudiant_id=i2.etudiant_id
-        JOIN examens e2 ON i2.module_id=e2.module_id
-        JOIN etudiants st ON i1.etudiant_id=st.id
-        WHERE e1.id<>e2.id AND e1.date_exam=e2.date_exam AND e1.heure_debut=e2.heure_debut
-        GROUP BY st.id, e1.date_exam, e1.heure_debut
-        HAVING COUNT(*)>1
-        ORDER BY nb_conflicts DESC
-    """)
-    student_conflicts = cur.fetchall()
-    cur.close()
-    conn.close()
-    return {"rooms": rooms, "professors": professors, "student_conflicts": student_conflicts}
+    with connection() as conn:
+        rooms = fetch_room_usage(conn=conn)
+        professors = fetch_professor_load(conn=conn)
+        freshness = fetch_rollup_freshness(conn=conn)
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur.execute(_STUDENT_CONFLICTS_SQL)
+        student_conflicts = cur.fetchall()
+        cur.close()
+    return {"rooms": rooms, "professors": professors, "student_conflicts": student_conflicts,
+            "freshness": freshness}
 
 
-def clear_existing_exams():
+def clear_existing_exams(conn=None, commit=True):
     """
-    Delete all existing exams before regenerating a new schedule
+    Publishes a new, empty schedule version before regenerating a schedule
+    (no DELETE: the previous version is retired and kept until pruned)
+    """
+    with connection(conn) as conn:
+        version_id = create_schedule_version(conn=conn, commit=False)
+        publish_schedule_version(version_id, conn=conn, commit=False)
+        if commit:
+            conn.commit()
+    if commit:
+        bump_schedule_version()
+    return version_id
+
+def lock_schedule_pointer(conn):
+    """
+    Locks the schedule pointer (FOR SHARE) until the caller's transaction
+    ends: a publish waits meanwhile, so everything the transaction reads and
+    writes stays on one version. Returns the published version id.
     """
-    conn = get_connection()
     cur = conn.cursor()
-    cur.execute("DELETE FROM examens;")
-    conn.commit()
+    cur.execute("SELECT version_id FROM schedule_pointer FOR SHARE")
+    version_id = cur.fetchone()[0]
     cur.close()
-    conn.close()
+    return version_id
 
-#---------- FETCH MODULES AND STUDENTS BY FORMATION ----------
+def fetch_existing_exams(conn=None):
+    """Return every stored exam row (no joins) for rescheduling"""
+    with connection(conn) as conn:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur.execute("""
+            SELECT id, module_id, salle_id, prof_id, date_exam, heure_debut, duree_minutes
+            FROM examens
+        """)
+        exams = cur.fetchall()
+        cur.close()
+        return exams
 
-def fetch_modules_by_formation(formation_id):
-    with get_connection() as conn:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute("""
-                SELECT 
-                    m.id,
-                    m.nom,
-                    f.departement_id
-                FROM modules m
-                JOIN formations f ON m.formation_id = f.id
-                WHERE m.formation_id = %s
-            """, (formation_id,))
-            return cur.fetchall()
-
-def fetch_students_by_formation(formation_id):
-    conn = get_connection()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
-    cur.execute("SELECT * FROM etudiants WHERE formation_id=%s", (formation_id,))
-    students = cur.fetchall()
-    cur.close()
-    conn.close()
-    return students
+def delete_exams_for_modules(module_ids, conn=None, commit=True):
+    """
+    Delete the exams (and their groups) of the given modules only
+    """
+    with connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM examens WHERE module_id = ANY(%s)", (list(module_ids),))
+        deleted = cur.rowcount
+        _notify_schedule_change(cur, "delete")
+        if commit:
+            conn.commit()
+        cur.close()
+    if commit:
+        bump_schedule_version()
+    return deleted
+
+#---------- FETCH MODULES AND DEPARTMENTS ----------
+
+def fetch_modules_by_department(department_id):
+    with connection() as conn:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur.execute("""
+            SELECT m.id, m.nom, m.formation_id
+            FROM modules m
+            JOIN formations f ON m.formation_id = f.id
+            WHERE f.departement_id = %s
+            ORDER BY m.nom
+        """, (department_id,))
+        modules = cur.fetchall()
+        cur.close()
+    return modules
+
+def fetch_departments():
+    with connection() as conn:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur.execute("SELECT id, nom FROM departements ORDER BY nom")
+        departments = cur.fetchall()
+        cur.close()
+    return departments
 
 def fetch_rooms():
-    conn = get_connection()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
-    cur.execute("SELECT salle_id, nom, capacite FROM salles")  # id here
-    rooms = cur.fetchall()
-    cur.close()
-    conn.close()
+    with connection() as conn:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur.execute("SELECT salle_id, nom, capacite FROM salles")  # id here
+        rooms = cur.fetchall()
+        cur.close()
     return rooms
 
 def fetch_professors():
-    conn = get_connection()
-    cur = conn.cursor(cursor_factory=RealDictCursor)
-    cur.execute("SELECT * FROM professeurs ORDER BY nom")
-    professors = cur.fetchall()
-    cur.close()
-    conn.close()
+    with connection() as conn:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur.execute("SELECT * FROM professeurs ORDER BY nom")
+        professors = cur.fetchall()
+        cur.close()
     return professors
 
 # ---------- INSERT EXAM ----------
 
 
 def insert_exam(module_id, salle_id, prof_id, date_exam, heure_debut, duree_minutes, conn=None, commit=True):
-    if conn is None:
-        conn = get_connection()
-        close_after = True
-    else:
-        close_after = False
+    with connection(conn) as conn:
+        cur = conn.cursor()
+        try:
+            cur.execute("""
+                INSERT INTO exam_versions (version_id, module_id, salle_id, prof_id, date_exam, heure_debut, duree_minutes)
+                VALUES ((SELECT version_id FROM schedule_pointer), %s, %s, %s, %s, %s, %s)
+                RETURNING id
+            """, (module_id, salle_id, prof_id, date_exam, heure_debut, duree_minutes))
 
-    cur = conn.cursor()
-    try:
+            exam_id = cur.fetchone()[0]     # get the generated id
+            _notify_schedule_change(cur, "insert")
+            if commit:
+                conn.commit()
+                bump_schedule_version()
+            # Removed print for performance
+            return exam_id                  # ← return integer id, not True
+
+        except psycopg2.errors.UniqueViolation:
+            if commit:
+                conn.rollback()
+            return None                     # or raise, depending on your logic
+
+        except Exception as e:
+            if commit:
+                conn.rollback()
+            raise e
+
+        finally:
+            cur.close()
+
+
+def insert_exam_groups(exam_id, student_ids, conn=None, commit=True):
+    with connection(conn) as conn:
+        cur = conn.cursor()
+        try:
+            cur.executemany("""
+                INSERT INTO exam_group_versions (version_id, exam_id, student_id)
+                VALUES ((SELECT version_id FROM schedule_pointer), %s, %s)
+            """, [(exam_id, sid) for sid in student_ids])
+            if commit:
+                conn.commit()
+            # Removed print for performance
+
+        except Exception as e:
+            if commit:
+                conn.rollback()
+            raise e
+
+        finally:
+            cur.close()
+
+
+# ---------- GENERATION RUN REPORTS ----------
+
+def save_generation_report(report, conn=None, commit=True):
+    """Stores the report of one generate_exam_schedule run; returns its id"""
+    with connection(conn) as conn:
+        cur = conn.cursor()
         cur.execute("""
-            INSERT INTO examens (module_id, salle_id, prof_id, date_exam, heure_debut, duree_minutes)
-            VALUES (%s, %s, %s, %s, %s, %s)
+            INSERT INTO generation_runs (total_seconds, report)
+            VALUES (%s, %s)
             RETURNING id
-        """, (module_id, salle_id, prof_id, date_exam, heure_debut, duree_minutes))
-        
-        exam_id = cur.fetchone()[0]     # get the generated id
+        """, (report["total_seconds"], Json(report)))
+        run_id = cur.fetchone()[0]
         if commit:
             conn.commit()
-        # Removed print for performance
-        return exam_id                  # ← return integer id, not True
+        cur.close()
+    return run_id
 
-    except psycopg2.errors.UniqueViolation:
-        if commit:
-            conn.rollback()
-        return None                     # or raise, depending on your logic
+def fetch_generation_reports(limit=10):
+    """Most recent generation run reports, newest first"""
+    with connection() as conn:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur.execute("""
+            SELECT id, created_at, total_seconds, report
+            FROM generation_runs
+            ORDER BY id DESC
+            LIMIT %s
+        """, (limit,))
+        runs = cur.fetchall()
+        cur.close()
+    return runs
 
-    except Exception as e:
+# ---------- GENERATION JOBS ----------
+
+def create_generation_job(parameters, conn=None, commit=True):
+    """Queues a generation job; returns its id"""
+    with connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute("INSERT INTO generation_jobs (parameters) VALUES (%s) RETURNING id",
+                    (Json(parameters),))
+        job_id = cur.fetchone()[0]
         if commit:
-            conn.rollback()
-        raise e
+            conn.commit()
+        cur.close()
+    return job_id
 
-    finally:
+def claim_generation_job(job_id=None, pid=None):
+    """
+    Marks a queued job as running and returns it (the given one, or the
+    oldest queued job). None if there is nothing to claim.
+    """
+    with connection() as conn:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur.execute("""
+            UPDATE generation_jobs
+            SET status = 'running', started_at = NOW(), pid = %s
+            WHERE id = (
+                SELECT id FROM generation_jobs
+                WHERE status = 'queued' AND NOT cancel_requested
+                  AND (%s::int IS NULL OR id = %s)
+                ORDER BY id
+                LIMIT 1
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING *
+        """, (pid, job_id, job_id))
+        job = cur.fetchone()
+        conn.commit()
         cur.close()
-        if close_after:
-            conn.close()
+    return job
 
+def update_generation_job(job_id, **fields):
+    """
+    Updates status / progress columns of a job.
+    Returns whether cancellation was requested.
+    """
+    columns = ", ".join(f"{name} = %s" for name in fields)
+    if fields.get("status") in ("done", "failed", "cancelled"):
+        columns += ", finished_at = NOW()"
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute(f"""
+            UPDATE generation_jobs SET {columns}
+            WHERE id = %s
+            RETURNING cancel_requested
+        """, list(fields.values()) + [job_id])
+        row = cur.fetchone()
+        conn.commit()
+        cur.close()
+    return bool(row and row[0])
 
-def insert_exam_groups(exam_id, student_ids, conn=None, commit=True):
-    if conn is None:
-        conn = get_connection()
-        close_after = True
-    else:
-        close_after = False
+def cancel_generation_job(job_id):
+    """Requests cancellation; a job still queued is cancelled right away"""
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute("""
+            UPDATE generation_jobs
+            SET cancel_requested = TRUE,
+                status = CASE WHEN status = 'queued' THEN 'cancelled' ELSE status END,
+                finished_at = CASE WHEN status = 'queued' THEN NOW() ELSE finished_at END
+            WHERE id = %s AND status IN ('queued', 'running')
+        """, (job_id,))
+        requested = cur.rowcount > 0
+        conn.commit()
+        cur.close()
+    return requested
 
+def try_generation_lock():
+    """
+    Takes the advisory lock allowing one schedule generation at a time, on a
+    dedicated connection held for the whole run (closing it, or the process
+    exiting, releases the lock). Returns that connection, or None when
+    another generation holds the lock.
+    """
+    conn = get_connection()
+    conn.autocommit = True
     cur = conn.cursor()
-    try:
-        cur.executemany("""
-            INSERT INTO exam_groups (exam_id, student_id)
-            VALUES (%s, %s)
-        """, [(exam_id, sid) for sid in student_ids])
+    cur.execute("SELECT pg_try_advisory_lock(%s)", (JOB_ADVISORY_LOCK_KEY,))
+    locked = cur.fetchone()[0]
+    cur.close()
+    if not locked:
+        conn.close()
+        return None
+    return conn
+
+def is_generation_lock_held():
+    """Whether a generation currently holds the lock (read from pg_locks, not taken)"""
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT EXISTS (
+                SELECT 1 FROM pg_locks
+                WHERE locktype = 'advisory' AND granted AND database = (
+                          SELECT oid FROM pg_database WHERE datname = current_database())
+                  AND classid = (%(key)s::bigint >> 32)::oid
+                  AND objid = (%(key)s::bigint & 4294967295)::oid
+                  AND objsubid = 1
+            )
+        """, {"key": JOB_ADVISORY_LOCK_KEY})
+        held = cur.fetchone()[0]
+        cur.close()
+    return held
+
+def fetch_running_generation_jobs(started_before_seconds=0):
+    """(id, pid) of the running jobs started at least that many seconds ago"""
+    with connection() as conn:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur.execute("""
+            SELECT id, pid FROM generation_jobs
+            WHERE status = 'running' AND started_at <= NOW() - make_interval(secs => %s)
+        """, (started_before_seconds,))
+        jobs = cur.fetchall()
+        cur.close()
+    return jobs
+
+def fail_generation_jobs(job_ids, message):
+    """Marks the given jobs failed if they are still running; returns how many were"""
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute("""
+            UPDATE generation_jobs SET status = 'failed', message = %s, finished_at = NOW()
+            WHERE id = ANY(%s) AND status = 'running'
+        """, (message, list(job_ids)))
+        failed = cur.rowcount
+        conn.commit()
+        cur.close()
+    return failed
+
+def is_generation_job_cancelled(job_id):
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT cancel_requested FROM generation_jobs WHERE id = %s", (job_id,))
+        row = cur.fetchone()
+        cur.close()
+    return bool(row and row[0])
+
+def fetch_generation_jobs(limit=10):
+    """Most recent generation jobs, newest first"""
+    with connection() as conn:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur.execute("""
+            SELECT id, status, progress, phase, parameters, modules_total, modules_scheduled,
+                   modules_unscheduled, message, cancel_requested, run_id,
+                   created_at, started_at, finished_at
+            FROM generation_jobs
+            ORDER BY id DESC
+            LIMIT %s
+        """, (limit,))
+        jobs = cur.fetchall()
+        cur.close()
+    return jobs
+
+# ---------- BULK INSERT (COPY) ----------
+
+def _copy_rows(cur, table, columns, rows):
+    buf = io.StringIO()
+    for row in rows:
+        buf.write("\t".join(str(v) for v in row))
+        buf.write("\n")
+    buf.seek(0)
+    cur.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN",
+        buf
+    )
+
+
+def bulk_insert_schedule(exams, version_id=None, conn=None, commit=True):
+    """
+    Writes a whole schedule with two COPY streams instead of one
+    INSERT per exam and one per student.
+    exams: dicts with module_id, salle_id, prof_id, date_exam, heure_debut,
+           duree_minutes and student_ids
+    version_id: schedule version written to (a staging one, see
+           create_schedule_version); None writes into the published schedule
+    Exam ids are pre-allocated from the exam_versions sequence.
+    Returns the list of exam ids (same order as exams).
+    """
+    with connection(conn) as conn:
+        cur = conn.cursor()
+        try:
+            live = version_id is None
+            if live:
+                version_id = _published_version(cur)
+            exams_table, groups_table, days_table = _version_tables(version_id)
+
+            cur.execute("""
+                SELECT nextval(pg_get_serial_sequence('exam_versions', 'id'))
+                FROM generate_series(1, %s)
+            """, (len(exams),))
+            exam_ids = [row[0] for row in cur.fetchall()]
+
+            _copy_rows(cur, exams_table,
+                       ("version_id", "id", "module_id", "salle_id", "prof_id",
+                        "date_exam", "heure_debut", "duree_minutes"),
+                       ((version_id, exam_id, e["module_id"], e["salle_id"], e["prof_id"],
+                         e["date_exam"], e["heure_debut"], e["duree_minutes"])
+                        for exam_id, e in zip(exam_ids, exams)))
+
+            _copy_rows(cur, groups_table, ("version_id", "exam_id", "student_id"),
+                       ((version_id, exam_id, sid)
+                        for exam_id, e in zip(exam_ids, exams)
+                        for sid in e["student_ids"]))
+
+            # A staging version is invisible until published: nothing to announce,
+            # but it has no triggers yet, so its student_exam_day rows are
+            # aggregated here in one pass, and its statistics are collected
+            # before it goes live
+            if live:
+                _notify_schedule_change(cur, "bulk_insert")
+            else:
+                cur.execute(sql.SQL(_STUDENT_EXAM_DAY_SQL).format(
+                    days=sql.Identifier(days_table), groups=sql.Identifier(groups_table),
+                    exams=sql.Identifier(exams_table)), (exam_ids,))
+                for table in (exams_table, groups_table, days_table):
+                    cur.execute(sql.SQL("ANALYZE {}").format(sql.Identifier(table)))
+            if commit:
+                conn.commit()
+                if live:
+                    bump_schedule_version()
+            return exam_ids
+
+        except Exception as e:
+            if commit:
+                conn.rollback()
+            raise e
+
+        finally:
+            cur.close()
+
+# ---------- SCHEDULE VERSIONS ----------
+# exam_versions, exam_group_versions and student_exam_day keep one partition
+# per version (exam_versions_v<id>, ...); the examens and exam_groups views
+# show the version named by schedule_pointer.
+# A generation fills detached staging tables; publish attaches them (still
+# invisible: the pointer names another version), then moves the pointer in
+# a short transaction of its own. Readers see the old schedule or the new
+# one, never a partial one, and are never blocked by the load.
+
+# Partitioned tables, in attach order (the groups' foreign key needs the exams)
+_VERSIONED_TABLES = ("exam_versions", "exam_group_versions", "student_exam_day")
+
+def _version_tables(version_id):
+    return tuple(f"{parent}_v{int(version_id)}" for parent in _VERSIONED_TABLES)
+
+def _published_version(cur):
+    cur.execute("SELECT version_id FROM schedule_pointer")
+    return cur.fetchone()[0]
+
+def _is_partition(cur, table):
+    cur.execute("SELECT EXISTS (SELECT 1 FROM pg_inherits WHERE inhrelid = to_regclass(%s))", (table,))
+    return cur.fetchone()[0]
+
+def create_schedule_version(conn=None, commit=True):
+    """
+    Creates an empty staging version: its tables already carry the
+    partition indexes and a CHECK on version_id, so attaching them reuses the
+    indexes and skips the partition bound scan (the foreign keys are still
+    validated, see publish_schedule_version). Returns the version id.
+    """
+    with connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute("INSERT INTO schedule_versions DEFAULT VALUES RETURNING id")
+        version_id = cur.fetchone()[0]
+        for parent, table in zip(_VERSIONED_TABLES, _version_tables(version_id)):
+            cur.execute(sql.SQL("""
+                CREATE TABLE {} (
+                    LIKE {} INCLUDING DEFAULTS INCLUDING INDEXES,
+                    CHECK (version_id = {})
+                )
+            """).format(sql.Identifier(table), sql.Identifier(parent), sql.Literal(version_id)))
         if commit:
             conn.commit()
-        # Removed print for performance
+        cur.close()
+    return version_id
 
-    except Exception as e:
+def publish_schedule_version(version_id, conn=None, commit=True):
+    """
+    Makes a version the published schedule. A staging version is first
+    attached (which also gives it the student_exam_day triggers): attaching
+    clones the foreign keys of the partitioned tables and validates them by
+    scanning the version's tables, so with commit=True it is committed on its
+    own; readers are not blocked and do not see the version yet. The pointer
+    then moves and the previous version is retired in a short transaction.
+    Re-publishing a retired version rolls the schedule back to it.
+    Published student timetables are withdrawn until the next approval and
+    the analytics rollups are refreshed, both in the pointer transaction.
+    """
+    with connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT 1 FROM schedule_versions WHERE id = %s", (version_id,))
+        if cur.fetchone() is None:
+            cur.close()
+            raise ValueError(f"Unknown schedule version {version_id}")
+
+        for parent, table in zip(_VERSIONED_TABLES, _version_tables(version_id)):
+            if not _is_partition(cur, table):
+                cur.execute(sql.SQL("ALTER TABLE {} ATTACH PARTITION {} FOR VALUES IN ({})").format(
+                    sql.Identifier(parent), sql.Identifier(table), sql.Literal(int(version_id))))
         if commit:
-            conn.rollback()
-        raise e
+            conn.commit()
 
-    finally:
+        cur.execute("SELECT 1 FROM schedule_versions WHERE id = %s FOR UPDATE", (version_id,))
+
+        cur.execute("UPDATE schedule_versions SET status = 'retired' WHERE status = 'published'")
+        cur.execute("""
+            UPDATE schedule_versions SET status = 'published', published_at = NOW()
+            WHERE id = %s
+        """, (version_id,))
+        cur.execute("UPDATE schedule_pointer SET version_id = %s", (version_id,))
+        unpublish_student_timetables(conn=conn, commit=False)
+        refresh_rollups(conn=conn, commit=False)
+        _notify_schedule_change(cur, "publish_version")
+        if commit:
+            conn.commit()
         cur.close()
-        if close_after:
-            conn.close()
+    if commit:
+        bump_schedule_version()
+
+def drop_schedule_version(version_id):
+    """
+    Drops a version that is not published, one table at a time in reverse
+    attach order: each attached partition is detached CONCURRENTLY (never
+    blocks the readers of the published version) and dropped at once, so the
+    exam groups referencing the exams are gone before the exams are detached.
+    This needs autocommit, so no conn parameter.
+    """
+    with connection() as conn:
+        conn.autocommit = True
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT status FROM schedule_versions WHERE id = %s", (version_id,))
+            row = cur.fetchone()
+            if row is None:
+                return
+            if row[0] == "published":
+                raise ValueError(f"Schedule version {version_id} is published")
+
+            for parent, table in reversed(list(zip(_VERSIONED_TABLES, _version_tables(version_id)))):
+                if _is_partition(cur, table):
+                    cur.execute(sql.SQL("ALTER TABLE {} DETACH PARTITION {} CONCURRENTLY").format(
+                        sql.Identifier(parent), sql.Identifier(table)))
+                cur.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(sql.Identifier(table)))
+            cur.execute("DELETE FROM schedule_versions WHERE id = %s", (version_id,))
+            cur.close()
+        finally:
+            conn.autocommit = False
+
+def prune_schedule_versions(keep=SCHEDULE_VERSIONS_KEPT):
+    """
+    Drops every retired version but the `keep` most recently published ones
+    (kept for rollback). Staging versions are never pruned: a generation job
+    may still be filling them. Returns the dropped version ids.
+    """
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT id FROM schedule_versions
+            WHERE status = 'retired'
+              AND id NOT IN (SELECT id FROM schedule_versions
+                             WHERE status = 'retired'
+                             ORDER BY published_at DESC, id DESC
+                             LIMIT %s)
+            ORDER BY id
+        """, (keep,))
+        dropped = [row[0] for row in cur.fetchall()]
+        cur.close()
+    for version_id in dropped:
+        drop_schedule_version(version_id)
+    return dropped
+
+def fetch_schedule_versions(limit=10):
+    """Latest schedule versions, newest first (nb_examens counts attached versions only)"""
+    with connection() as conn:
+        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur.execute("""
+            SELECT v.id, v.status, v.created_at, v.published_at,
+                   (SELECT COUNT(*) FROM exam_versions ev WHERE ev.version_id = v.id) AS nb_examens
+            FROM schedule_versions v
+            ORDER BY v.id DESC
+            LIMIT %s
+        """, (limit,))
+        versions = cur.fetchall()
+        cur.close()
+    return versions
@@ -0,0 +1,137 @@
+from datetime import datetime
+
+from backend.database import (
+    connection,
+    fetch_existing_exams,
+    fetch_students_of_modules,
+    delete_exams_for_modules,
+    bulk_insert_schedule,
+    lock_schedule_pointer,
+    refresh_rollups,
+    refresh_student_timetables,
+    try_generation_lock
+)
+from backend.occupancy import Occupancy
+from backend.optimizer import (
+    MAX_PROF_PER_DAY,
+    generate_slots,
+    place_modules,
+    prepare_snapshot
+)
+from backend.problem import load_problem
+from backend.schedule_cache import bump_schedule_version
+
+# =====================================
+# INCREMENTAL PLAN (no database access)
+# =====================================
+
+def plan_incremental(snapshot, existing_exams, modules=(), rooms=(), professors=()):
+    """
+    Frees only the exams touched by a change and re-places their modules
+    around the occupancy of the rest of the schedule.
+
+    existing_exams: stored exam rows (module_id, salle_id, prof_id, date_exam, heure_debut)
+    modules / rooms / professors: ids of the changed entities. Exams whose
+    module, room or professor no longer exists are freed as well.
+
+    Returns {"freed": module ids whose exams must be deleted,
+             "exams": new exam dicts, "unscheduled": module indexes}
+    """
+    problem = snapshot["problem"]
+    graph = snapshot["graph"]
+    module_students = snapshot["module_students"]
+
+    module_pos = {mid: i for i, mid in enumerate(problem.module_ids.tolist())}
+    room_pos = {rid: i for i, rid in enumerate(problem.room_ids.tolist())}
+    prof_pos = {pid: i for i, pid in enumerate(problem.prof_ids.tolist())}
+    modules, rooms, professors = set(modules), set(rooms), set(professors)
+
+    freed = set(modules)
+    for e in existing_exams:
+        if (e["module_id"] in modules or e["salle_id"] in rooms or e["prof_id"] in professors
+                or e["module_id"] not in module_pos
+                or e["salle_id"] not in room_pos
+                or e["prof_id"] not in prof_pos):
+            freed.add(e["module_id"])
+
+    # OCCUPANCY of the exams we keep
+    occupancy = Occupancy(problem.slots, problem.n_rooms, problem.n_profs, MAX_PROF_PER_DAY,
+                          prof_department=problem.prof_department,
+                          room_capacity=problem.room_capacity)
+    day_pos = {d: i for i, d in enumerate(occupancy.days)}
+    module_day = {}
+    kept_slots, kept_rooms, kept_profs = [], [], []
+    for e in existing_exams:
+        if e["module_id"] in freed:
+            continue
+        m = module_pos[e["module_id"]]
+        if e["date_exam"] in day_pos and m not in module_day:
+            module_day[m] = day_pos[e["date_exam"]]
+        slot_idx = occupancy.slot_index.get(datetime.combine(e["date_exam"], e["heure_debut"]))
+        if slot_idx is None:
+            continue
+        kept_slots.append(slot_idx)
+        kept_rooms.append(room_pos[e["salle_id"]])
+        kept_profs.append(prof_pos[e["prof_id"]])
+    occupancy.reserve_many(kept_slots, kept_rooms, kept_profs)
+
+    # PLACE freed modules around the kept ones
+    to_place = [module_pos[mid] for mid in freed if mid in module_pos and module_pos[mid] in graph]
+    exams, unscheduled = place_modules(problem, graph, module_students, occupancy, module_day, to_place)
+
+    return {"freed": sorted(freed), "exams": exams, "unscheduled": unscheduled}
+
+# =====================================
+# MAIN
+# =====================================
+
+def reschedule_incremental(modules=(), rooms=(), professors=(), start_date=None, end_date=None):
+    """
+    Reschedules only the exams affected by changed modules/rooms/professors
+    and writes the delta, with the refreshed analytics rollups, in one
+    transaction. The session window defaults to
+    the dates of the stored schedule.
+    Runs under the generation lock (RuntimeError while a generation runs)
+    and keeps the schedule pointer locked from the first read to the commit,
+    so the delta is written into the version it was computed on.
+    """
+    lock_conn = try_generation_lock()
+    if lock_conn is None:
+        raise RuntimeError("A schedule generation is running: reschedule once it is done")
+    try:
+        return _reschedule(modules, rooms, professors, start_date, end_date)
+    finally:
+        lock_conn.close()
+
+
+def _reschedule(modules, rooms, professors, start_date, end_date):
+    with connection() as conn:
+        lock_schedule_pointer(conn)
+        existing = fetch_existing_exams(conn=conn)
+        if start_date is None or end_date is None:
+            if not existing:
+                raise ValueError("No stored schedule: run generate_exam_schedule first")
+            start_date = start_date or min(e["date_exam"] for e in existing)
+            end_date = end_date or max(e["date_exam"] for e in existing)
+
+        snapshot = prepare_snapshot(load_problem(generate_slots(start_date, end_date), conn=conn))
+        plan = plan_incremental(snapshot, existing, modules, rooms, professors)
+
+        affected = set(fetch_students_of_modules(plan["freed"], conn=conn))
+        affected.update(sid for e in plan["exams"] for sid in e["student_ids"])
+
+        delete_exams_for_modules(plan["freed"], conn=conn, commit=False)
+        bulk_insert_schedule(plan["exams"], conn=conn, commit=False)
+        refresh_student_timetables(affected, conn=conn, commit=False, published_only=True)
+        refresh_rollups(conn=conn, commit=False)
+        conn.commit()
+    bump_schedule_version()
+
+    for m in plan["unscheduled"]:
+        print(f"⚠️ Module not scheduled: {snapshot['problem'].module_names[m]}")
+
+    return {
+        "freed_modules": len(plan["freed"]),
+        "exams_written": len(plan["exams"]),
+        "unscheduled": len(plan["unscheduled"])
+    }
@@ -0,0 +1,198 @@
+import multiprocessing
+import os
+import threading
+import time
+from datetime import date
+
+from backend.config import JOB_START_METHOD, JOB_POLL_SECONDS
+from backend.database import (
+    cancel_generation_job,
+    claim_generation_job,
+    create_generation_job,
+    fail_generation_jobs,
+    fetch_running_generation_jobs,
+    is_generation_job_cancelled,
+    is_generation_lock_held,
+    try_generation_lock,
+    update_generation_job
+)
+from backend.optimizer import generate_exam_schedule
+
+# =====================================
+# BACKGROUND GENERATION JOBS
+# =====================================
+# Each job runs generate_exam_schedule in its own process, so a browser
+# refresh or a Streamlit rerun never interrupts it. State lives in the
+# generation_jobs table; the dashboard only polls it. A job only solves and
+# publishes while holding a database advisory lock, so two jobs (from two app
+# processes, or the app and a worker) never write schedules concurrently.
+
+# Phases during which a cancelled job is stopped immediately (nothing written yet)
+INTERRUPTIBLE_PHASES = ("load", "prepare", "solve")
+
+
+# Job processes started by this process, joined once they have exited
+_processes = []
+_processes_lock = threading.Lock()
+
+
+class GenerationCancelled(Exception):
+    pass
+
+
+def submit_generation_job(start_date, end_date, starts=1, improve_seconds=0, seed=None,
+                          profile=False, decompose=False, balance=False):
+    """Queues a generation and starts its worker process; returns the job id"""
+    job_id = create_generation_job({
+        "start_date": start_date.isoformat(), "end_date": end_date.isoformat(),
+        "starts": starts, "improve_seconds": improve_seconds, "seed": seed, "profile": profile,
+        "decompose": decompose, "balance": balance
+    })
+    start_job_process(job_id)
+    return job_id
+
+
+def start_job_process(job_id, job=None):
+    reap_job_processes()
+    process = multiprocessing.get_context(JOB_START_METHOD).Process(
+        target=run_job, args=(job_id, job), name=f"generation-job-{job_id}")
+    process.start()
+    with _processes_lock:
+        _processes.append(process)
+    return process
+
+
+def reap_job_processes():
+    """Joins the job processes that have exited, so none is left a zombie"""
+    with _processes_lock:
+        for process in [p for p in _processes if not p.is_alive()]:
+            process.join()
+            _processes.remove(process)
+
+
+def _pid_alive(pid):
+    if pid is None:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def fail_orphaned_jobs():
+    """
+    Marks as failed the running jobs whose process died without recording an
+    outcome (OOM kill, SIGKILL): the generation lock is free and their pid is
+    gone. Jobs claimed less than JOB_POLL_SECONDS ago may not hold the lock
+    yet and are left alone. Returns the number of jobs failed.
+    """
+    reap_job_processes()
+    if is_generation_lock_held():
+        return 0
+    orphans = [job["id"] for job in fetch_running_generation_jobs(JOB_POLL_SECONDS)
+               if not _pid_alive(job["pid"])]
+    if not orphans:
+        return 0
+    return fail_generation_jobs(orphans, "Job process exited unexpectedly")
+
+
+def cancel_job(job_id):
+    """Requests cancellation: immediate before the schedule is written, ignored after"""
+    return cancel_generation_job(job_id)
+
+
+def _watch_cancellation(job_id, state, lock, done):
+    """
+    Stops the job process as soon as cancellation is requested while the run
+    is still in an interruptible phase (long solves don't reach a progress
+    callback for the whole improvement budget).
+    """
+    while not done.wait(JOB_POLL_SECONDS):
+        if not is_generation_job_cancelled(job_id):
+            continue
+        with lock:
+            if state["phase"] not in INTERRUPTIBLE_PHASES:
+                return
+            for child in multiprocessing.active_children():
+                child.terminate()
+            update_generation_job(job_id, status="cancelled", message="Cancelled by user")
+            os._exit(0)
+
+
+def run_job(job_id, job=None):
+    """
+    Job process entry point: claims the queued job (unless the claimed `job`
+    row is passed in) and runs it, recording progress, the outcome and the
+    run report.
+    """
+    if job is None:
+        job = claim_generation_job(job_id, pid=os.getpid())
+        if job is None:
+            return None
+    else:
+        update_generation_job(job_id, pid=os.getpid())
+    params = job["parameters"]
+
+    lock_conn = try_generation_lock()
+    if lock_conn is None:
+        update_generation_job(job_id, status="failed", message="Another generation is already running")
+        return None
+
+    state = {"phase": "load"}
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def progress(percent, phase, **counts):
+        with lock:
+            state["phase"] = phase
+            cancelled = update_generation_job(job_id, progress=int(percent), phase=phase, **counts)
+        if cancelled and phase in INTERRUPTIBLE_PHASES + ("save",):
+            raise GenerationCancelled()
+
+    threading.Thread(target=_watch_cancellation, args=(job_id, state, lock, done), daemon=True).start()
+
+    try:
+        report = generate_exam_schedule(
+            date.fromisoformat(params["start_date"]), date.fromisoformat(params["end_date"]),
+            starts=params.get("starts", 1), seed=params.get("seed"),
+            improve_seconds=params.get("improve_seconds", 0), profile=params.get("profile", False),
+            decompose=params.get("decompose", False), balance=params.get("balance", False),
+            progress=progress
+        )
+        update_generation_job(job_id, status="done", progress=100, phase="done", run_id=report["run_id"])
+        return report
+
+    except GenerationCancelled:
+        update_generation_job(job_id, status="cancelled", message="Cancelled by user")
+
+    except Exception as e:
+        update_generation_job(job_id, status="failed", message=f"{type(e).__name__}: {e}")
+        raise e
+
+    finally:
+        done.set()
+        lock_conn.close()
+
+
+def run_worker(poll_seconds=JOB_POLL_SECONDS):
+    """Standalone worker: runs queued jobs one at a time, each in a fresh process"""
+    print("🛠 Generation worker started")
+    while True:
+        fail_orphaned_jobs()
+        job = claim_generation_job(pid=os.getpid())
+        if job is None:
+            time.sleep(poll_seconds)
+            continue
+        print(f"▶️ Running generation job {job['id']}")
+        process = start_job_process(job["id"], dict(job))
+        process.join()
+        if process.exitcode != 0:
+            print(f"⚠️ Job {job['id']} process exited with code {process.exitcode}")
+
+
+if __name__ == "__main__":
+    # python -m backend.jobs
+    run_worker()
@@ -0,0 +1,79 @@
+from collections import defaultdict
+
+import numpy as np
+
+from backend.room_packing import apportion
+
+# =====================================
+# RESOURCE LEDGER (department quotas)
+# =====================================
+
+class ResourceLedger:
+    """
+    Partition of rooms and proctors between departments, so departments can
+    be solved independently without ever booking the same resource.
+
+      rooms[dept] -> room indexes reserved for the department
+      profs[dept] -> professor indexes reserved for the department
+
+    Quotas are proportional to each department's seating demand (students
+    seated over all its modules). Rooms are dealt largest first to the department furthest
+    below its quota, so every department gets a mix of capacities; proctors
+    come from the department itself first, then from the shared surplus.
+    """
+
+    def __init__(self, rooms, profs):
+        self.rooms = rooms
+        self.profs = profs
+
+    @property
+    def departments(self):
+        return sorted(self.rooms)
+
+    @classmethod
+    def partition(cls, problem, seats, demand, modules_by_department):
+        """
+        seats:  module -> students to seat
+        demand: module -> fewest rooms (and proctors) one exam of it needs
+        """
+        departments = sorted(modules_by_department)
+        weights = [sum(seats[m] for m in modules_by_department[d]) for d in departments]
+        # A department can never seat an exam needing more rooms than its quota
+        floor = [max((demand[m] for m in modules_by_department[d]), default=0)
+                 for d in departments]
+
+        room_quota = np.maximum(apportion(problem.n_rooms, weights), floor)
+        prof_quota = np.maximum(apportion(problem.n_profs, weights), floor)
+
+        rooms = defaultdict(list)
+        for r in np.argsort(-problem.room_capacity, kind="stable"):
+            deficit = [room_quota[i] - len(rooms[d]) for i, d in enumerate(departments)]
+            best = int(np.argmax(deficit))
+            if deficit[best] <= 0:
+                break
+            rooms[departments[best]].append(int(r))
+
+        profs = defaultdict(list)
+        surplus = []
+        position = {d: i for i, d in enumerate(departments)}
+        for p in range(problem.n_profs):
+            d = int(problem.prof_department[p])
+            if d in position and len(profs[d]) < prof_quota[position[d]]:
+                profs[d].append(p)
+            else:
+                surplus.append(p)
+        for p in surplus:
+            deficit = [prof_quota[i] - len(profs[d]) for i, d in enumerate(departments)]
+            best = int(np.argmax(deficit))
+            if deficit[best] <= 0:
+                break
+            profs[departments[best]].append(p)
+
+        return cls(
+            {d: np.array(rooms[d], dtype=np.int64) for d in departments},
+            {d: np.array(profs[d], dtype=np.int64) for d in departments}
+        )
+
+    def describe(self):
+        return {int(d): {"rooms": len(self.rooms[d]), "profs": len(self.profs[d])}
+                for d in self.departments}
@@ -0,0 +1,326 @@
+from collections import defaultdict
+import math
+import random
+import time
+
+import numpy as np
+
+from backend.proctors import DEPARTMENT_PENALTY
+from backend.room_packing import RoomClasses
+
+# =====================================
+# PARAMETERS
+# =====================================
+UNSCHEDULED_PENALTY = 1000   # per module left out
+DAY_BALANCE_WEIGHT = 0.1     # per (groups on a day)^2, spreads proctor demand
+LOAD_WEIGHT = 1              # per (exams of a professor)^2
+OVERFLOW_WEIGHT = 1          # per student seated beyond room capacity
+START_TEMPERATURE = 20.0
+END_TEMPERATURE = 0.05
+
+def _temperature(progress):
+    return START_TEMPERATURE * (END_TEMPERATURE / START_TEMPERATURE) ** progress
+
+def _accept(delta, progress, rng):
+    if delta <= 0:
+        return True
+    return rng.random() < math.exp(-delta / _temperature(progress))
+
+# =====================================
+# SLOT PHASE (simulated annealing)
+# =====================================
+
+class SlotState:
+    """
+    Slot assignment with incrementally maintained resource counters and,
+    per module, the number of conflicting neighbours already placed on each day.
+    seats / room_capacity (optional) pack rooms per slot, as in dsatur_assign_slots.
+    """
+
+    def __init__(self, graph, demand, slots, room_count, prof_count, max_prof_per_day,
+                 seats=None, room_capacity=None):
+        self.graph = graph
+        if room_capacity is None:
+            room_capacity, seats = np.ones(room_count, dtype=np.int64), demand
+        self.seats = seats
+        days = sorted({s.date() for s in slots})
+        day_index = {d: i for i, d in enumerate(days)}
+        self.slot_day = [day_index[s.date()] for s in slots]
+        self.n_slots = len(slots)
+
+        self.rooms = RoomClasses(room_capacity, len(slots))
+        self.used = {}                               # module -> rooms used per class
+        self.profs_left = [prof_count] * len(slots)
+        self.day_profs_left = [prof_count * max_prof_per_day] * len(days)
+        self.day_demand = [0] * len(days)
+        self.blocked = {m: [0] * len(days) for m in graph}
+        self.assignment = {}
+        self.slot_modules = [set() for _ in slots]
+
+    def fits(self, m, s):
+        d = self.slot_day[s]
+        if self.blocked[m][d]:
+            return False
+        used = self.rooms.pack(s, self.seats[m])
+        return (used is not None
+                and self.profs_left[s] >= sum(used)
+                and self.day_profs_left[d] >= sum(used))
+
+    def place(self, m, s, used=None):
+        """
+        Places m in slot s on freshly packed rooms, or on exactly the `used`
+        rooms it held before (as returned by unplace): packing is order
+        dependent, so a restore must not pack again.
+        """
+        if used is None:
+            used = self.rooms.pack(s, self.seats[m])
+        q = sum(used)
+        d = self.slot_day[s]
+        self.assignment[m] = s
+        self.slot_modules[s].add(m)
+        self.rooms.take(s, used)
+        self.used[m] = used
+        self.profs_left[s] -= q
+        self.day_profs_left[d] -= q
+        self.day_demand[d] += q
+        for n in self.graph[m]:
+            self.blocked[n][d] += 1
+
+    def unplace(self, m):
+        """Removes m; returns (slot, rooms used) to restore it with place(m, *held)"""
+        s = self.assignment.pop(m)
+        self.slot_modules[s].discard(m)
+        used = self.used.pop(m)
+        q = sum(used)
+        d = self.slot_day[s]
+        self.rooms.give(s, used)
+        self.profs_left[s] += q
+        self.day_profs_left[d] += q
+        self.day_demand[d] -= q
+        for n in self.graph[m]:
+            self.blocked[n][d] -= 1
+        return s, used
+
+    def balance(self, days):
+        return DAY_BALANCE_WEIGHT * sum(self.day_demand[d] ** 2 for d in set(days))
+
+
+def improve_slots(graph, demand, slots, assignment, room_count, prof_count,
+                  max_prof_per_day, seconds, rng=None, seats=None, room_capacity=None):
+    """
+    Simulated annealing over the slot assignment, within a wall-clock budget.
+    Moves keep the schedule feasible: move a module to another slot, swap two
+    modules, or insert an unscheduled module, ejecting the single neighbour
+    blocking that day and/or one module holding the slot's resources.
+    Cost deltas only touch the days involved.
+
+    Returns (assignment, unscheduled, curve) for the best state seen;
+    curve is a list of (elapsed seconds, best cost).
+    seats / room_capacity: optional room packing, as in dsatur_assign_slots.
+    """
+    rng = rng or random.Random()
+    state = SlotState(graph, demand, slots, room_count, prof_count, max_prof_per_day,
+                      seats=seats, room_capacity=room_capacity)
+    for m, s in assignment.items():
+        state.place(m, s)
+
+    modules = list(graph)
+    unscheduled = [m for m in modules if m not in state.assignment]
+    cost = (UNSCHEDULED_PENALTY * len(unscheduled)
+            + state.balance(range(len(state.day_demand))))
+    best_cost = cost
+    best = (dict(state.assignment), list(unscheduled))
+
+    start = time.perf_counter()
+    curve = [(0.0, round(best_cost, 2))]
+
+    if not modules or state.n_slots == 0:
+        return best[0], best[1], curve
+
+    while True:
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            break
+        progress = elapsed / seconds if seconds else 1.0
+
+        if unscheduled and rng.random() < 0.5:
+            # INSERT, ejecting the one neighbour blocking that day
+            # and/or one module holding the slot's rooms/proctors if needed
+            i = rng.randrange(len(unscheduled))
+            m = unscheduled[i]
+            s = rng.randrange(state.n_slots)
+            d = state.slot_day[s]
+            if state.blocked[m][d] > 1:
+                continue
+            before = state.balance([d])
+            ejected = []
+            if state.blocked[m][d] == 1:
+                n = next(n for n in graph[m]
+                         if n in state.assignment and state.slot_day[state.assignment[n]] == d)
+                ejected.append((n, state.unplace(n)))
+            if not state.fits(m, s) and state.blocked[m][d] == 0 and state.slot_modules[s]:
+                n = rng.choice(tuple(state.slot_modules[s]))
+                ejected.append((n, state.unplace(n)))
+            if not state.fits(m, s):
+                for n, held in reversed(ejected):
+                    state.place(n, *held)
+                continue
+            state.place(m, s)
+            delta = (state.balance([d]) - before
+                     + UNSCHEDULED_PENALTY * (len(ejected) - 1))
+            if _accept(delta, progress, rng):
+                unscheduled[i] = unscheduled[-1]
+                unscheduled.pop()
+                unscheduled.extend(n for n, _ in ejected)
+                cost += delta
+            else:
+                state.unplace(m)
+                for n, held in reversed(ejected):
+                    state.place(n, *held)
+
+        elif rng.random() < 0.5:
+            # MOVE a scheduled module to another slot
+            if not state.assignment:
+                continue
+            m = rng.choice(modules)
+            if m not in state.assignment:
+                continue
+            s2 = rng.randrange(state.n_slots)
+            s1 = state.assignment[m]
+            if s1 == s2:
+                continue
+            days = [state.slot_day[s1], state.slot_day[s2]]
+            before = state.balance(days)
+            held = state.unplace(m)
+            if not state.fits(m, s2):
+                state.place(m, *held)
+                continue
+            state.place(m, s2)
+            delta = state.balance(days) - before
+            if _accept(delta, progress, rng):
+                cost += delta
+            else:
+                state.unplace(m)
+                state.place(m, *held)
+
+        else:
+            # SWAP the slots of two scheduled modules
+            m1 = rng.choice(modules)
+            m2 = rng.choice(modules)
+            if m1 == m2 or m1 not in state.assignment or m2 not in state.assignment:
+                continue
+            s1 = state.assignment[m1]
+            s2 = state.assignment[m2]
+            if s1 == s2:
+                continue
+            days = [state.slot_day[s1], state.slot_day[s2]]
+            before = state.balance(days)
+            held1 = state.unplace(m1)
+            held2 = state.unplace(m2)
+            swapped = False
+            if state.fits(m1, s2):
+                state.place(m1, s2)
+                if state.fits(m2, s1):
+                    state.place(m2, s1)
+                    delta = state.balance(days) - before
+                    swapped = _accept(delta, progress, rng)
+                    if swapped:
+                        cost += delta
+                    else:
+                        state.unplace(m2)
+                if not swapped:
+                    state.unplace(m1)
+            if not swapped:
+                state.place(m1, *held1)
+                state.place(m2, *held2)
+
+        if cost < best_cost - 1e-9:
+            best_cost = cost
+            best = (dict(state.assignment), list(unscheduled))
+            curve.append((round(time.perf_counter() - start, 3), round(best_cost, 2)))
+
+    return best[0], best[1], curve
+
+# =====================================
+# ROOM / PROCTOR PHASE
+# =====================================
+
+def improve_assignments(exams, prof_ids, room_capacity, max_prof_per_day, seconds, rng=None,
+                        prof_department=None, module_department=None):
+    """
+    Descent (sideways moves allowed) on concrete room/proctor assignments
+    of a fixed slot plan:
+    - hand an exam to another free professor (evens out load, cost = sum load^2
+      plus DEPARTMENT_PENALTY per exam proctored outside its module's department)
+    - swap the rooms of two exams in the same slot (reduces capacity overflow)
+    Exams are updated in place. Returns the curve of (elapsed seconds, cost).
+
+    prof_ids: list of all professor ids
+    room_capacity: salle_id -> capacite
+    prof_department / module_department: prof_id / module_id -> departement_id
+    (without them departments are not considered)
+    """
+    rng = rng or random.Random()
+    start = time.perf_counter()
+    if not exams or not prof_ids:
+        return [(0.0, 0)]
+
+    load = dict.fromkeys(prof_ids, 0)
+    busy = set()                       # (prof_id, date, time)
+    daily = defaultdict(int)           # (prof_id, date) -> count
+    by_slot = defaultdict(list)        # (date, time) -> exam indexes
+    for i, e in enumerate(exams):
+        load[e["prof_id"]] += 1
+        busy.add((e["prof_id"], e["date_exam"], e["heure_debut"]))
+        daily[(e["prof_id"], e["date_exam"])] += 1
+        by_slot[(e["date_exam"], e["heure_debut"])].append(i)
+    slot_keys = [k for k, v in by_slot.items() if len(v) > 1]
+
+    def overflow(e, salle_id):
+        return max(0, len(e["student_ids"]) - room_capacity.get(salle_id, 0))
+
+    def outside(e, prof_id):
+        if prof_department is None or module_department is None:
+            return 0
+        return int(prof_department.get(prof_id) != module_department.get(e["module_id"]))
+
+    cost = (LOAD_WEIGHT * sum(v * v for v in load.values())
+            + OVERFLOW_WEIGHT * sum(overflow(e, e["salle_id"]) for e in exams)
+            + DEPARTMENT_PENALTY * sum(outside(e, e["prof_id"]) for e in exams))
+    curve = [(0.0, cost)]
+
+    while time.perf_counter() - start < seconds:
+        if not slot_keys or rng.random() < 0.5:
+            # REASSIGN proctor
+            e = exams[rng.randrange(len(exams))]
+            p = e["prof_id"]
+            q = rng.choice(prof_ids)
+            date, time_ = e["date_exam"], e["heure_debut"]
+            if q == p or (q, date, time_) in busy or daily[(q, date)] >= max_prof_per_day:
+                continue
+            delta = (LOAD_WEIGHT * 2 * (load[q] - load[p] + 1)
+                     + DEPARTMENT_PENALTY * (outside(e, q) - outside(e, p)))
+            if delta > 0:
+                continue
+            busy.discard((p, date, time_))
+            busy.add((q, date, time_))
+            daily[(p, date)] -= 1
+            daily[(q, date)] += 1
+            load[p] -= 1
+            load[q] += 1
+            e["prof_id"] = q
+        else:
+            # SWAP rooms inside a slot
+            i, j = rng.sample(by_slot[rng.choice(slot_keys)], 2)
+            a, b = exams[i], exams[j]
+            delta = OVERFLOW_WEIGHT * (overflow(a, b["salle_id"]) + overflow(b, a["salle_id"])
+                                       - overflow(a, a["salle_id"]) - overflow(b, b["salle_id"]))
+            if delta > 0:
+                continue
+            a["salle_id"], b["salle_id"] = b["salle_id"], a["salle_id"]
+
+        if delta < 0:
+            cost += delta
+            curve.append((round(time.perf_counter() - start, 3), cost))
+
+    return curve
@@ -0,0 +1,81 @@
+import numpy as np
+
+from backend.proctors import ProctorHeaps
+from backend.room_packing import pack_rooms
+
+# =====================================
+# OCCUPANCY MODEL
+# =====================================
+
+class Occupancy:
+    """
+    Array-backed occupancy of rooms and professors.
+    Slots and days are mapped to integer indexes; resources are rows:
+      room_busy[room, slot]   -> bool
+      prof_busy[prof, slot]   -> bool
+      prof_daily[prof, day]   -> number of exams supervised that day
+      prof_total[prof]        -> number of exams supervised overall
+    room_capacity (optional) is needed by fit_rooms.
+    prof_department (optional) lets free_profs prefer the module's department.
+    """
+
+    def __init__(self, slots, room_count, prof_count, max_prof_per_day, prof_department=None,
+                 room_capacity=None):
+        self.slots = list(slots)
+        self.days = sorted({s.date() for s in self.slots})
+        day_index = {d: i for i, d in enumerate(self.days)}
+        self.slot_index = {s: i for i, s in enumerate(self.slots)}
+        self.slot_day = np.array([day_index[s.date()] for s in self.slots], dtype=np.int32)
+        self.max_prof_per_day = max_prof_per_day
+        self.room_capacity = None if room_capacity is None else np.asarray(room_capacity)
+
+        self.room_busy = np.zeros((room_count, len(self.slots)), dtype=bool)
+        self.prof_busy = np.zeros((prof_count, len(self.slots)), dtype=bool)
+        self.prof_daily = np.zeros((prof_count, len(self.days)), dtype=np.int16)
+        self.prof_total = np.zeros(prof_count, dtype=np.int32)
+        if prof_department is None:
+            prof_department = np.zeros(prof_count, dtype=np.int64)
+        self.proctors = ProctorHeaps(self, prof_department)
+
+    def fit_rooms(self, slot_idx, size):
+        """
+        Indexes of the fewest free rooms of the slot seating `size` students
+        (see pack_rooms), largest first. None if the free rooms are too small.
+        """
+        free = np.flatnonzero(~self.room_busy[:, slot_idx])
+        packed = pack_rooms(self.room_capacity[free], size)
+        return None if packed is None else free[packed]
+
+    def free_profs(self, slot_idx, n, department=None):
+        """
+        Indexes of n available professors in the slot, least busy overall first,
+        from `department` first when given. None if fewer are available.
+        """
+        return self.proctors.take(slot_idx, n, department)
+
+    def reserve(self, slot_idx, room_idxs, prof_idxs):
+        day = self.slot_day[slot_idx]
+        self.room_busy[room_idxs, slot_idx] = True
+        self.prof_busy[prof_idxs, slot_idx] = True
+        self.prof_daily[prof_idxs, day] += 1
+        self.prof_total[prof_idxs] += 1
+        self.proctors.charge(prof_idxs)
+
+    def reserve_many(self, slot_idxs, room_idxs, prof_idxs):
+        """
+        Marks many existing exams at once (one room and one proctor each).
+        Negative indexes (unknown room/professor) are ignored.
+        """
+        slot_idxs = np.asarray(slot_idxs, dtype=np.int64)
+        room_idxs = np.asarray(room_idxs, dtype=np.int64)
+        prof_idxs = np.asarray(prof_idxs, dtype=np.int64)
+
+        rooms_ok = room_idxs >= 0
+        self.room_busy[room_idxs[rooms_ok], slot_idxs[rooms_ok]] = True
+
+        profs_ok = prof_idxs >= 0
+        ps, ss = prof_idxs[profs_ok], slot_idxs[profs_ok]
+        self.prof_busy[ps, ss] = True
+        np.add.at(self.prof_daily, (ps, self.slot_day[ss]), 1)
+        np.add.at(self.prof_total, ps, 1)
+        self.proctors.rebuild()
@@ -1,18 +1,28 @@
 from datetime import datetime, timedelta, time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import random
 import math
 
+import numpy as np
+
+from backend.conflict_graph import dsatur_assign_slots, graph_from_pairs
+from backend.ledger import ResourceLedger
+from backend.local_search import improve_slots, improve_assignments
+from backend.occupancy import Occupancy
+from backend.problem import load_problem
+from backend.proctors import balance_proctors
+from backend.room_packing import min_rooms, split_cohort
+from backend.tracing import Trace
+from backend.schedule_validator import validate_exams
 from backend.database import (
-    fetch_formations,
-    fetch_modules_by_formation,
-    fetch_students_by_formation,
-    fetch_rooms,
-    fetch_professors,
-    clear_existing_exams,
-    get_connection,
-    insert_exam,
-    insert_exam_groups  # Changed to plural
+    connection,
+    bulk_insert_schedule,
+    create_schedule_version,
+    drop_schedule_version,
+    prune_schedule_versions,
+    publish_schedule_version,
+    save_generation_report
 )
 
 # =========================
@@ -22,7 +32,6 @@ EXAM_DURATION = 90
 BREAK_DURATION = 10
 START_TIME = time(8, 30)
 END_TIME = time(15, 30)
-GROUP_SIZE = 40
 MAX_PROF_PER_DAY = 3
 
 # =========================
@@ -40,116 +49,520 @@ def generate_slots(start_date, end_date):
         d += timedelta(days=1)
     return slots
 
+# =========================
+# ROOM / PROCTOR ALLOCATION
+# =========================
+def allocate_resources(problem, assignment, module_students, stats=None, rooms=None, profs=None):
+    """
+    Allocates concrete rooms and proctors to modules whose slot is already chosen.
+    Slots are processed chronologically so daily proctor caps stay balanced.
+    Each cohort gets the fewest free rooms that seat it (one proctor per room);
+    modules of a slot are packed in assignment order, the order the slot
+    search packed them in, so the same rooms fit.
+    stats: optional counter dict, incremented with "room_rejections" / "prof_rejections"
+    rooms / profs: optional room and professor indexes to allocate from (default: all)
+    Returns (exams, unscheduled) where exams is a list of dicts ready to insert.
+    """
+    slots = problem.slots
+    rooms = np.arange(problem.n_rooms) if rooms is None else np.asarray(rooms)
+    profs = np.arange(problem.n_profs) if profs is None else np.asarray(profs)
+    occupancy = Occupancy(slots, len(rooms), len(profs), MAX_PROF_PER_DAY,
+                          prof_department=problem.prof_department[profs],
+                          room_capacity=problem.room_capacity[rooms])
+
+    modules_by_slot = defaultdict(list)
+    for m, slot_idx in assignment.items():
+        modules_by_slot[slot_idx].append(m)
+
+    exams = []
+    unscheduled = []
+
+    for slot_idx in sorted(modules_by_slot, key=lambda i: slots[i]):
+        slot = slots[slot_idx]
+        date = slot.date()
+        time_ = slot.time()
+
+        for m in modules_by_slot[slot_idx]:
+            students = module_students[m]
+
+            # ROOMS (fewest that seat the cohort), then one proctor per room
+            room_idxs = occupancy.fit_rooms(slot_idx, len(students))
+            prof_idxs = None if room_idxs is None else occupancy.free_profs(
+                slot_idx, len(room_idxs), int(problem.module_department[m]))
+
+            if room_idxs is None or prof_idxs is None:
+                if stats is not None:
+                    name = "room_rejections" if room_idxs is None else "prof_rejections"
+                    stats[name] = stats.get(name, 0) + 1
+                unscheduled.append(m)
+                continue
+
+            occupancy.reserve(slot_idx, room_idxs, prof_idxs)
+            groups = split_cohort(students, occupancy.room_capacity[room_idxs])
+
+            for group, r, p in zip(groups, rooms[room_idxs], profs[prof_idxs]):
+                exams.append({
+                    "module_id": int(problem.module_ids[m]),
+                    "salle_id": int(problem.room_ids[r]),
+                    "prof_id": int(problem.prof_ids[p]),
+                    "date_exam": date,
+                    "heure_debut": time_,
+                    "duree_minutes": EXAM_DURATION,
+                    "student_ids": group
+                })
+
+    return exams, unscheduled
+
+def place_modules(problem, graph, module_students, occupancy, module_day, to_place):
+    """
+    Greedily places modules around an existing occupancy (most constrained
+    first, least loaded day first). A module never shares a day with a
+    conflict-graph neighbour already in module_day.
+    Updates occupancy and module_day; returns (exams, unscheduled).
+    """
+    day_load = defaultdict(int)
+    for day in module_day.values():
+        day_load[day] += 1
+
+    def blocked_days(m):
+        return {module_day[n] for n in graph[m] if n in module_day}
+
+    to_place = sorted(to_place, key=lambda m: (-len(blocked_days(m)), -len(module_students[m])))
+
+    exams = []
+    unscheduled = []
+    for m in to_place:
+        students = module_students[m]
+        blocked = blocked_days(m)
+        candidates = [s for s in range(len(problem.slots))
+                      if occupancy.slot_day[s] not in blocked]
+        candidates.sort(key=lambda s: (day_load[occupancy.slot_day[s]], s))
+
+        for slot_idx in candidates:
+            room_idxs = occupancy.fit_rooms(slot_idx, len(students))
+            if room_idxs is None:
+                continue
+            prof_idxs = occupancy.free_profs(slot_idx, len(room_idxs), int(problem.module_department[m]))
+            if prof_idxs is None:
+                continue
+
+            occupancy.reserve(slot_idx, room_idxs, prof_idxs)
+            groups = split_cohort(students, occupancy.room_capacity[room_idxs])
+            day = int(occupancy.slot_day[slot_idx])
+            module_day[m] = day
+            day_load[day] += 1
+            slot = problem.slots[slot_idx]
+            for group, r, p in zip(groups, room_idxs, prof_idxs):
+                exams.append({
+                    "module_id": int(problem.module_ids[m]),
+                    "salle_id": int(problem.room_ids[r]),
+                    "prof_id": int(problem.prof_ids[p]),
+                    "date_exam": slot.date(),
+                    "heure_debut": slot.time(),
+                    "duree_minutes": EXAM_DURATION,
+                    "student_ids": group
+                })
+            break
+        else:
+            unscheduled.append(m)
+
+    return exams, unscheduled
+
+# =========================
+# SNAPSHOT
+# =========================
+def prepare_snapshot(problem):
+    """
+    Derives the solver inputs from a ScheduleProblem, keyed by module index:
+    the students to seat, the fewest rooms (and proctors) that can seat them
+    and the conflict graph.
+    The result is picklable so independent solves can run in worker processes.
+    """
+    # COHORTS: the students actually enrolled in each module (inscriptions)
+    module_students = {}
+    demand = {}
+    for m in range(problem.n_modules):
+        module_students[m] = problem.student_ids[problem.enrolled_students(m)].tolist()
+        demand[m] = min_rooms(problem.room_capacity, len(module_students[m]))
+
+    schedulable = []
+    for m in module_students:
+        if not module_students[m]:
+            print(f"⚠️ Module has no students: {problem.module_names[m]}")
+        elif demand[m] is None:
+            print(f"⚠️ Module has more students than seats: {problem.module_names[m]}")
+        else:
+            schedulable.append(m)
+
+    return {
+        "problem": problem,
+        "module_students": module_students,
+        "demand": demand,
+        "graph": graph_from_pairs(schedulable, problem.conflict_pairs().tolist())
+    }
+
+def load_snapshot(start_date, end_date):
+    """Loads the problem for the session window and prepares the solver inputs"""
+    return prepare_snapshot(load_problem(generate_slots(start_date, end_date)))
+
+# =========================
+# SOLVE & SCORE
+# =========================
+UNSCHEDULED_WEIGHT = 1000
+LOAD_SPREAD_WEIGHT = 10
+UTILIZATION_WEIGHT = 100
+SLOT_PHASE_SHARE = 0.7
+
+def score_schedule(snapshot, exams, unscheduled):
+    """
+    Scores a solved schedule (lower cost is better):
+    unscheduled modules dominate, then professor load spread (max - min),
+    then room utilization (students seated / seats of the rooms used).
+    own_department is reported only: share of exams proctored by a professor
+    of the module's department.
+    """
+    problem = snapshot["problem"]
+    prof_load = dict.fromkeys(problem.prof_ids.tolist(), 0)
+    prof_department = dict(zip(problem.prof_ids.tolist(), problem.prof_department.tolist()))
+    module_department = dict(zip(problem.module_ids.tolist(), problem.module_department.tolist()))
+    capacity = dict(zip(problem.room_ids.tolist(), problem.room_capacity.tolist()))
+    seated = 0
+    seats = 0
+    own = 0
+    for exam in exams:
+        prof_load[exam["prof_id"]] += 1
+        own += prof_department[exam["prof_id"]] == module_department[exam["module_id"]]
+        room_capacity = capacity[exam["salle_id"]]
+        seated += min(len(exam["student_ids"]), room_capacity)
+        seats += room_capacity
+
+    load_spread = max(prof_load.values()) - min(prof_load.values()) if prof_load else 0
+    utilization = seated / seats if seats else 0.0
+    cost = (UNSCHEDULED_WEIGHT * len(unscheduled)
+            + LOAD_SPREAD_WEIGHT * load_spread
+            + UTILIZATION_WEIGHT * (1 - utilization))
+
+    return {
+        "unscheduled": len(unscheduled),
+        "load_spread": load_spread,
+        "room_utilization": round(utilization, 4),
+        "own_department": round(own / len(exams), 4) if exams else 0.0,
+        "cost": round(cost, 4)
+    }
+
+def solve_schedule(snapshot, seed=None, improve_seconds=0):
+    """
+    One independent solve on an in-memory snapshot (no database access).
+    improve_seconds > 0 adds a local-search phase after the greedy construction
+    (70% of the budget on slots, 30% on rooms/proctors).
+    Returns the exams to insert, the unscheduled module indexes, the score,
+    the cost curves of the improvement phase and the search counters.
+    """
+    rng = random.Random(seed)
+    problem = snapshot["problem"]
+    graph = snapshot["graph"]
+    module_students = snapshot["module_students"]
+
+    # COLORING: days/slots first, against packed rooms and proctor counts
+    demand = {m: snapshot["demand"][m] for m in graph}
+    seats = {m: len(module_students[m]) for m in graph}
+    stats = {}
+    assignment, unscheduled = dsatur_assign_slots(
+        graph, demand, problem.slots, problem.n_rooms, problem.n_profs, MAX_PROF_PER_DAY,
+        rng=rng, stats=stats, seats=seats, room_capacity=problem.room_capacity
+    )
+
+    curves = {}
+    if improve_seconds > 0:
+        assignment, unscheduled, curves["slots"] = improve_slots(
+            graph, demand, problem.slots, assignment, problem.n_rooms, problem.n_profs,
+            MAX_PROF_PER_DAY, SLOT_PHASE_SHARE * improve_seconds, rng=rng,
+            seats=seats, room_capacity=problem.room_capacity
+        )
+
+    # ROOMS & PROCTORS for the chosen slots
+    exams, rejected = allocate_resources(problem, assignment, module_students, stats=stats)
+    unscheduled = unscheduled + rejected
+
+    if improve_seconds > 0:
+        curves["assignments"] = improve_assignments(
+            exams, problem.prof_ids.tolist(),
+            dict(zip(problem.room_ids.tolist(), problem.room_capacity.tolist())),
+            MAX_PROF_PER_DAY, (1 - SLOT_PHASE_SHARE) * improve_seconds, rng=rng,
+            prof_department=dict(zip(problem.prof_ids.tolist(), problem.prof_department.tolist())),
+            module_department=dict(zip(problem.module_ids.tolist(), problem.module_department.tolist()))
+        )
+
+    return {
+        "seed": seed,
+        "exams": exams,
+        "unscheduled": unscheduled,
+        "score": score_schedule(snapshot, exams, unscheduled),
+        "curves": curves,
+        "stats": stats
+    }
+
+def _solve_worker(args):
+    snapshot, seed, improve_seconds = args
+    return solve_schedule(snapshot, seed, improve_seconds)
+
+def solve_multi_start(snapshot, starts, workers=None, seed=None, improve_seconds=0,
+                      on_result=None):
+    """
+    Runs `starts` independently seeded solves in a process pool
+    and returns the best one (lowest cost).
+    on_result(done, starts) is called as each solve finishes.
+    """
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 31)
+    seeds = [seed + k for k in range(starts)]
+
+    if starts == 1:
+        result = solve_schedule(snapshot, seeds[0], improve_seconds)
+        if on_result:
+            on_result(1, 1)
+        return result
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_solve_worker, (snapshot, s, improve_seconds)) for s in seeds]
+        for future in as_completed(futures):
+            results.append(future.result())
+            if on_result:
+                on_result(len(results), starts)
+
+    for result in results:
+        print(f"   seed {result['seed']}: {result['score']}")
+
+    return min(results, key=lambda r: (r["score"]["cost"], r["seed"]))
+
+# =========================
+# DEPARTMENT DECOMPOSITION
+# =========================
+_worker_snapshot = None
+
+def _init_department_worker(snapshot):
+    global _worker_snapshot
+    _worker_snapshot = snapshot
+
+def _solve_department(args):
+    """
+    Solves one department on its own rooms and proctors (ledger quota),
+    ignoring conflicts with other departments (fixed by reconciliation).
+    """
+    department, modules, rooms, profs, seed = args
+    snapshot = _worker_snapshot
+    problem = snapshot["problem"]
+    module_students = snapshot["module_students"]
+    rng = random.Random(seed)
+
+    members = set(modules)
+    graph = {m: snapshot["graph"][m] & members for m in modules}
+    demand = {m: snapshot["demand"][m] for m in graph}
+    seats = {m: len(module_students[m]) for m in graph}
+    stats = {}
+    assignment, unscheduled = dsatur_assign_slots(
+        graph, demand, problem.slots, len(rooms), len(profs), MAX_PROF_PER_DAY, rng=rng, stats=stats,
+        seats=seats, room_capacity=problem.room_capacity[rooms]
+    )
+    exams, rejected = allocate_resources(problem, assignment, module_students, stats=stats,
+                                         rooms=rooms, profs=profs)
+    return department, exams, unscheduled + rejected, stats
+
+def reconcile(snapshot, exams, unscheduled):
+    """
+    Merges independently solved exams into one schedule: modules whose exams
+    clash with an already accepted module (shared room or proctor, proctor
+    daily cap, or a conflict-graph neighbour on the same day) are freed, then
+    every freed or unscheduled module is re-placed in the leftover capacity.
+    Returns (exams, unscheduled, number of freed modules).
+    """
+    problem = snapshot["problem"]
+    graph = snapshot["graph"]
+    occupancy = Occupancy(problem.slots, problem.n_rooms, problem.n_profs, MAX_PROF_PER_DAY,
+                          prof_department=problem.prof_department,
+                          room_capacity=problem.room_capacity)
+    room_pos = {rid: i for i, rid in enumerate(problem.room_ids.tolist())}
+    prof_pos = {pid: i for i, pid in enumerate(problem.prof_ids.tolist())}
+    module_pos = {mid: i for i, mid in enumerate(problem.module_ids.tolist())}
+
+    by_module = defaultdict(list)
+    for exam in exams:
+        by_module[module_pos[exam["module_id"]]].append(exam)
+
+    accepted = []
+    module_day = {}
+    freed = []
+    for m, module_exams in by_module.items():
+        slot_idx = occupancy.slot_index[datetime.combine(module_exams[0]["date_exam"],
+                                                         module_exams[0]["heure_debut"])]
+        day = int(occupancy.slot_day[slot_idx])
+        room_idxs = [room_pos[e["salle_id"]] for e in module_exams]
+        prof_idxs = [prof_pos[e["prof_id"]] for e in module_exams]
+        clash = (occupancy.room_busy[room_idxs, slot_idx].any()
+                 or occupancy.prof_busy[prof_idxs, slot_idx].any()
+                 or (occupancy.prof_daily[prof_idxs, day] >= MAX_PROF_PER_DAY).any()
+                 or any(module_day.get(n) == day for n in graph[m]))
+        if clash:
+            freed.append(m)
+            continue
+        occupancy.reserve(slot_idx, room_idxs, prof_idxs)
+        module_day[m] = day
+        accepted.extend(module_exams)
+
+    placed, unscheduled = place_modules(problem, graph, snapshot["module_students"], occupancy,
+                                        module_day, freed + list(unscheduled))
+    return accepted + placed, unscheduled, len(freed)
+
+def solve_decomposed(snapshot, workers=None, seed=None, on_result=None):
+    """
+    Solves every department in parallel against its ResourceLedger quota,
+    then reconciles the merged schedule. Same result shape as solve_schedule.
+    on_result(done, departments) is called as each department finishes.
+    """
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 31)
+    problem = snapshot["problem"]
+
+    modules_by_department = defaultdict(list)
+    for m in snapshot["graph"]:
+        modules_by_department[int(problem.module_department[m])].append(m)
+    seats = {m: len(snapshot["module_students"][m]) for m in snapshot["graph"]}
+    ledger = ResourceLedger.partition(problem, seats, snapshot["demand"], modules_by_department)
+
+    tasks = [(d, modules_by_department[d], ledger.rooms[d], ledger.profs[d], seed + k)
+             for k, d in enumerate(ledger.departments)]
+    exams, unscheduled = [], []
+    stats = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_department_worker,
+                             initargs=(snapshot,)) as pool:
+        futures = [pool.submit(_solve_department, task) for task in tasks]
+        for done, future in enumerate(as_completed(futures), start=1):
+            _, dept_exams, dept_unscheduled, dept_stats = future.result()
+            exams.extend(dept_exams)
+            unscheduled.extend(dept_unscheduled)
+            for name, n in dept_stats.items():
+                stats[name] = stats.get(name, 0) + n
+            if on_result:
+                on_result(done, len(tasks))
+
+    # Deterministic merge order, whatever the completion order
+    exams.sort(key=lambda e: (e["date_exam"], e["heure_debut"], e["module_id"]))
+    exams, unscheduled, stats["reconciled"] = reconcile(snapshot, exams, sorted(unscheduled))
+
+    return {
+        "seed": seed,
+        "exams": exams,
+        "unscheduled": unscheduled,
+        "score": score_schedule(snapshot, exams, unscheduled),
+        "curves": {},
+        "stats": stats,
+        "ledger": ledger.describe()
+    }
+
+# =========================
+# PERSIST
+# =========================
+def save_schedule(exams):
+    """
+    Stores the exams as a new schedule version (bulk COPY into staging
+    tables nobody reads), attaches it, then publishes it with a pointer swap:
+    readers see the previous schedule until that short transaction commits,
+    never a half-written one. Published student timetables are withdrawn
+    until the next approval; old versions are pruned afterwards.
+    If the insert or the publish fails, the staging version is dropped.
+    Returns the published version id.
+    """
+    with connection() as conn:
+        version_id = create_schedule_version(conn=conn)
+        try:
+            bulk_insert_schedule(exams, version_id=version_id, conn=conn)
+            publish_schedule_version(version_id, conn=conn)
+        except Exception:
+            conn.rollback()
+            drop_schedule_version(version_id)
+            raise
+    prune_schedule_versions()
+    return version_id
+
 # =========================
 # MAIN
 # =========================
-def generate_exam_schedule(start_date, end_date):
+def generate_exam_schedule(start_date, end_date, starts=1, workers=None, seed=None,
+                           improve_seconds=0, profile=False, progress=None, decompose=False,
+                           balance=False):
+    """
+    Generates and stores the exam schedule.
+    starts > 1 runs that many seeded solves in parallel (up to `workers`
+    processes) and only the best scoring schedule is written.
+    improve_seconds > 0 gives each solve a local-search budget.
+    decompose=True solves departments in parallel on partitioned rooms and
+    proctors instead (starts / improve_seconds are then ignored).
+    balance=True re-chooses every proctor by an exact min-cost assignment per slot.
+    profile=True adds a cProfile summary (of this process) to the report.
+    progress(percent, phase, **counts) is called between phases; it may raise
+    to abort the run (nothing is written before the "save" phase).
+
+    Returns the run report (phase timers, counters, score, violations),
+    which is also stored in generation_runs.
+    """
+    trace = Trace(profile=profile)
+    trace.info["parameters"] = {
+        "start_date": start_date.isoformat(), "end_date": end_date.isoformat(),
+        "starts": starts, "workers": workers, "seed": seed, "improve_seconds": improve_seconds,
+        "decompose": decompose, "balance": balance
+    }
+
+    progress = progress or (lambda percent, phase, **counts: None)
+
     print("🧠 Generating exams...")
-    clear_existing_exams()
-
-    rooms = fetch_rooms()
-    professors = fetch_professors()
-    formations = fetch_formations()
-    slots = generate_slots(start_date, end_date)
-    random.shuffle(slots)
-
-    room_busy = defaultdict(set)     # (date, time) -> set per room
-    prof_busy = defaultdict(set)     # (date, time) per prof
-    prof_daily = defaultdict(lambda: defaultdict(int))
-    prof_total = defaultdict(int)
-    formation_busy_days = defaultdict(set)  # date per formation
-
-    conn = get_connection()  # Single connection for all inserts
-
-    try:
-        for formation in formations:
-            formation_id = formation["id"]
-            students = fetch_students_by_formation(formation_id)
-            student_ids = [s["id"] for s in students]
-
-            modules = fetch_modules_by_formation(formation_id)
-
-            for module in modules:
-                scheduled = False
-
-                for slot in slots:
-                    date = slot.date()
-                    time_ = slot.time()
-
-                    # STUDENT: one exam per day (optimized: check formation busy days)
-                    if date in formation_busy_days[formation_id]:
-                        continue
-
-                    # GROUPS
-                    groups = [
-                        student_ids[i:i + GROUP_SIZE]
-                        for i in range(0, len(student_ids), GROUP_SIZE)
-                    ]
-
-                    free_rooms = [
-                        r for r in rooms
-                        if (date, time_) not in room_busy[r["salle_id"]]
-                    ]
-
-                    if len(free_rooms) < len(groups):
-                        continue
-
-                    # PROFS (fair distribution)
-                    free_profs = [
-                        p for p in professors
-                        if (date, time_) not in prof_busy[p["id"]]
-                        and prof_daily[p["id"]][date] < MAX_PROF_PER_DAY
-                    ]
-
-                    free_profs.sort(key=lambda p: prof_total[p["id"]])
-
-                    if len(free_profs) < len(groups):
-                        continue
-
-                    # 🔒 COMMIT
-                    for group_idx, (group, room, prof) in enumerate(zip(groups, free_rooms[:len(groups)], free_profs[:len(groups)])):
-                        exam_id = insert_exam(
-                            module_id=module["id"],
-                            salle_id=room["salle_id"],
-                            prof_id=prof["id"],
-                            date_exam=date,
-                            heure_debut=time_,
-                            duree_minutes=EXAM_DURATION,
-                            conn=conn,
-                            commit=False
-                        )
-
-                        if exam_id is None:
-                            # Handle failure (e.g., unique violation), skip or retry
-                            continue
-
-                        insert_exam_groups(exam_id, group, conn=conn, commit=False)
-
-                        room_busy[room["salle_id"]].add((date, time_))
-                        prof_busy[prof["id"]].add((date, time_))
-                        prof_daily[prof["id"]][date] += 1
-                        prof_total[prof["id"]] += 1
-
-                    # Only add busy day if all groups were scheduled successfully
-                    if len(groups) == group_idx + 1:  # All groups processed
-                        formation_busy_days[formation_id].add(date)
-                        scheduled = True
-                    else:
-                        # If partial failure, you may need to rollback partial inserts, but for simplicity, we proceed
-                        pass
-
-                    if scheduled:
-                        break
-
-                if not scheduled:
-                    print(f"⚠️ Module not scheduled: {module['nom']}")
-
-        conn.commit()  # Commit all at once
-        print("✅ Exams generated successfully")
-
-    except Exception as e:
-        conn.rollback()
-        raise e
-
-    finally:
-        conn.close()
+    progress(0, "load")
+    with trace.phase("load"):
+        problem = load_problem(generate_slots(start_date, end_date))
+    progress(10, "prepare", modules_total=problem.n_modules)
+    with trace.phase("prepare"):
+        snapshot = prepare_snapshot(problem)
+
+    progress(20, "solve")
+    on_result = lambda done, total: progress(20 + 60 * done // total, "solve")
+    with trace.phase("solve"):
+        if decompose:
+            result = solve_decomposed(snapshot, workers=workers, seed=seed, on_result=on_result)
+            trace.info["ledger"] = result["ledger"]
+        else:
+            result = solve_multi_start(snapshot, starts, workers=workers, seed=seed,
+                                       improve_seconds=improve_seconds, on_result=on_result)
+    if balance:
+        with trace.phase("balance"):
+            trace.count("proctors_rebalanced", balance_proctors(problem, result["exams"], MAX_PROF_PER_DAY))
+        result["score"] = score_schedule(snapshot, result["exams"], result["unscheduled"])
+    trace.add_counters(result["stats"])
+    trace.count("unscheduled", len(result["unscheduled"]))
+
+    for phase, curve in result["curves"].items():
+        print(f"   {phase} cost curve (s, cost): {curve[0]} -> {curve[-1]} ({len(curve)} points)")
+
+    for m in result["unscheduled"]:
+        print(f"⚠️ Module not scheduled: {problem.module_names[m]}")
+
+    progress(80, "save",
+             modules_scheduled=len({e["module_id"] for e in result["exams"]}),
+             modules_unscheduled=len(result["unscheduled"]))
+    with trace.phase("save"):
+        save_schedule(result["exams"])
+    trace.count("inserts", len(result["exams"]))
+    trace.count("seat_inserts", sum(len(e["student_ids"]) for e in result["exams"]))
+    print(f"✅ Exams generated successfully (seed {result['seed']}, {result['score']})")
+
+    progress(90, "validate")
+    with trace.phase("validate"):
+        audit = validate_exams(result["exams"], dict(zip(problem.room_ids.tolist(), problem.room_capacity.tolist())))
+    if not audit["ok"]:
+        print(f"⚠️ Hard-constraint violations: {audit['counts']}")
+
+    trace.info["seed"] = result["seed"]
+    trace.info["score"] = result["score"]
+    trace.info["violations"] = audit["counts"]
+    report = trace.report()
+    report["run_id"] = save_generation_report(report)
+    return report
@@ -0,0 +1,149 @@
+import numpy as np
+
+from backend.database import connection
+
+# =====================================
+# SCHEDULE PROBLEM SNAPSHOT
+# =====================================
+
+def _csr(owner_idx, member_idx, size):
+    """Groups member indexes by owner index: returns (indptr, members)"""
+    order = np.lexsort((member_idx, owner_idx))
+    counts = np.bincount(owner_idx, minlength=size)
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    return indptr, member_idx[order].astype(np.int32)
+
+
+def _positions(ids, values, missing=-1):
+    """Maps database ids to their row index in `ids` (sorted), -1 when unknown"""
+    values = np.asarray(values, dtype=np.int64)
+    if len(ids) == 0:
+        return np.full(len(values), missing, dtype=np.int32)
+    pos = np.searchsorted(ids, values)
+    pos = np.clip(pos, 0, len(ids) - 1)
+    return np.where(ids[pos] == values, pos, missing).astype(np.int32)
+
+
+class ScheduleProblem:
+    """
+    In-memory, picklable snapshot of everything the scheduler needs.
+    Entities are addressed by their row index; *_ids arrays map back to
+    database ids. Relations are id-indexed arrays or CSR pairs:
+      module_formation[m], module_department[m]
+      student_formation[s]
+      enrollment: module_indptr / module_students  (students of module m)
+                  student_indptr / student_modules (modules of student s)
+      room_capacity[r], prof_department[p]
+    """
+
+    def __init__(self, slots, formations, modules, students, inscriptions, rooms, professors):
+        """
+        formations:   (id, departement_id) rows
+        modules:      (id, nom, formation_id, departement_id) rows
+        students:     (id, formation_id) rows
+        inscriptions: (etudiant_id, module_id) rows
+        rooms:        (salle_id, nom, capacite) rows
+        professors:   (id, nom, prenom, departement_id) rows, in allocation order
+        """
+        self.slots = list(slots)
+
+        self.formation_ids = np.array([f[0] for f in formations], dtype=np.int64)
+        self.formation_department = np.array(
+            [-1 if f[1] is None else f[1] for f in formations], dtype=np.int32)
+
+        self.module_ids = np.array([m[0] for m in modules], dtype=np.int64)
+        self.module_names = [m[1] for m in modules]
+        self.module_formation = _positions(self.formation_ids, [m[2] or -1 for m in modules])
+        self.module_department = np.array(
+            [-1 if m[3] is None else m[3] for m in modules], dtype=np.int32)
+
+        self.student_ids = np.array([s[0] for s in students], dtype=np.int64)
+        self.student_formation = _positions(self.formation_ids, [s[1] or -1 for s in students])
+
+        self.room_ids = np.array([r[0] for r in rooms], dtype=np.int64)
+        self.room_names = [r[1] for r in rooms]
+        self.room_capacity = np.array([r[2] or 0 for r in rooms], dtype=np.int32)
+
+        self.prof_ids = np.array([p[0] for p in professors], dtype=np.int64)
+        self.prof_names = [f"{p[1]} {p[2] or ''}".strip() for p in professors]
+        self.prof_department = np.array(
+            [-1 if p[3] is None else p[3] for p in professors], dtype=np.int32)
+
+        # Enrollment CSR (module -> students), unknown ids dropped
+        enroll = np.array(inscriptions, dtype=np.int64).reshape(-1, 2)
+        e_student = _positions(self.student_ids, enroll[:, 0])
+        e_module = _positions(self.module_ids, enroll[:, 1])
+        keep = (e_student >= 0) & (e_module >= 0)
+        self.module_indptr, self.module_students = _csr(
+            e_module[keep], e_student[keep], len(self.module_ids))
+        self.student_indptr, self.student_modules = _csr(
+            e_student[keep], e_module[keep], len(self.student_ids))
+
+    @property
+    def n_modules(self):
+        return len(self.module_ids)
+
+    @property
+    def n_rooms(self):
+        return len(self.room_ids)
+
+    @property
+    def n_profs(self):
+        return len(self.prof_ids)
+
+    def enrolled_students(self, m):
+        """Student indexes enrolled in module m"""
+        return self.module_students[self.module_indptr[m]:self.module_indptr[m + 1]]
+
+    def conflict_pairs(self):
+        """
+        Distinct (module_a, module_b) index pairs, a < b, with at least one
+        student enrolled in both, read from the student-major CSR: each
+        student's modules are sorted, so pairing every position with the
+        ones `gap` further within the same student covers all pairs.
+        """
+        counts = np.diff(self.student_indptr)
+        owner = np.repeat(np.arange(len(counts)), counts)
+        modules = self.student_modules.astype(np.int64)
+        codes = [np.zeros(0, dtype=np.int64)]
+        for gap in range(1, int(counts.max(initial=0))):
+            same = owner[gap:] == owner[:-gap]
+            a, b = modules[:-gap][same], modules[gap:][same]
+            codes.append(np.unique(a[a != b] * self.n_modules + b[a != b]))
+        codes = np.unique(np.concatenate(codes))
+        return np.stack([codes // self.n_modules, codes % self.n_modules], axis=1)
+
+
+
+def load_problem(slots, conn=None):
+    """
+    Loads a ScheduleProblem with a handful of set-based queries on one connection.
+    """
+    with connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT id, departement_id FROM formations ORDER BY id")
+        formations = cur.fetchall()
+
+        cur.execute("""
+            SELECT m.id, m.nom, m.formation_id, f.departement_id
+            FROM modules m
+            LEFT JOIN formations f ON m.formation_id = f.id
+            ORDER BY m.id
+        """)
+        modules = cur.fetchall()
+
+        cur.execute("SELECT id, formation_id FROM etudiants ORDER BY id")
+        students = cur.fetchall()
+
+        cur.execute("SELECT etudiant_id, module_id FROM inscriptions")
+        inscriptions = cur.fetchall()
+
+        cur.execute("SELECT salle_id, nom, capacite FROM salles ORDER BY salle_id")
+        rooms = cur.fetchall()
+
+        cur.execute("SELECT id, nom, prenom, departement_id FROM professeurs ORDER BY nom, id")
+        professors = cur.fetchall()
+        cur.close()
+
+    return ScheduleProblem(slots, formations, modules, students, inscriptions, rooms, professors)
@@ -0,0 +1,103 @@
+import numpy as np
+
+# =====================================
+# ROOM PACKING
+# =====================================
+
+def apportion(total, weights):
+    """Splits `total` units proportionally to weights (largest remainder)"""
+    weights = np.asarray(weights, dtype=float)
+    if total <= 0 or weights.sum() <= 0:
+        return np.zeros(len(weights), dtype=np.int64)
+    exact = total * weights / weights.sum()
+    counts = np.floor(exact).astype(np.int64)
+    remainder = total - counts.sum()
+    counts[np.argsort(-(exact - counts), kind="stable")[:remainder]] += 1
+    return counts
+
+
+def pack_rooms(capacities, size):
+    """
+    Chooses the fewest rooms seating `size` students (best-fit decreasing):
+    the largest rooms are taken until a single room can seat the rest, then
+    the smallest such room closes the packing, so few seats are left empty.
+    Returns positions in `capacities` (largest room first), or None if all
+    of them together cannot seat the cohort.
+    """
+    capacities = np.asarray(capacities)
+    if size <= 0:
+        return np.zeros(0, dtype=np.int64)
+    order = np.argsort(-capacities, kind="stable")
+    sorted_caps = capacities[order]
+    seated = np.cumsum(sorted_caps)
+    k = int(np.searchsorted(seated, size))        # rooms before the closing one
+    if k == len(order):
+        return None
+    rest = size - (seated[k - 1] if k else 0)
+    # Rooms k.. seating `rest` form a prefix of the descending order: take its last
+    last = int(np.searchsorted(-sorted_caps, -rest, side="right")) - 1
+    return np.append(order[:k], order[last])
+
+
+def min_rooms(capacities, size):
+    """Fewest rooms needed to seat `size` students, None if impossible"""
+    packed = pack_rooms(capacities, size)
+    return None if packed is None else len(packed)
+
+
+def split_cohort(student_ids, capacities):
+    """Splits a cohort over packed rooms, every room filled to the same ratio"""
+    counts = apportion(len(student_ids), capacities)
+    bounds = np.concatenate([[0], np.cumsum(counts)])
+    return [student_ids[a:b] for a, b in zip(bounds[:-1].tolist(), bounds[1:].tolist())]
+
+
+class RoomClasses:
+    """
+    Free rooms of every slot counted per capacity class, for the slot searches
+    (no concrete room is chosen yet):
+      capacities[k]  -> seats of class k, largest first
+      free[slot][k]  -> free rooms of class k in the slot
+    pack() takes the same capacities as pack_rooms would on those rooms.
+    """
+
+    def __init__(self, room_capacity, n_slots):
+        capacities, counts = np.unique(np.asarray(room_capacity), return_counts=True)
+        keep = capacities > 0
+        self.capacities = capacities[keep][::-1].tolist()
+        counts = counts[keep][::-1].tolist()
+        self.free = [list(counts) for _ in range(n_slots)]
+
+    def pack(self, slot, size):
+        """Rooms used per class to seat `size` students in the slot, None if they do not fit"""
+        free = self.free[slot]
+        capacities = self.capacities
+        used = [0] * len(capacities)
+        rest = size
+        for k, capacity in enumerate(capacities):
+            if rest <= 0:
+                break
+            # Largest rooms while one room cannot seat the rest
+            taken = min(free[k], -(-rest // capacity) - 1)
+            used[k] = taken
+            rest -= taken * capacity
+            if free[k] > taken:
+                # Closing room: the smallest class that still seats the rest
+                j = max(j for j in range(k, len(capacities))
+                        if capacities[j] >= rest and free[j] > used[j])
+                used[j] += 1
+                return used
+        return used if rest <= 0 else None
+
+    def take(self, slot, used):
+        free = self.free[slot]
+        for k, n in enumerate(used):
+            free[k] -= n
+
+    def give(self, slot, used):
+        free = self.free[slot]
+        for k, n in enumerate(used):
+            free[k] += n
+
+    def seats_left(self, slot):
+        return sum(c * n for c, n in zip(self.capacities, self.free[slot]))
@@ -0,0 +1,120 @@
+import sys
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+# =====================================
+# SCHEDULE VERSION
+# =====================================
+# Every write that changes what the dashboards show (generation, incremental
+# rescheduling, approvals) bumps the version; cached reads are only served
+# for the version they were loaded under.
+
+_version = 0
+_version_lock = threading.Lock()
+_caches = []
+
+def schedule_version():
+    return _version
+
+def bump_schedule_version():
+    """Invalidates every cached schedule read of this process"""
+    global _version
+    with _version_lock:
+        _version += 1
+        for cache in _caches:
+            cache.clear()
+    return _version
+
+# =====================================
+# LRU CACHE
+# =====================================
+
+def _estimate_size(rows):
+    """Rough size in bytes of a list of row dicts"""
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row)
+        for value in row.values():
+            size += sys.getsizeof(value)
+    return size
+
+
+class LRUCache:
+    """
+    Thread-safe LRU map bounded by entry count and (optionally) estimated bytes.
+    Entries remember the schedule version they were loaded under.
+    """
+
+    def __init__(self, max_entries, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()    # key -> (version, value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, version, value):
+        size = _estimate_size(value) if self.max_bytes else 0
+        if self.max_bytes and size > self.max_bytes:
+            return
+        with self._lock:
+            # A write may have landed while the value was being loaded
+            if version != _version:
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[key] = (version, value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (
+                    self.max_bytes and self._bytes > self.max_bytes):
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes,
+                    "hits": self.hits, "misses": self.misses}
+
+
+def cached_schedule(max_entries, max_bytes=None):
+    """
+    Caches a schedule read per arguments (positional and keyword), shared by
+    every session of the process, until the next bump_schedule_version().
+    Cached rows are shared: callers must not mutate them.
+    The uncached function stays available as `fn.__wrapped__`.
+    """
+    def decorator(fn):
+        cache = LRUCache(max_entries, max_bytes)
+        _caches.append(cache)
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            version = _version
+            rows = cache.get(key, version)
+            if rows is None:
+                rows = fn(*args, **kwargs)
+                cache.put(key, version, rows)
+            return rows
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
@@ -0,0 +1,216 @@
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from backend.database import connection
+
+# =====================================
+# PARAMETERS
+# =====================================
+MAX_PROF_PER_DAY = 3
+FRIDAY = 4  # Monday=0 ... Friday=4
+
+# =====================================
+# ARRAY HELPERS
+# =====================================
+
+def _overlaps(resource, start, end):
+    """
+    Exam indexes whose [start, end) overlaps an earlier exam of the same resource.
+    Sorted by (resource, start); the running max end is reset per resource by
+    offsetting every resource into its own time band.
+    """
+    if len(resource) == 0:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+    order = np.lexsort((start, resource))
+    res = resource[order]
+    band = np.zeros(len(order), dtype=np.int64)
+    band[1:] = np.cumsum(res[1:] != res[:-1])
+    width = int(end.max() - start.min()) + 1
+    base = start.min()
+    s = (start[order] - base) + band * width
+    e = (end[order] - base) + band * width
+    running_end = np.maximum.accumulate(e)
+    clash = np.zeros(len(order), dtype=bool)
+    clash[1:] = s[1:] < running_end[:-1]
+    # Pair each clashing exam with the exam holding the resource before it
+    holder = np.zeros(len(order), dtype=np.int64)
+    holder[1:] = np.maximum.accumulate(np.where(e[:-1] == running_end[:-1],
+                                                np.arange(len(order) - 1), 0))
+    idx = np.flatnonzero(clash)
+    return order[idx], order[holder[idx]]
+
+
+def _lookup(keys, values, query, missing):
+    """values[keys == q] for every q in query, `missing` when absent"""
+    keys = np.asarray(keys, dtype=np.int64)
+    values = np.asarray(values, dtype=np.int64)
+    result = np.full(len(query), missing, dtype=np.int64)
+    if len(keys) == 0:
+        return result
+    order = np.argsort(keys)
+    pos = np.clip(np.searchsorted(keys[order], query), 0, len(keys) - 1)
+    found = keys[order][pos] == query
+    result[found] = values[order][pos][found]
+    return result
+
+
+def _count_pairs(a, b):
+    """Unique (a, b) pairs (as an n x 2 array) and how many times each occurs"""
+    if len(a) == 0:
+        return np.empty((0, 2), dtype=np.int64), np.array([], dtype=np.int64)
+    b_min = b.min()
+    width = int(b.max() - b_min) + 1
+    keys, counts = np.unique(a * width + (b - b_min), return_counts=True)
+    return np.stack([keys // width, keys % width + b_min], axis=1), counts
+
+# =====================================
+# VALIDATION
+# =====================================
+
+def validate_arrays(exam_ids, exam_room, exam_prof, exam_start, exam_duration,
+                    seat_exam, seat_student, room_ids, room_capacity):
+    """
+    Computes every hard-constraint violation of a schedule at once.
+
+    exam_*: one entry per exam; exam_start as datetime64[m], exam_duration in minutes
+    seat_exam / seat_student: COO entries of the student x exam matrix
+                              (exam index, student id)
+    room_ids / room_capacity: room id -> capacity lookup
+
+    Returns a report dict: "ok", "counts" and one list of rows per rule.
+    """
+    exam_ids = np.asarray(exam_ids, dtype=np.int64)
+    exam_room = np.asarray(exam_room, dtype=np.int64)
+    exam_prof = np.asarray(exam_prof, dtype=np.int64)
+    start = np.asarray(exam_start, dtype="datetime64[m]").astype(np.int64)
+    end = start + np.asarray(exam_duration, dtype=np.int64)
+    day = start // (24 * 60)
+    seat_exam = np.asarray(seat_exam, dtype=np.int64)
+    seat_student = np.asarray(seat_student, dtype=np.int64)
+
+    def as_date(days):
+        return np.datetime64(int(days), "D").astype(datetime).isoformat()
+
+    report = {}
+
+    # ROOM OVERLAPS
+    clash, holder = _overlaps(exam_room, start, end)
+    report["room_overlaps"] = [
+        {"exam_id": int(exam_ids[i]), "other_exam_id": int(exam_ids[j]), "salle_id": int(exam_room[i])}
+        for i, j in zip(clash, holder)
+    ]
+
+    # PROFESSOR OVERLAPS
+    clash, holder = _overlaps(exam_prof, start, end)
+    report["professor_overlaps"] = [
+        {"exam_id": int(exam_ids[i]), "other_exam_id": int(exam_ids[j]), "prof_id": int(exam_prof[i])}
+        for i, j in zip(clash, holder)
+    ]
+
+    # PROFESSORS > 3 EXAMS / DAY
+    pairs, counts = _count_pairs(exam_prof, day)
+    report["professor_daily_overload"] = [
+        {"prof_id": int(p), "date": as_date(d), "nb_examens": int(c)}
+        for (p, d), c in zip(pairs, counts) if c > MAX_PROF_PER_DAY
+    ]
+
+    # STUDENTS: more than one exam the same day (distinct exams)
+    seat_pairs, _ = _count_pairs(seat_student, seat_exam)
+    pairs, counts = _count_pairs(seat_pairs[:, 0], day[seat_pairs[:, 1]])
+    report["student_same_day"] = [
+        {"student_id": int(s), "date": as_date(d), "nb_examens": int(c)}
+        for (s, d), c in zip(pairs, counts) if c > 1
+    ]
+
+    # CAPACITY OVERRUNS
+    seated = np.bincount(seat_pairs[:, 1], minlength=len(exam_ids))
+    capacity = _lookup(room_ids, room_capacity, exam_room, missing=-1)
+    over = np.flatnonzero((capacity >= 0) & (seated > capacity))
+    report["capacity_overruns"] = [
+        {"exam_id": int(exam_ids[i]), "salle_id": int(exam_room[i]),
+         "capacite": int(capacity[i]), "seated": int(seated[i])}
+        for i in over
+    ]
+
+    # FRIDAY RULE (1970-01-01 was a Thursday)
+    weekday = (day + 3) % 7
+    report["friday_exams"] = [
+        {"exam_id": int(exam_ids[i]), "date": as_date(day[i])}
+        for i in np.flatnonzero(weekday == FRIDAY)
+    ]
+
+    report["counts"] = {rule: len(rows) for rule, rows in report.items()}
+    report["ok"] = not any(report["counts"].values())
+    return report
+
+
+def validate_exams(exams, room_capacity):
+    """
+    Validates in-memory exam dicts (as produced by the optimizer).
+    room_capacity: salle_id -> capacite
+    """
+    seat_exam = []
+    seat_student = []
+    for i, e in enumerate(exams):
+        seat_exam.extend([i] * len(e["student_ids"]))
+        seat_student.extend(e["student_ids"])
+
+    return validate_arrays(
+        [e.get("id", i) for i, e in enumerate(exams)],
+        [e["salle_id"] for e in exams],
+        [e["prof_id"] for e in exams],
+        [datetime.combine(e["date_exam"], e["heure_debut"]) for e in exams],
+        [e["duree_minutes"] for e in exams],
+        seat_exam, seat_student,
+        list(room_capacity), list(room_capacity.values())
+    )
+
+
+def audit_schedule(conn=None):
+    """
+    Loads the stored schedule (examens, exam_groups, salles) and validates it.
+    The report also carries the load and check timings in seconds.
+    """
+    started = time.perf_counter()
+    with connection(conn) as conn:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT id, salle_id, prof_id, date_exam + heure_debut, duree_minutes
+            FROM examens
+            ORDER BY id
+        """)
+        exams = cur.fetchall()
+        cur.execute("SELECT exam_id, student_id FROM exam_groups")
+        seats = np.array(cur.fetchall(), dtype=np.int64).reshape(-1, 2)
+        cur.execute("SELECT salle_id, capacite FROM salles")
+        rooms = cur.fetchall()
+        cur.close()
+    loaded = time.perf_counter()
+
+    exam_ids = np.array([e[0] for e in exams], dtype=np.int64)
+    seat_exam = np.searchsorted(exam_ids, seats[:, 0])
+
+    report = validate_arrays(
+        exam_ids,
+        [e[1] for e in exams],
+        [e[2] for e in exams],
+        np.array([e[3] for e in exams], dtype="datetime64[m]"),
+        [e[4] for e in exams],
+        seat_exam, seats[:, 1],
+        [r[0] for r in rooms], [r[1] or 0 for r in rooms]
+    )
+    report["timings"] = {
+        "load": round(loaded - started, 4),
+        "validate": round(time.perf_counter() - loaded, 4)
+    }
+    return report
+
+
+if __name__ == "__main__":
+    # CI entry point: python -m backend.schedule_validator
+    result = audit_schedule()
+    print(result["counts"], result["timings"])
+    sys.exit(0 if result["ok"] else 1)
@@ -0,0 +1,53 @@
+from database.bulk_seed import TABLES, seed_dataset
+
+
+def schema_objects(conn):
+    """Constraints and indexes of the database (the load drops and rebuilds them)"""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid)
+            FROM pg_constraint WHERE connamespace = 'public'::regnamespace
+            UNION ALL
+            SELECT tablename, indexname, indexdef FROM pg_indexes WHERE schemaname = 'public'
+            ORDER BY 1, 2, 3
+        """)
+        return cur.fetchall()
+
+
+def table_digest(conn):
+    with conn.cursor() as cur:
+        digest = {}
+        for table in TABLES:
+            cur.execute(f"SELECT COUNT(*), md5(string_agg(t::text, ',' ORDER BY t::text)) FROM {table} t")
+            digest[table] = cur.fetchone()
+        return digest
+
+
+def test_seed_is_complete_reproducible_and_keeps_the_schema(schema_db):
+    before = schema_objects(schema_db)
+    result = seed_dataset(500, formations=20, rooms=12, professors=30, seed=3, conn=schema_db)
+    assert schema_objects(schema_db) == before
+
+    digest = table_digest(schema_db)
+    assert digest["etudiants"][0] == digest["etudiant_logins"][0] == result["students"] == 500
+    assert digest["formations"][0] == result["formations"] == 20
+    assert digest["modules"][0] == result["modules"]
+    assert digest["inscriptions"][0] == result["inscriptions"]
+    assert digest["salles"][0] == 12 and digest["professeurs"][0] == 30
+
+    with schema_db.cursor() as cur:
+        # Every student sits modules of their own formation
+        cur.execute("""
+            SELECT COUNT(*) FROM inscriptions i
+            JOIN etudiants e ON e.id = i.etudiant_id
+            JOIN modules m ON m.id = i.module_id
+            WHERE m.formation_id <> e.formation_id
+        """)
+        assert cur.fetchone()[0] == 0
+        # Sequences continue after the copied ids
+        cur.execute("INSERT INTO departements (nom) VALUES ('Nouveau') RETURNING id")
+        assert cur.fetchone()[0] == digest["departements"][0] + 1
+    schema_db.rollback()
+
+    seed_dataset(500, formations=20, rooms=12, professors=30, seed=3, conn=schema_db)
+    assert table_digest(schema_db) == digest
@@ -0,0 +1,85 @@
+import random
+from datetime import datetime, timedelta
+
+from backend.conflict_detector import ConstraintState, is_exam_valid
+
+MONDAY = datetime(2026, 1, 5, 8, 30)
+PROFS = [{"id": p, "departement_id": p % 2} for p in range(1, 5)]
+SALLES = [{"salle_id": r, "capacite": c} for r, c in ((1, 3), (2, 6), (3, 10))]
+
+
+def reference_is_valid(existing_exams, module_id, module_students, salle, prof,
+                       date_heure, duree, module_department_id, prof_list):
+    """is_exam_valid as plain scans over the list (the rules the index must keep)"""
+    def overlap(exam):
+        end = exam["date_heure"] + timedelta(minutes=exam["duree_minutes"])
+        return max(exam["date_heure"], date_heure) < min(end, date_heure + timedelta(minutes=duree))
+
+    day = date_heure.date()
+    load = {p["id"]: 0 for p in prof_list}
+    for exam in existing_exams:
+        load[exam["prof_id"]] += 1
+
+    checks = [
+        (date_heure.weekday() != 4, "Exams cannot be scheduled on Friday"),
+        (all(e["module_id"] != module_id for e in existing_exams),
+         "This module already has an exam scheduled"),
+        (not any(e["salle_id"] == salle["salle_id"] and overlap(e) for e in existing_exams),
+         f"Salle {salle['salle_id']} is occupied"),
+        (not any(e["date_heure"].date() == day and set(e["students"]) & set(module_students)
+                 for e in existing_exams),
+         "Student conflict: multiple exams in same day"),
+        (sum(e["prof_id"] == prof["id"] and e["date_heure"].date() == day for e in existing_exams) < 3,
+         f"Professor {prof['id']} already has 3 exams scheduled that day"),
+        (salle["capacite"] >= len(module_students), "Room capacity exceeded"),
+        (prof["departement_id"] == module_department_id,
+         "Professor should prioritize exams in their own department"),
+        (max(load.values()) - min(load.values()) <= 1, "Professor exam load is unbalanced"),
+    ]
+    for ok, reason in checks:
+        if not ok:
+            return False, reason
+    return True, None
+
+
+def random_exam(rng, module_id):
+    return {
+        "module_id": module_id,
+        "salle_id": rng.choice(SALLES)["salle_id"],
+        "prof_id": rng.choice(PROFS)["id"],
+        "date_heure": MONDAY + timedelta(days=rng.randrange(6), minutes=30 * rng.randrange(16)),
+        "duree_minutes": rng.choice((60, 90, 120, 180)),
+        "students": rng.sample(range(300), rng.randint(1, 8)),
+    }
+
+
+def test_constraint_state_matches_list_scans():
+    rng = random.Random(7)
+    state = ConstraintState(PROFS)
+    existing = []
+    for step in range(400):
+        proposal = random_exam(rng, step if rng.random() < 0.9 else rng.randrange(step + 1))
+        salle = SALLES[proposal["salle_id"] - 1]
+        prof = PROFS[proposal["prof_id"] - 1]
+        args = (proposal["module_id"], proposal["students"], salle, prof,
+                proposal["date_heure"], proposal["duree_minutes"], rng.randrange(2))
+        expected = reference_is_valid(existing, *args, PROFS)
+        assert state.is_valid(*args) == expected
+        assert is_exam_valid(existing, *args, PROFS) == expected
+
+        # Keep the schedule moving: accept most proposals, sometimes drop an exam
+        if existing and rng.random() < 0.2:
+            state.remove(existing.pop(rng.randrange(len(existing))))
+        else:
+            existing.append(proposal)
+            state.add(proposal)
+
+
+def test_room_overlap_with_a_long_earlier_exam():
+    long_exam = {"module_id": 1, "salle_id": 1, "prof_id": 1, "date_heure": MONDAY,
+                 "duree_minutes": 240, "students": [1]}
+    short_exam = dict(long_exam, module_id=2, date_heure=MONDAY + timedelta(minutes=60),
+                      duree_minutes=30, students=[2])
+    state = ConstraintState(exams=[long_exam, short_exam])
+    assert state.room_not_occupied(1, MONDAY + timedelta(minutes=180), 30) == (False, "Salle 1 is occupied")
+    assert state.room_not_occupied(1, MONDAY + timedelta(minutes=240), 30) == (True, None)
@@ -1,4 +1,14 @@
 from backend.database import fetch_formations
 
-formations = fetch_formations()
-print(len(formations), "formations loaded")
+
+def test_fetch_formations(schema_db):
+    with schema_db.cursor() as cur:
+        cur.execute("""
+            INSERT INTO departements (nom) VALUES ('Informatique');
+            INSERT INTO formations (nom, cycle, niveau, departement_id)
+            VALUES ('M1 Info', 'MASTER', 1, 1), ('L1 Info', 'LICENCE', 1, 1);
+        """)
+    schema_db.commit()
+
+    formations = fetch_formations()
+    assert [f["nom"] for f in formations] == ["L1 Info", "M1 Info"]
@@ -0,0 +1,40 @@
+import pytest
+
+from backend.database import connection, publish_schedule_version, try_generation_lock
+from backend.incremental import reschedule_incremental
+from backend.test_schedule_versions import seed_reference_data, stage_version
+
+
+def published_exams():
+    with connection() as conn, conn.cursor() as cur:
+        cur.execute("SELECT version_id FROM schedule_pointer")
+        version_id = cur.fetchone()[0]
+        cur.execute("SELECT module_id, COUNT(*) FROM examens GROUP BY module_id ORDER BY module_id")
+        return version_id, cur.fetchall()
+
+
+def test_reschedule_rewrites_only_the_changed_module(schema_db):
+    seed_reference_data(schema_db)
+    version_id = stage_version(5)
+    publish_schedule_version(version_id)
+    with schema_db.cursor() as cur:
+        cur.execute("SELECT id FROM examens WHERE module_id = 2")
+        kept = cur.fetchone()[0]
+
+    summary = reschedule_incremental(modules=[1])
+    assert summary == {"freed_modules": 1, "exams_written": 1, "unscheduled": 0}
+    assert published_exams() == (version_id, [(1, 1), (2, 1)])
+    with schema_db.cursor() as cur:
+        cur.execute("SELECT id FROM examens WHERE module_id = 2")
+        assert cur.fetchone()[0] == kept
+
+
+def test_reschedule_waits_for_running_generations(schema_db):
+    seed_reference_data(schema_db)
+    publish_schedule_version(stage_version(5))
+    holder = try_generation_lock()
+    try:
+        with pytest.raises(RuntimeError):
+            reschedule_incremental(modules=[1])
+    finally:
+        holder.close()
@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+
+from backend.database import (
+    claim_generation_job,
+    connection,
+    create_generation_job,
+    try_generation_lock
+)
+from backend.jobs import fail_orphaned_jobs, run_job
+
+
+def job_row(job_id):
+    with connection() as conn, conn.cursor() as cur:
+        cur.execute("SELECT status, message FROM generation_jobs WHERE id = %s", (job_id,))
+        return cur.fetchone()
+
+
+def test_job_fails_while_another_generation_holds_the_lock(schema_db):
+    job_id = create_generation_job({"start_date": "2026-01-05", "end_date": "2026-01-16"})
+    holder = try_generation_lock()
+    try:
+        assert try_generation_lock() is None
+        assert run_job(job_id) is None
+    finally:
+        holder.close()
+    assert job_row(job_id) == ("failed", "Another generation is already running")
+
+    other = try_generation_lock()
+    assert other is not None
+    other.close()
+
+
+def test_running_job_with_a_dead_process_is_failed(schema_db):
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    orphan = create_generation_job({"start_date": "2026-01-05", "end_date": "2026-01-16"})
+    alive = create_generation_job({"start_date": "2026-01-05", "end_date": "2026-01-16"})
+    claim_generation_job(orphan, pid=dead.pid)
+    claim_generation_job(alive, pid=os.getpid())
+    with schema_db.cursor() as cur:
+        cur.execute("UPDATE generation_jobs SET started_at = NOW() - INTERVAL '1 minute'")
+    schema_db.commit()
+
+    # A live generation holds the lock: nothing is orphaned yet
+    holder = try_generation_lock()
+    try:
+        assert fail_orphaned_jobs() == 0
+    finally:
+        holder.close()
+
+    assert fail_orphaned_jobs() == 1
+    assert job_row(orphan) == ("failed", "Job process exited unexpectedly")
+    assert job_row(alive)[0] == "running"
@@ -0,0 +1,79 @@
+import copy
+import random
+import time
+
+from backend.conflict_graph import dsatur_assign_slots
+from backend.local_search import SlotState, improve_slots
+from backend.optimizer import MAX_PROF_PER_DAY, prepare_snapshot, solve_schedule
+from backend.schedule_validator import validate_exams
+from benchmarks.synthetic import synthetic_problem
+
+
+def tight_snapshot():
+    """13k students on 25 rooms and 50 professors over 12 days: modules compete for every slot"""
+    return prepare_snapshot(synthetic_problem(13000, 25, 50, 12, seed=1))
+
+
+def test_ejected_modules_get_back_exactly_their_rooms():
+    snapshot = tight_snapshot()
+    problem, graph = snapshot["problem"], snapshot["graph"]
+    demand = {m: snapshot["demand"][m] for m in graph}
+    seats = {m: len(snapshot["module_students"][m]) for m in graph}
+    args = (graph, demand, problem.slots, problem.n_rooms, problem.n_profs, MAX_PROF_PER_DAY)
+    assignment, _ = dsatur_assign_slots(*args, rng=random.Random(0), seats=seats,
+                                        room_capacity=problem.room_capacity)
+    state = SlotState(*args, seats=seats, room_capacity=problem.room_capacity)
+    for m, s in assignment.items():
+        state.place(m, s)
+
+    for s in range(state.n_slots):
+        if len(state.slot_modules[s]) < 2:
+            continue
+        before = copy.deepcopy((state.rooms.free, state.profs_left, state.day_profs_left, state.used))
+        m1, m2 = sorted(state.slot_modules[s])[:2]
+        held1, held2 = state.unplace(m1), state.unplace(m2)
+        state.place(m1, *held1)
+        state.place(m2, *held2)
+        assert (state.rooms.free, state.profs_left, state.day_profs_left, state.used) == before
+
+
+def test_slot_annealing_keeps_its_budget_and_only_improves():
+    snapshot = tight_snapshot()
+    problem, graph = snapshot["problem"], snapshot["graph"]
+    demand = {m: snapshot["demand"][m] for m in graph}
+    seats = {m: len(snapshot["module_students"][m]) for m in graph}
+    args = (graph, demand, problem.slots, problem.n_rooms, problem.n_profs, MAX_PROF_PER_DAY)
+    assignment, _ = dsatur_assign_slots(*args, rng=random.Random(0), seats=seats,
+                                        room_capacity=problem.room_capacity)
+
+    start = time.perf_counter()
+    best, unscheduled, curve = improve_slots(
+        graph, demand, problem.slots, assignment, problem.n_rooms, problem.n_profs,
+        MAX_PROF_PER_DAY, 0.5, rng=random.Random(0), seats=seats, room_capacity=problem.room_capacity
+    )
+    assert time.perf_counter() - start < 1.5
+    costs = [cost for _, cost in curve]
+    assert costs == sorted(costs, reverse=True) and len(set(costs)) == len(costs)
+
+    # Every module is placed or left out exactly once, never next to a neighbour
+    assert sorted(list(best) + unscheduled) == sorted(graph)
+    day = {m: problem.slots[s].date() for m, s in best.items()}
+    for m in best:
+        assert all(day.get(n) != day[m] for n in graph[m])
+
+
+def test_slot_annealing_on_a_tight_instance():
+    snapshot = tight_snapshot()
+    problem = snapshot["problem"]
+    capacity = dict(zip(problem.room_ids.tolist(), problem.room_capacity.tolist()))
+    for seed in (0, 1):
+        result = solve_schedule(snapshot, seed=seed, improve_seconds=0.5)
+        assert validate_exams(result["exams"], capacity)["ok"]
+
+
+def test_proctor_descent_keeps_proctors_in_their_department():
+    snapshot = prepare_snapshot(synthetic_problem(2000, 60, 120, 14, seed=0))
+    greedy = solve_schedule(snapshot, seed=0)["score"]
+    improved = solve_schedule(snapshot, seed=0, improve_seconds=0.5)["score"]
+    assert improved["load_spread"] <= greedy["load_spread"]
+    assert improved["own_department"] >= greedy["own_department"] - 0.01
@@ -1,3 +1,94 @@
-from backend.optimizer import generate_exam_schedule
+import itertools
+import random
+import sys
+from datetime import date
 
-generate_exam_schedule()
+import numpy as np
+
+from backend.conflict_graph import dsatur_assign_slots
+from backend.optimizer import (
+    MAX_PROF_PER_DAY,
+    generate_exam_schedule,
+    prepare_snapshot,
+    solve_decomposed,
+    solve_multi_start,
+    solve_schedule
+)
+from backend.room_packing import min_rooms, pack_rooms
+from backend.schedule_validator import validate_exams
+from benchmarks.synthetic import scale_problem, synthetic_problem
+
+
+def small_snapshot(seed=0):
+    return prepare_snapshot(scale_problem("2k", seed=seed))
+
+
+def room_capacity(problem):
+    return dict(zip(problem.room_ids.tolist(), problem.room_capacity.tolist()))
+
+
+def test_dsatur_never_puts_neighbours_on_the_same_day():
+    snapshot = small_snapshot()
+    problem, graph = snapshot["problem"], snapshot["graph"]
+    assignment, unscheduled = dsatur_assign_slots(
+        graph, {m: snapshot["demand"][m] for m in graph}, problem.slots, problem.n_rooms,
+        problem.n_profs, MAX_PROF_PER_DAY, rng=random.Random(0),
+        seats={m: len(snapshot["module_students"][m]) for m in graph},
+        room_capacity=problem.room_capacity
+    )
+    assert not unscheduled
+    assert set(assignment) == set(graph)
+    day = {m: problem.slots[s].date() for m, s in assignment.items()}
+    for m, neighbours in graph.items():
+        assert all(day[m] != day[n] for n in neighbours)
+
+
+def test_solved_schedule_is_valid_and_seats_every_enrollment():
+    snapshot = small_snapshot(seed=3)
+    problem = snapshot["problem"]
+    for result in (solve_schedule(snapshot, seed=3), solve_decomposed(snapshot, workers=1, seed=3)):
+        assert not result["unscheduled"]
+        assert validate_exams(result["exams"], room_capacity(problem))["ok"]
+
+        seated = {}
+        for exam in result["exams"]:
+            seated.setdefault(exam["module_id"], []).extend(exam["student_ids"])
+        for m in range(problem.n_modules):
+            module_id = int(problem.module_ids[m])
+            assert sorted(seated[module_id]) == sorted(snapshot["module_students"][m])
+
+
+def test_multi_start_keeps_the_cheapest_seed():
+    # Tight enough that seeds 10, 11 and 12 end with different costs
+    snapshot = prepare_snapshot(synthetic_problem(5000, 25, 50, 12, seed=0))
+    progress = []
+    best = solve_multi_start(snapshot, starts=3, workers=2, seed=10,
+                             on_result=lambda done, starts: progress.append((done, starts)))
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+
+    # Each start is an independent, seeded solve: the same one in this process
+    costs = {seed: solve_schedule(snapshot, seed=seed)["score"]["cost"] for seed in (10, 11, 12)}
+    assert len(set(costs.values())) == 3
+    assert best["seed"] == min(costs, key=costs.get)
+    assert best["score"]["cost"] == costs[best["seed"]]
+
+
+def test_pack_rooms_uses_the_fewest_rooms():
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        capacities = rng.choice([20, 30, 100, 300], size=rng.integers(1, 7))
+        size = int(rng.integers(1, capacities.sum() + 50))
+        packed = pack_rooms(capacities, size)
+        if capacities.sum() < size:
+            assert packed is None
+            continue
+        assert len(set(packed.tolist())) == len(packed)
+        assert capacities[packed].sum() >= size
+        fewest = next(k for k in range(1, len(capacities) + 1)
+                      if any(sum(c) >= size for c in itertools.combinations(capacities.tolist(), k)))
+        assert len(packed) == fewest == min_rooms(capacities, size)
+
+
+if __name__ == "__main__":
+    # python -m backend.test_optimizer 2026-01-05 2026-01-25
+    generate_exam_schedule(date.fromisoformat(sys.argv[1]), date.fromisoformat(sys.argv[2]))
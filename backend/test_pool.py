@@ -0,0 +1,58 @@
+import pytest
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+
+from backend.database import ConnectionPool
+
+
+def backend_pid(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_backend_pid()")
+        return cur.fetchone()[0]
+
+
+def test_returned_connections_are_rolled_back_and_reused(schema_db):
+    pool = ConnectionPool(1, 2)
+    conn = pool.getconn()
+    with conn.cursor() as cur:
+        cur.execute("INSERT INTO departements (nom) VALUES ('Uncommitted')")
+    pool.putconn(conn)
+    assert conn.get_transaction_status() == extensions.TRANSACTION_STATUS_IDLE
+
+    assert pool.getconn() is conn
+    with conn.cursor() as cur:
+        cur.execute("SELECT COUNT(*) FROM departements")
+        assert cur.fetchone()[0] == 0
+    pool.putconn(conn)
+    pool.closeall()
+
+
+def test_exhausted_pool_waits_then_times_out(schema_db):
+    pool = ConnectionPool(0, 1, timeout=0.1)
+    conn = pool.getconn()
+    with pytest.raises(PoolError):
+        pool.getconn()
+
+    # A closed connection frees its place for a new one
+    conn.close()
+    pool.putconn(conn)
+    other = pool.getconn()
+    assert other is not conn and not other.closed
+    pool.putconn(other)
+    pool.closeall()
+
+
+def test_dead_idle_connections_are_replaced_on_checkout(schema_db):
+    pool = ConnectionPool(1, 1, health_check_after=0)
+    conn = pool.getconn()
+    pid = backend_pid(conn)
+    conn.rollback()
+    pool.putconn(conn)
+    with schema_db.cursor() as cur:
+        cur.execute("SELECT pg_terminate_backend(%s, 5000)", (pid,))
+    schema_db.commit()
+
+    fresh = pool.getconn()
+    assert fresh is not conn and backend_pid(fresh) != pid
+    pool.putconn(fresh)
+    pool.closeall()
@@ -0,0 +1,52 @@
+from datetime import date, time
+
+from psycopg2 import sql
+
+from backend.database import (
+    delete_exams_for_modules,
+    fetch_rollup_freshness,
+    insert_exam,
+    insert_exam_groups,
+    publish_schedule_version,
+    refresh_rollups
+)
+from backend.test_schedule_versions import seed_reference_data, stage_version
+
+
+def stale_rollups(conn):
+    """Rollups whose stored rows differ from a full recompute of their query"""
+    stale = []
+    with conn.cursor() as cur:
+        cur.execute("SELECT matviewname, definition FROM pg_matviews WHERE matviewname LIKE 'rollup_%'")
+        rollups = cur.fetchall()
+        assert len(rollups) == 5
+        for name, definition in rollups:
+            definition = definition.rstrip().rstrip(";")
+            cur.execute(sql.SQL("""
+                SELECT (SELECT COUNT(*) FROM ({q} EXCEPT ALL SELECT * FROM {t}) a)
+                     + (SELECT COUNT(*) FROM (SELECT * FROM {t} EXCEPT ALL {q}) b)
+            """).format(q=sql.SQL(definition), t=sql.Identifier(name)))
+            if cur.fetchone()[0]:
+                stale.append(name)
+    conn.commit()
+    return stale
+
+
+def test_rollups_match_a_recompute_after_publish_and_refresh(schema_db):
+    seed_reference_data(schema_db)
+    version_id = stage_version(5)
+    publish_schedule_version(version_id)
+    assert stale_rollups(schema_db) == []
+    assert fetch_rollup_freshness()["version_id"] == version_id
+
+    # Changes to the published schedule show once the rollups are refreshed
+    delete_exams_for_modules([1])
+    exam_id = insert_exam(1, 1, 1, date(2026, 1, 6), time(10, 10), 90)
+    insert_exam_groups(exam_id, [1, 2, 3])
+    assert "rollup_exams_per_day" in stale_rollups(schema_db)
+    refresh_rollups()
+    assert stale_rollups(schema_db) == []
+
+    with schema_db.cursor() as cur:
+        cur.execute("SELECT date_exam, nb_examens, nb_etudiants FROM rollup_exams_per_day ORDER BY 1")
+        assert cur.fetchall() == [(date(2026, 1, 5), 1, 2), (date(2026, 1, 6), 1, 3)]
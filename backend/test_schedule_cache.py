@@ -0,0 +1,79 @@
+from backend.database import delete_exams_for_modules, fetch_prof_schedule, publish_schedule_version
+from backend.schedule_cache import (
+    LRUCache,
+    bump_schedule_version,
+    cached_schedule,
+    schedule_version
+)
+from backend.test_schedule_versions import seed_reference_data, stage_version
+
+
+def test_cached_reads_last_until_the_next_bump():
+    calls = []
+
+    @cached_schedule(max_entries=4)
+    def fetch(student_id, day=None):
+        calls.append((student_id, day))
+        return [{"student_id": student_id, "day": day}]
+
+    assert fetch(1) is fetch(1)
+    assert fetch(1, day=2) == [{"student_id": 1, "day": 2}]
+    assert calls == [(1, None), (1, 2)]
+
+    bump_schedule_version()
+    fetch(1)
+    assert calls == [(1, None), (1, 2), (1, None)]
+    assert fetch.cache.stats()["hits"] == 1
+
+
+def test_schedule_writes_invalidate_cached_reads(schema_db):
+    seed_reference_data(schema_db)
+    publish_schedule_version(stage_version(5))
+    assert len(fetch_prof_schedule(1)) == 1
+
+    # Writes that bypass the backend are not seen until the next bump
+    with schema_db.cursor() as cur:
+        cur.execute("UPDATE exam_versions SET duree_minutes = 120")
+    schema_db.commit()
+    assert fetch_prof_schedule(1)[0]["duree_minutes"] == 90
+
+    delete_exams_for_modules([2])
+    assert fetch_prof_schedule(1)[0]["duree_minutes"] == 120
+    delete_exams_for_modules([1])
+    assert fetch_prof_schedule(1) == []
+
+
+def test_rows_loaded_across_a_bump_are_not_kept():
+    cache = LRUCache(max_entries=4)
+    version = schedule_version()
+    bump_schedule_version()    # a write landed while the rows were loading
+    cache.put("key", version, [{"id": 1}])
+    assert cache.get("key", version) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    version = schedule_version()
+    cache = LRUCache(max_entries=2)
+    for key in "abc":
+        cache.put(key, version, [{"id": key}])
+        cache.get("a", version)    # keep "a" the most recently used
+    assert cache.get("a", version) is not None
+    assert cache.get("b", version) is None
+    assert cache.get("c", version) is not None
+
+    rows = [{"id": n} for n in range(10)]
+    cache = LRUCache(max_entries=10, max_bytes=3 * cache_size(rows))
+    for key in range(5):
+        cache.put(key, version, rows)
+    assert cache.stats()["entries"] == 3
+    assert [cache.get(key, version) is not None for key in range(5)] == [False, False, True, True, True]
+
+    cache.put("huge", version, rows * 10)
+    assert cache.get("huge", version) is None
+
+
+def cache_size(rows):
+    cache = LRUCache(max_entries=1, max_bytes=10 ** 9)
+    cache.put("rows", schedule_version(), rows)
+    return cache.stats()["bytes"]
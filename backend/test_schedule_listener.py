@@ -0,0 +1,27 @@
+import threading
+
+from backend.config import SCHEDULE_NOTIFY_CHANNEL
+from backend.database import ScheduleListener, delete_exams_for_modules
+
+
+def test_listener_invalidates_on_committed_schedule_writes(schema_db):
+    changes = threading.Semaphore(0)
+    listener = ScheduleListener(on_change=changes.release, poll_seconds=0.05)
+    listener.start()
+    try:
+        # Connecting (and any reconnect) invalidates: notifications may have been missed
+        assert changes.acquire(timeout=5)
+
+        # Delivered on commit only
+        with schema_db.cursor() as cur:
+            cur.execute("DELETE FROM examens")
+            cur.execute("SELECT pg_notify(%s, 'delete')", (SCHEDULE_NOTIFY_CHANNEL,))
+        schema_db.rollback()
+        delete_exams_for_modules([1])
+        assert changes.acquire(timeout=5)
+        assert not changes.acquire(timeout=0.3)
+        assert listener.notifications == 1
+    finally:
+        listener.stop()
+        listener.join(timeout=5)
+    assert not listener.is_alive()
@@ -0,0 +1,16 @@
+from backend.database import fetch_schedule_page, publish_schedule_version
+from backend.test_schedule_versions import seed_reference_data, stage_version
+
+
+def test_schedule_pages_follow_the_keyset_cursor(schema_db):
+    seed_reference_data(schema_db)
+    publish_schedule_version(stage_version(5))
+
+    first = fetch_schedule_page(department_id=1, page_size=1)
+    assert first["total"] == 2
+    assert first["rows"][0]["formation_approved"] is False
+    second = fetch_schedule_page(department_id=1, after=first["next"], page_size=1)
+    assert second["next"] is None
+    assert {first["rows"][0]["module_id"], second["rows"][0]["module_id"]} == {1, 2}
+
+    assert fetch_schedule_page(department_id=2)["total"] == 0
@@ -0,0 +1,75 @@
+import random
+from datetime import date, datetime, time, timedelta
+
+from backend.schedule_validator import validate_exams
+
+MONDAY = date(2026, 1, 5)
+CAPACITY = {1: 30, 2: 30, 3: 100}
+
+
+def exam(salle_id, prof_id, students, day=MONDAY, start=time(8, 30), duration=90):
+    return {"salle_id": salle_id, "prof_id": prof_id, "student_ids": students,
+            "date_exam": day, "heure_debut": start, "duree_minutes": duration}
+
+
+def base_schedule():
+    return [
+        exam(1, 1, [1, 2]),
+        exam(2, 2, [3, 4]),
+        exam(1, 1, [5], start=time(10, 10)),
+        exam(3, 3, [1, 3], day=MONDAY + timedelta(days=1)),
+    ]
+
+
+def test_each_injected_violation_is_reported_once():
+    assert validate_exams(base_schedule(), CAPACITY)["ok"]
+
+    injected = {
+        "room_overlaps": [exam(2, 4, [6], start=time(9, 0))],
+        "professor_overlaps": [exam(3, 2, [6], start=time(9, 0))],
+        "professor_daily_overload": [exam(3, 1, [6], start=time(11, 50)),
+                                     exam(3, 1, [7], start=time(13, 30))],
+        "student_same_day": [exam(3, 4, [5], start=time(13, 30))],
+        "capacity_overruns": [exam(2, 4, list(range(100, 131)), day=MONDAY + timedelta(days=1))],
+        "friday_exams": [exam(3, 4, [6], day=MONDAY + timedelta(days=4))],
+    }
+    for rule, extra in injected.items():
+        report = validate_exams(base_schedule() + extra, CAPACITY)
+        assert report["counts"] == {r: int(r == rule) for r in injected}, rule
+        assert not report["ok"]
+
+
+def test_overlaps_and_same_day_counts_match_pairwise_checks():
+    rng = random.Random(1)
+    exams = [
+        exam(rng.randint(1, 3), rng.randint(1, 6), rng.sample(range(60), rng.randint(1, 5)),
+             day=MONDAY + timedelta(days=rng.randrange(4)),
+             start=time(8 + rng.randrange(6), 30 * rng.randrange(2)),
+             duration=rng.choice((60, 90, 120)))
+        for _ in range(150)
+    ]
+    report = validate_exams(exams, {1: 100, 2: 100, 3: 100})
+
+    def span(e):
+        start = datetime.combine(e["date_exam"], e["heure_debut"])
+        return start, start + timedelta(minutes=e["duree_minutes"])
+
+    def clashing(key):
+        # Exams overlapping an earlier-starting exam of the same resource
+        clashes = 0
+        for i, a in enumerate(exams):
+            a_start, _ = span(a)
+            if any(b[key] == a[key] and (span(b)[0], j) < (a_start, i) and span(b)[1] > a_start
+                   for j, b in enumerate(exams) if j != i):
+                clashes += 1
+        return clashes
+
+    student_days = {}
+    for e in exams:
+        for s in e["student_ids"]:
+            student_days.setdefault((s, e["date_exam"]), 0)
+            student_days[(s, e["date_exam"])] += 1
+
+    assert report["counts"]["room_overlaps"] == clashing("salle_id")
+    assert report["counts"]["professor_overlaps"] == clashing("prof_id")
+    assert report["counts"]["student_same_day"] == sum(n > 1 for n in student_days.values())
@@ -0,0 +1,114 @@
+from datetime import date, time
+
+import psycopg2
+import pytest
+
+from backend.database import (
+    bulk_insert_schedule,
+    connection,
+    create_schedule_version,
+    fetch_schedule_versions,
+    prune_schedule_versions,
+    publish_schedule_version
+)
+from backend.optimizer import save_schedule
+
+
+def seed_reference_data(conn):
+    with conn.cursor() as cur:
+        cur.execute("""
+            INSERT INTO departements (nom) VALUES ('Informatique');
+            INSERT INTO formations (nom, cycle, niveau, departement_id) VALUES ('L1 Info', 'LICENCE', 1, 1);
+            INSERT INTO modules (nom, formation_id, semestre) VALUES ('Algo', 1, 1), ('BDD', 1, 1);
+            INSERT INTO professeurs (nom, prenom, departement_id) VALUES ('Prof', 'A', 1), ('Prof', 'B', 1);
+            INSERT INTO salles (nom, capacite, type) VALUES ('S1', 30, 'SALLE'), ('S2', 30, 'SALLE');
+            INSERT INTO etudiants (matricule, nom, prenom, date_naissance, formation_id)
+            SELECT 'MAT' || g, 'Etudiant', g::text, '2005-01-01', 1 FROM generate_series(1, 4) g;
+            INSERT INTO inscriptions (etudiant_id, module_id) VALUES (1, 1), (2, 1), (3, 2), (4, 2);
+        """)
+    conn.commit()
+
+
+def stage_version(day):
+    """A staging version with two exams of the given day, as save_schedule writes them"""
+    exams = [
+        {"module_id": m, "salle_id": m, "prof_id": m, "date_exam": date(2026, 1, day),
+         "heure_debut": time(8, 30), "duree_minutes": 90, "student_ids": [2 * m - 1, 2 * m]}
+        for m in (1, 2)
+    ]
+    version_id = create_schedule_version()
+    bulk_insert_schedule(exams, version_id=version_id)
+    return version_id
+
+
+def version_tables():
+    with connection() as conn, conn.cursor() as cur:
+        cur.execute("""
+            SELECT relname FROM pg_class
+            WHERE relkind = 'r' AND relname ~ '^(exam_versions|exam_group_versions|student_exam_day)_v[0-9]+$'
+        """)
+        return {row[0] for row in cur.fetchall()}
+
+
+def statuses():
+    return {v["id"]: v["status"] for v in fetch_schedule_versions()}
+
+
+def test_publish_then_prune_retired_versions(schema_db):
+    seed_reference_data(schema_db)
+    published = []
+    for day in (5, 6, 7):
+        version_id = stage_version(day)
+        publish_schedule_version(version_id)
+        published.append(version_id)
+    v2, v3, v4 = published
+    assert statuses() == {1: "retired", v2: "retired", v3: "retired", v4: "published"}
+
+    assert prune_schedule_versions(keep=1) == [1, v2]
+    assert statuses() == {v3: "retired", v4: "published"}
+    assert not any(name.endswith(("_v1", f"_v{v2}")) for name in version_tables())
+
+    with connection() as conn, conn.cursor() as cur:
+        cur.execute("SELECT COUNT(*), MIN(date_exam) FROM examens")
+        assert cur.fetchone() == (2, date(2026, 1, 7))
+        cur.execute("SELECT COUNT(*) FROM exam_groups")
+        assert cur.fetchone()[0] == 4
+
+
+def test_rollback_to_a_retired_version(schema_db):
+    seed_reference_data(schema_db)
+    first = stage_version(5)
+    publish_schedule_version(first)
+    publish_schedule_version(stage_version(6))
+
+    publish_schedule_version(first)
+    with connection() as conn, conn.cursor() as cur:
+        cur.execute("SELECT DISTINCT date_exam FROM examens")
+        assert cur.fetchall() == [(date(2026, 1, 5),)]
+        cur.execute("SELECT SUM(nb_examens) FROM student_exam_day WHERE version_id = %s", (first,))
+        assert cur.fetchone()[0] == 4
+
+
+def test_prune_keeps_staging_versions(schema_db):
+    seed_reference_data(schema_db)
+    publish_schedule_version(stage_version(5))
+    in_progress = stage_version(6)
+    publish_schedule_version(stage_version(7))
+
+    prune_schedule_versions(keep=0)
+    assert statuses()[in_progress] == "staging"
+    assert f"exam_versions_v{in_progress}" in version_tables()
+
+
+def test_failed_save_drops_its_staging_version(schema_db):
+    seed_reference_data(schema_db)
+    published = stage_version(5)
+    publish_schedule_version(published)
+
+    # Staging tables carry no foreign keys: the unknown module only fails on attach
+    exams = [{"module_id": 99, "salle_id": 1, "prof_id": 1, "date_exam": date(2026, 1, 6),
+              "heure_debut": time(8, 30), "duree_minutes": 90, "student_ids": [1]}]
+    with pytest.raises(psycopg2.errors.ForeignKeyViolation):
+        save_schedule(exams)
+    assert statuses() == {1: "retired", published: "published"}
+    assert not any(name.endswith(f"_v{published + 1}") for name in version_tables())
@@ -0,0 +1,72 @@
+from datetime import date, time
+
+from backend.database import (
+    delete_exams_for_modules,
+    insert_exam,
+    insert_exam_groups,
+    publish_schedule_version
+)
+from backend.test_schedule_versions import seed_reference_data, stage_version
+
+MONDAY = date(2026, 1, 5)
+
+
+def summary_and_recompute(conn):
+    """student_exam_day of the published version, and the same counts rebuilt from the seats"""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT student_id, date_exam, heure_debut, nb_examens
+            FROM student_exam_day
+            WHERE version_id = (SELECT version_id FROM schedule_pointer)
+            ORDER BY 1, 2, 3
+        """)
+        summary = cur.fetchall()
+        cur.execute("""
+            SELECT g.student_id, e.date_exam, e.heure_debut, COUNT(*)
+            FROM exam_groups g
+            JOIN examens e ON e.id = g.exam_id
+            GROUP BY 1, 2, 3
+            ORDER BY 1, 2, 3
+        """)
+        recomputed = cur.fetchall()
+    conn.commit()
+    return summary, recomputed
+
+
+def test_summary_follows_inserts_moves_and_deletes(schema_db):
+    seed_reference_data(schema_db)
+    with schema_db.cursor() as cur:
+        cur.execute("""
+            INSERT INTO professeurs (nom, prenom, departement_id) VALUES ('Prof', 'C', 1);
+            INSERT INTO salles (nom, capacite, type) VALUES ('S3', 30, 'SALLE');
+        """)
+    schema_db.commit()
+    publish_schedule_version(stage_version(5))
+    summary, recomputed = summary_and_recompute(schema_db)
+    assert summary == recomputed and len(summary) == 4
+
+    # Insert: students 1 and 3 get a second exam in the same slot
+    exam_id = insert_exam(2, 3, 3, MONDAY, time(8, 30), 90)
+    insert_exam_groups(exam_id, [1, 3])
+    summary, recomputed = summary_and_recompute(schema_db)
+    assert summary == recomputed
+    assert sorted(row[0] for row in summary if row[3] > 1) == [1, 3]
+
+    # Move a seat to another student, and an exam to another day
+    # (rescheduling deletes and re-inserts it)
+    with schema_db.cursor() as cur:
+        cur.execute("DELETE FROM exam_groups WHERE exam_id = %s AND student_id = 1", (exam_id,))
+    schema_db.commit()
+    insert_exam_groups(exam_id, [2])
+    delete_exams_for_modules([1])
+    moved = insert_exam(1, 1, 1, date(2026, 1, 6), time(10, 10), 90)
+    insert_exam_groups(moved, [1, 2])
+    summary, recomputed = summary_and_recompute(schema_db)
+    assert summary == recomputed
+    assert [row[0] for row in summary if row[3] > 1] == [3]
+
+    # Delete: every seat of the module's exams is released
+    delete_exams_for_modules([2])
+    summary, recomputed = summary_and_recompute(schema_db)
+    assert summary == recomputed
+    assert summary == [(1, date(2026, 1, 6), time(10, 10), 1), (2, date(2026, 1, 6), time(10, 10), 1)]
@@ -0,0 +1,53 @@
+from datetime import date, time
+
+from backend.database import (
+    approve_department_schedule,
+    approve_final_schedule,
+    fetch_student_schedule,
+    publish_schedule_version
+)
+from backend.schedule_cache import bump_schedule_version
+from backend.test_schedule_versions import seed_reference_data, stage_version
+
+
+def rename_module(conn, module_id, nom):
+    """Edits the live data behind the schedule, bypassing the published timetables"""
+    with conn.cursor() as cur:
+        cur.execute("UPDATE modules SET nom = %s WHERE id = %s", (nom, module_id))
+    conn.commit()
+    bump_schedule_version()
+
+
+def published_count(conn):
+    with conn.cursor() as cur:
+        cur.execute("SELECT COUNT(*) FROM student_timetables")
+        return cur.fetchone()[0]
+
+
+def test_approved_schedule_is_read_from_published_timetables(schema_db):
+    seed_reference_data(schema_db)
+    publish_schedule_version(stage_version(5))
+    assert published_count(schema_db) == 0
+
+    approve_final_schedule()
+    assert published_count(schema_db) == 4
+    rename_module(schema_db, 1, "Algo II")
+    schedule = fetch_student_schedule(1)
+    assert [(e["module"], e["date_exam"], e["heure_debut"]) for e in schedule] == [
+        ("Algo", date(2026, 1, 5), time(8, 30))]
+
+    # A new version withdraws the timetables: students read the live schedule
+    publish_schedule_version(stage_version(6))
+    assert published_count(schema_db) == 0
+    assert [e["module"] for e in fetch_student_schedule(1)] == ["Algo II"]
+
+
+def test_department_approval_publishes_its_students(schema_db):
+    seed_reference_data(schema_db)
+    publish_schedule_version(stage_version(5))
+
+    approve_department_schedule(1)
+    assert published_count(schema_db) == 4
+    with schema_db.cursor() as cur:
+        cur.execute("SELECT BOOL_AND(approved) FROM formations WHERE departement_id = 1")
+        assert cur.fetchone()[0] is True
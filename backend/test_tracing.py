@@ -0,0 +1,43 @@
+import json
+from datetime import date
+
+import pytest
+
+from backend.database import fetch_generation_reports
+from backend.optimizer import generate_exam_schedule
+from backend.test_schedule_versions import seed_reference_data
+from backend.tracing import Trace
+
+
+def test_phases_accumulate_and_the_report_is_json():
+    trace = Trace(profile=True)
+    for _ in range(2):
+        with trace.phase("solve"):
+            sum(range(10000))
+    with pytest.raises(ValueError):
+        with trace.phase("save"):
+            raise ValueError("phase failed")
+    trace.count("inserts", 3)
+    trace.add_counters({"inserts": 2, "room_rejections": 1})
+    trace.info["seed"] = 7
+
+    report = json.loads(json.dumps(trace.report()))
+    assert set(report["phases"]) == {"solve", "save"}
+    assert report["total_seconds"] >= sum(report["phases"].values())
+    assert report["counters"] == {"inserts": 5, "room_rejections": 1}
+    assert report["seed"] == 7
+    assert "function calls" in report["profile"]
+
+
+def test_generation_report_is_stored_with_its_run(schema_db):
+    seed_reference_data(schema_db)
+    report = generate_exam_schedule(date(2026, 1, 5), date(2026, 1, 9), seed=0)
+
+    assert list(report["phases"]) == ["load", "prepare", "solve", "save", "validate"]
+    assert report["counters"]["inserts"] == 2 and report["counters"]["seat_inserts"] == 4
+    assert report["counters"]["unscheduled"] == 0
+    assert "profile" not in report
+
+    runs = fetch_generation_reports(limit=1)
+    assert runs[0]["id"] == report["run_id"]
+    assert runs[0]["report"]["counters"] == report["counters"]
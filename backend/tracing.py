@@ -0,0 +1,63 @@
+import cProfile
+import io
+import pstats
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+# =====================================
+# RUN TRACE
+# =====================================
+
+PROFILE_TOP = 30   # functions kept in the cProfile summary
+
+class Trace:
+    """
+    Lightweight per-run instrumentation: phase timers, counters and an
+    optional cProfile capture of the whole run.
+
+        trace = Trace(profile=True)
+        with trace.phase("solve"):
+            ...
+        trace.count("inserts", len(exams))
+        report = trace.report()
+    """
+
+    def __init__(self, profile=False):
+        self.started = time.perf_counter()
+        self.phases = defaultdict(float)
+        self.counters = defaultdict(int)
+        self.info = {}
+        self._profiler = cProfile.Profile() if profile else None
+        if self._profiler is not None:
+            self._profiler.enable()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] += time.perf_counter() - start
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def add_counters(self, counters):
+        for name, n in counters.items():
+            self.counters[name] += n
+
+    def report(self):
+        """JSON-serializable run report (stops the profiler)"""
+        report = {
+            "total_seconds": round(time.perf_counter() - self.started, 4),
+            "phases": {name: round(seconds, 4) for name, seconds in self.phases.items()},
+            "counters": dict(self.counters),
+            **self.info
+        }
+        if self._profiler is not None:
+            self._profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_TOP)
+            report["profile"] = out.getvalue()
+        return report
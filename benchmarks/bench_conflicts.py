@@ -0,0 +1,114 @@
+"""
+Student conflict panel benchmark: the former four-way self-join of
+inscriptions x examens x inscriptions x examens vs a read of the
+student_exam_day summary.
+
+Every scale is solved on a synthetic problem, then written with
+bulk_insert_schedule into temporary tables that shadow the real ones
+(temporary tables come first in the search path). The transaction is
+rolled back, so the stored schedule is left untouched.
+
+    python -m benchmarks.bench_conflicts --scales 13k 100k
+"""
+import argparse
+import time
+
+import numpy as np
+
+from backend.database import get_connection, bulk_insert_schedule, _STUDENT_CONFLICTS_SQL
+from backend.optimizer import prepare_snapshot, solve_schedule
+from benchmarks.synthetic import SCALES, scale_problem
+
+VERSION_ID = 1
+TEMP_BUFFERS = "1GB"    # temporary tables live in backend-local buffers (8MB by default)
+
+# The admin dashboard conflict query before the student_exam_day summary
+SELF_JOIN_SQL = """
+    SELECT st.nom || ' ' || st.prenom AS student, e1.date_exam, e1.heure_debut, COUNT(*) AS nb_conflicts
+    FROM inscriptions i1
+    JOIN examens e1 ON i1.module_id=e1.module_id
+    JOIN inscriptions i2 ON i1.etudiant_id=i2.etudiant_id
+    JOIN examens e2 ON i2.module_id=e2.module_id
+    JOIN etudiants st ON i1.etudiant_id=st.id
+    WHERE e1.id<>e2.id AND e1.date_exam=e2.date_exam AND e1.heure_debut=e2.heure_debut
+    GROUP BY st.id, e1.date_exam, e1.heure_debut
+    HAVING COUNT(*)>1
+    ORDER BY nb_conflicts DESC
+"""
+
+
+def load_temp_schedule(cur, problem):
+    """Temporary etudiants / inscriptions and an empty version VERSION_ID"""
+    cur.execute("""
+        CREATE TEMP TABLE etudiants (id INTEGER PRIMARY KEY, nom VARCHAR(100), prenom VARCHAR(100));
+        CREATE TEMP TABLE inscriptions (etudiant_id INTEGER, module_id INTEGER,
+                                        PRIMARY KEY (etudiant_id, module_id));
+        CREATE TEMP TABLE schedule_pointer (version_id INTEGER);
+    """)
+    for parent in ("exam_versions", "exam_group_versions", "student_exam_day"):
+        cur.execute(f"CREATE TEMP TABLE {parent}_v{VERSION_ID} "
+                    f"(LIKE public.{parent} INCLUDING DEFAULTS INCLUDING INDEXES)")
+    cur.execute(f"""
+        INSERT INTO schedule_pointer VALUES ({VERSION_ID});
+        CREATE TEMP VIEW examens AS SELECT * FROM exam_versions_v{VERSION_ID};
+        CREATE TEMP VIEW student_exam_day AS SELECT * FROM student_exam_day_v{VERSION_ID};
+    """)
+
+    student_ids = problem.student_ids
+    cur.execute("""
+        INSERT INTO etudiants SELECT id, 'Etudiant', id::text FROM unnest(%s) AS id
+    """, (student_ids.tolist(),))
+    counts = np.diff(problem.student_indptr)
+    cur.execute("""
+        INSERT INTO inscriptions SELECT * FROM unnest(%s, %s)
+    """, (np.repeat(student_ids, counts).tolist(),
+          problem.module_ids[problem.student_modules].tolist()))
+    cur.execute("ANALYZE etudiants; ANALYZE inscriptions")
+
+
+def timed_query(cur, query, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cur.execute(query)
+        rows = cur.fetchall()
+        timings.append(time.perf_counter() - start)
+    return min(timings), sum(timings) / len(timings), len(rows)
+
+
+def run_scale(name, repeat):
+    problem = scale_problem(name)
+    exams = solve_schedule(prepare_snapshot(problem), seed=0)["exams"]
+    seats = sum(len(e["student_ids"]) for e in exams)
+    print(f"{name}: {len(problem.student_ids)} students, {len(exams)} exams, {seats} seats")
+
+    # A fresh connection: temp_buffers can only be raised before its first temporary table
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SET temp_buffers = %s", (TEMP_BUFFERS,))
+        load_temp_schedule(cur, problem)
+        start = time.perf_counter()
+        bulk_insert_schedule(exams, version_id=VERSION_ID, conn=conn, commit=False)
+        print(f"  bulk write + summary {time.perf_counter() - start:.3f}s")
+
+        for label, query in (("self-join", SELF_JOIN_SQL), ("summary", _STUDENT_CONFLICTS_SQL)):
+            best, mean, rows = timed_query(cur, query, repeat)
+            print(f"  {label:<10} best {best:.4f}s  mean {mean:.4f}s  ({rows} rows)")
+        cur.close()
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", nargs="+", default=["13k", "100k"], choices=sorted(SCALES))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    for name in args.scales:
+        run_scale(name, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
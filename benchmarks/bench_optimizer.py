@@ -0,0 +1,132 @@
+"""
+Optimizer benchmark on synthetic problems (no database required).
+
+Every (scale, seed) case runs in a fresh process so its peak memory is its
+own. Results are written as JSON; pass a previous result file as --baseline
+to print the relative change of each metric.
+
+    python -m benchmarks.bench_optimizer --scales 2k 13k --seeds 0 1 2 --output bench.json
+    python -m benchmarks.bench_optimizer --scales 13k --improve-seconds 5 --baseline bench.json
+    python -m benchmarks.bench_optimizer --scales 200k --decompose --baseline bench.json
+"""
+import argparse
+import json
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from backend.optimizer import prepare_snapshot, solve_decomposed, solve_schedule
+from backend.schedule_validator import validate_exams
+from benchmarks.synthetic import SCALES, scale_problem
+
+# Metrics compared against a baseline (lower is better for all of them)
+COMPARED = ("wall_seconds", "peak_rss_mb", "unscheduled", "cost")
+
+
+def run_case(scale, seed, improve_seconds, decompose=False):
+    """Builds, solves and validates one synthetic instance; returns its metrics"""
+    started = time.perf_counter()
+    problem = scale_problem(scale, seed=seed)
+    built = time.perf_counter()
+    snapshot = prepare_snapshot(problem)
+    prepared = time.perf_counter()
+    if decompose:
+        result = solve_decomposed(snapshot, seed=seed)
+    else:
+        result = solve_schedule(snapshot, seed=seed, improve_seconds=improve_seconds)
+    solved = time.perf_counter()
+
+    capacity = dict(zip(problem.room_ids.tolist(), problem.room_capacity.tolist()))
+    violations = validate_exams(result["exams"], capacity)["counts"]
+
+    return {
+        "scale": scale,
+        "seed": seed,
+        "improve_seconds": improve_seconds,
+        "decompose": decompose,
+        "students": len(problem.student_ids),
+        "modules": problem.n_modules,
+        "rooms": problem.n_rooms,
+        "professors": problem.n_profs,
+        "slots": len(problem.slots),
+        "build_seconds": round(built - started, 4),
+        "prepare_seconds": round(prepared - built, 4),
+        "solve_seconds": round(solved - prepared, 4),
+        "wall_seconds": round(solved - built, 4),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "slots_tried": result["stats"].get("slots_tried", 0),
+        "room_rejections": result["stats"].get("room_rejections", 0),
+        "prof_rejections": result["stats"].get("prof_rejections", 0),
+        "reconciled": result["stats"].get("reconciled", 0),
+        "exams": len(result["exams"]),
+        **result["score"],
+        "violations": violations,
+    }
+
+
+def compare(results, baseline):
+    """Prints the relative change of COMPARED metrics per (scale, seed, budget, solver)"""
+    key = lambda r: (r["scale"], r["seed"], r["improve_seconds"], r.get("decompose", False))
+    previous = {key(r): r for r in baseline["results"]}
+    for r in results:
+        old = previous.get(key(r))
+        if old is None:
+            continue
+        changes = []
+        for metric in COMPARED:
+            before, after = old[metric], r[metric]
+            if before == after:
+                continue
+            delta = f"{(after - before) / before:+.1%}" if before else f"{before} -> {after}"
+            changes.append(f"{metric} {delta}")
+        print(f"{r['scale']:>5} seed {r['seed']}: {', '.join(changes) or 'unchanged'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic optimizer benchmark")
+    parser.add_argument("--scales", nargs="+", default=["2k", "13k"], choices=list(SCALES))
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0])
+    parser.add_argument("--improve-seconds", type=float, default=0)
+    parser.add_argument("--decompose", action="store_true",
+                        help="solve departments in parallel (solve_decomposed)")
+    parser.add_argument("--output", help="JSON result file (default: stdout)")
+    parser.add_argument("--baseline", help="previous JSON result file to compare with")
+    args = parser.parse_args()
+
+    results = []
+    for scale in args.scales:
+        for seed in args.seeds:
+            # One process per case: ru_maxrss is the peak of that case only
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                case = pool.submit(run_case, scale, seed, args.improve_seconds, args.decompose).result()
+            print(f"{scale:>5} seed {seed}: {case['wall_seconds']:.2f}s, "
+                  f"{case['peak_rss_mb']} MB, {case['unscheduled']} unscheduled, "
+                  f"cost {case['cost']}", file=sys.stderr)
+            results.append(case)
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload)
+    else:
+        print(payload)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Persistence benchmark: row-by-row INSERT path vs bulk COPY path.
+
+Solves a schedule on the current database content, then writes it with
+both writers inside transactions that are rolled back, so the stored
+schedule is left untouched. The row-by-row writer fills the published
+schedule (its student_exam_day triggers fire per row); the bulk writer
+takes the save_schedule path: a staging version filled by COPY, whose
+student_exam_day rows are aggregated in one pass. The staging tables are
+created in the timed transaction, so the rollback removes them too.
+
+    python -m benchmarks.bench_persistence 2026-01-05 2026-01-25
+"""
+import sys
+import time
+from datetime import date
+
+from backend.database import (
+    connection,
+    clear_existing_exams,
+    create_schedule_version,
+    insert_exam,
+    insert_exam_groups,
+    bulk_insert_schedule
+)
+from backend.optimizer import load_snapshot, solve_schedule
+
+
+def write_row_by_row(exams, conn):
+    for exam in exams:
+        exam_id = insert_exam(
+            module_id=exam["module_id"],
+            salle_id=exam["salle_id"],
+            prof_id=exam["prof_id"],
+            date_exam=exam["date_exam"],
+            heure_debut=exam["heure_debut"],
+            duree_minutes=exam["duree_minutes"],
+            conn=conn,
+            commit=False
+        )
+        insert_exam_groups(exam_id, exam["student_ids"], conn=conn, commit=False)
+
+
+def write_bulk(exams, conn):
+    version_id = create_schedule_version(conn=conn, commit=False)
+    bulk_insert_schedule(exams, version_id=version_id, conn=conn, commit=False)
+
+
+def timed_write(writer, exams):
+    with connection() as conn:
+        clear_existing_exams(conn=conn, commit=False)
+        start = time.perf_counter()
+        writer(exams, conn)
+        elapsed = time.perf_counter() - start
+        conn.rollback()
+    return elapsed
+
+
+def main(start_date, end_date, repeat=3):
+    snapshot = load_snapshot(start_date, end_date)
+    exams = solve_schedule(snapshot, seed=0)["exams"]
+    rows = sum(len(e["student_ids"]) for e in exams)
+    print(f"{len(exams)} exams, {rows} exam_groups rows")
+
+    for name, writer in (("row-by-row", write_row_by_row), ("bulk COPY", write_bulk)):
+        timings = [timed_write(writer, exams) for _ in range(repeat)]
+        print(f"{name:<12} best {min(timings):.3f}s  mean {sum(timings) / len(timings):.3f}s")
+
+
+if __name__ == "__main__":
+    main(date.fromisoformat(sys.argv[1]), date.fromisoformat(sys.argv[2]))
@@ -0,0 +1,75 @@
+"""
+Connection benchmark: a fresh connection per request vs the pooled path.
+
+Runs the same live student timetable query (_fetch_live_student_schedule)
+on both paths for a sample of students, sequentially and from several
+threads, and prints the latency percentiles of both paths.
+
+    python -m benchmarks.bench_pool 200 8
+"""
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.database import connection, get_connection, _fetch_live_student_schedule
+
+
+def fetch_unpooled(student_id):
+    """The live timetable query on a brand new connection"""
+    conn = get_connection()
+    try:
+        return _fetch_live_student_schedule(student_id, conn)
+    finally:
+        conn.close()
+
+
+def fetch_pooled(student_id):
+    """The same query on a connection borrowed from the pool"""
+    with connection() as conn:
+        return _fetch_live_student_schedule(student_id, conn)
+
+
+def timed(fetch, student_id):
+    start = time.perf_counter()
+    fetch(student_id)
+    return time.perf_counter() - start
+
+
+def percentiles(latencies):
+    ordered = sorted(latencies)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+    return f"p50 {pick(0.50):7.2f} ms | p95 {pick(0.95):7.2f} ms | p99 {pick(0.99):7.2f} ms"
+
+
+def run(fetch, student_ids, threads):
+    start = time.perf_counter()
+    if threads <= 1:
+        latencies = [timed(fetch, s) for s in student_ids]
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            latencies = list(pool.map(lambda s: timed(fetch, s), student_ids))
+    return latencies, time.perf_counter() - start
+
+
+def main(requests=200, threads=8):
+    with connection() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT DISTINCT student_id FROM exam_groups ORDER BY student_id LIMIT %s", (requests,))
+        student_ids = [row[0] for row in cur.fetchall()]
+        cur.close()
+
+    if not student_ids:
+        print("⚠️ No stored schedule: run generate_exam_schedule first")
+        return
+
+    for label, n_threads in (("sequential", 1), (f"{threads} threads", threads)):
+        for name, fetch in (("new connection", fetch_unpooled), ("pooled", fetch_pooled)):
+            latencies, total = run(fetch, student_ids, n_threads)
+            print(f"{label:>11} | {name:<14} | {percentiles(latencies)} | "
+                  f"{len(student_ids) / total:7.1f} req/s")
+
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    main(requests, threads)
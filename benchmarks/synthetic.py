@@ -0,0 +1,67 @@
+"""
+Synthetic, in-memory ScheduleProblem instances (no database).
+
+The shape follows database/seed_data.py: 7 departments, formations of about
+120 students, 6-9 modules per formation, each student enrolled in 6-9 of
+the modules of their formation, rooms of 20/30/100/300 seats.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+
+from backend.optimizer import generate_slots
+from backend.problem import ScheduleProblem
+
+NB_DEPARTMENTS = 7
+STUDENTS_PER_FORMATION = 120
+MODULES_MIN = 6
+MODULES_MAX = 9
+ROOM_CAPACITIES = [20, 30, 100, 300]
+SESSION_START = date(2026, 1, 5)   # a Monday
+
+# name -> (students, rooms, professors, session length in days)
+SCALES = {
+    "2k": (2000, 60, 120, 14),
+    "13k": (13000, 60, 120, 21),
+    "50k": (50000, 250, 500, 28),
+    "100k": (100000, 350, 1000, 35),
+    "200k": (200000, 500, 1500, 42),
+}
+
+
+def synthetic_problem(students, rooms, professors, days, seed=0):
+    """Builds a reproducible ScheduleProblem; the same seed gives the same instance"""
+    rng = np.random.default_rng(seed)
+    nb_formations = max(1, students // STUDENTS_PER_FORMATION)
+
+    formations = [(f + 1, f % NB_DEPARTMENTS + 1) for f in range(nb_formations)]
+
+    modules_per_formation = rng.integers(MODULES_MIN, MODULES_MAX + 1, size=nb_formations)
+    module_formation = np.repeat(np.arange(nb_formations), modules_per_formation)
+    modules = [(m + 1, f"Module_{m + 1}", int(f) + 1, int(f) % NB_DEPARTMENTS + 1)
+               for m, f in enumerate(module_formation)]
+    first_module = np.concatenate([[0], np.cumsum(modules_per_formation)[:-1]])
+
+    student_formation = np.arange(students) % nb_formations
+    student_rows = [(s + 1, int(f) + 1) for s, f in enumerate(student_formation)]
+
+    # INSCRIPTIONS: 6-9 distinct modules of the student's formation
+    inscriptions = []
+    taken = rng.integers(MODULES_MIN, MODULES_MAX + 1, size=students)
+    for s, f in enumerate(student_formation):
+        available = modules_per_formation[f]
+        chosen = rng.permutation(available)[:min(available, taken[s])] + first_module[f]
+        inscriptions.extend((s + 1, int(m) + 1) for m in chosen)
+
+    room_rows = [(r + 1, f"Salle_{r + 1}", int(c))
+                 for r, c in enumerate(rng.choice(ROOM_CAPACITIES, size=rooms))]
+    prof_rows = [(p + 1, f"Prof_{p + 1:05}", None, int(d))
+                 for p, d in enumerate(rng.integers(1, NB_DEPARTMENTS + 1, size=professors))]
+
+    slots = generate_slots(SESSION_START, SESSION_START + timedelta(days=days - 1))
+    return ScheduleProblem(slots, formations, modules, student_rows, inscriptions, room_rows, prof_rows)
+
+
+def scale_problem(name, seed=0):
+    students, rooms, professors, days = SCALES[name]
+    return synthetic_problem(students, rooms, professors, days, seed=seed)
@@ -0,0 +1,301 @@
+"""
+Bulk dataset generator (COPY based) for the schema in database/schema.sql.
+
+Same shape of data as seed_data.py, but every table is streamed with COPY,
+module lists are cached per formation, ids are assigned in memory and the
+indexes / constraints of the seeded tables are dropped during the load and
+rebuilt once at the end. The same --seed always produces the same dataset.
+
+    python -m database.bulk_seed --students 13000
+    python -m database.bulk_seed --students 100000 --formations 600 --rooms 300 --professors 900
+    python -m database.bulk_seed --students 500000 --formations 3000 --rooms 1500 --professors 4500 --seed 7
+"""
+import argparse
+import hashlib
+import io
+import random
+import time
+from datetime import date, timedelta
+
+import psycopg2
+from faker import Faker
+
+from backend.config import DB_CONFIG
+
+# -------------------------
+# PARAMETERS
+# -------------------------
+MODULES_MIN = 6
+MODULES_MAX = 9
+NB_STAFF = 20
+NB_BUILDINGS = 3
+ROOM_CAPACITIES = [20, 30, 100, 300]
+NAME_POOL_SIZE = 2000          # distinct first / last names drawn from Faker
+STUDENT_CHUNK = 50000          # students generated and copied per round
+REFERENCE_DATE = date(2025, 9, 1)  # birthdays are 18-25 years before this date
+DEPARTMENTS = [
+    "Informatique",
+    "Mathématiques",
+    "Physique",
+    "Chimie",
+    "Biologie",
+    "Agronomie",
+    "STAPS"
+]
+CYCLES = [
+    ("LICENCE", [1, 2, 3]),
+    ("MASTER", [1, 2]),
+    ("INGENIEUR", [1, 2, 3, 4, 5])
+]
+STAFF_ROLES = ["ADMIN", "DOYEN", "VICE_DOYEN", "CHEF_DEPARTEMENT"]
+
+# Load order; TRUNCATE ... CASCADE also empties the schedule tables
+TABLES = ["departements", "formations", "modules", "professeurs", "staff",
+          "batiments", "salles", "etudiants", "etudiant_logins", "inscriptions"]
+# Serial primary key of the tables whose ids are copied explicitly
+SERIAL_KEYS = {t: "id" for t in TABLES if t not in ("etudiant_logins", "inscriptions")}
+SERIAL_KEYS["salles"] = "salle_id"
+
+# -------------------------
+# COPY HELPERS
+# -------------------------
+
+def _copy_value(value):
+    if value is None:
+        return "\\N"
+    return (str(value).replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+
+def copy_rows(cur, table, columns, rows):
+    """Streams rows into table with one COPY; returns the row count"""
+    buf = io.StringIO()
+    count = 0
+    for row in rows:
+        buf.write("\t".join(_copy_value(v) for v in row))
+        buf.write("\n")
+        count += 1
+    buf.seek(0)
+    cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buf)
+    return count
+
+# -------------------------
+# DEFERRED INDEXES / CONSTRAINTS
+# -------------------------
+
+def drop_indexes_and_constraints(cur, tables):
+    """
+    Drops the foreign keys touching `tables`, their primary / unique keys and
+    their other indexes. Constraints cloned onto partitions are left out:
+    they go and come back with their parent. Returns the DDL that recreates
+    them (keys first, then plain indexes, then foreign keys).
+    """
+    cur.execute("""
+        SELECT c.conrelid::regclass::text, c.conname, pg_get_constraintdef(c.oid), c.contype
+        FROM pg_constraint c
+        WHERE c.contype IN ('p', 'u', 'f')
+          AND (c.conrelid = ANY(%(tables)s::regclass[]) OR c.confrelid = ANY(%(tables)s::regclass[]))
+          AND c.conparentid = 0
+          AND NOT EXISTS (SELECT 1 FROM pg_inherits WHERE inhrelid = c.conrelid)
+    """, {"tables": tables})
+    constraints = cur.fetchall()
+
+    cur.execute("""
+        SELECT i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid)
+        FROM pg_index i
+        WHERE i.indrelid = ANY(%(tables)s::regclass[])
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)
+    """, {"tables": tables})
+    indexes = cur.fetchall()
+
+    foreign = [c for c in constraints if c[3] == "f"]
+    keys = [c for c in constraints if c[3] != "f" and c[0] in tables]
+    for table, name, _, _ in foreign + keys:
+        cur.execute(f'ALTER TABLE {table} DROP CONSTRAINT "{name}"')
+    for name, _ in indexes:
+        cur.execute(f"DROP INDEX {name}")
+
+    return ([f'ALTER TABLE {table} ADD CONSTRAINT "{name}" {definition}'
+             for table, name, definition, _ in keys]
+            + [definition for _, definition in indexes]
+            + [f'ALTER TABLE {table} ADD CONSTRAINT "{name}" {definition}'
+               for table, name, definition, _ in foreign])
+
+# -------------------------
+# GENERATORS
+# -------------------------
+
+def plan_formations(nb_formations, rng):
+    """(id, nom, cycle, niveau, departement_id) rows, spread over departments and levels"""
+    levels = [(dept_id, cycle, niv)
+              for dept_id in range(1, len(DEPARTMENTS) + 1)
+              for cycle, niveaux in CYCLES
+              for niv in niveaux]
+    if nb_formations is None:
+        # Same distribution as seed_data.py: 1-2 formations per level
+        counts = [rng.randint(1, 2) for _ in levels]
+    else:
+        counts = [nb_formations // len(levels) + (i < nb_formations % len(levels))
+                  for i in range(len(levels))]
+
+    formations = []
+    for (dept_id, cycle, niv), count in zip(levels, counts):
+        for f_idx in range(count):
+            formations.append((len(formations) + 1, f"{cycle}_{niv}_F{dept_id}_{f_idx + 1}",
+                               cycle, niv, dept_id))
+    return formations
+
+
+def plan_modules(formations, rng):
+    """Module rows and the cached module id list of every formation"""
+    modules = []
+    modules_by_formation = {}
+    for f_id, *_ in formations:
+        ids = []
+        for i in range(1, rng.randint(MODULES_MIN, MODULES_MAX) + 1):
+            module_id = len(modules) + 1
+            modules.append((module_id, f"Module_{i}_F{f_id}", f_id, rng.choice([1, 2]), 3))
+            ids.append(module_id)
+        modules_by_formation[f_id] = ids
+    return modules, modules_by_formation
+
+
+def student_rows(first_id, formation_ids, modules_by_formation, names, rng):
+    """Yields (student, login, inscriptions) for consecutive student ids"""
+    first_names, last_names = names
+    for offset, f_id in enumerate(formation_ids):
+        student_id = first_id + offset
+        matricule = f"MAT{student_id:06}"
+        birthday = REFERENCE_DATE - timedelta(days=rng.randint(18 * 365, 25 * 365))
+        student = (student_id, matricule, rng.choice(last_names), rng.choice(first_names), birthday, f_id)
+        login = (student_id, hashlib.sha256(f"{matricule}{birthday}".encode()).hexdigest())
+
+        modules_for_f = modules_by_formation[f_id]
+        chosen = rng.sample(modules_for_f, min(len(modules_for_f), rng.randint(MODULES_MIN, MODULES_MAX)))
+        yield student, login, [(student_id, m) for m in chosen]
+
+# -------------------------
+# MAIN
+# -------------------------
+
+def seed_dataset(students, formations=None, rooms=60, professors=120, seed=42, conn=None):
+    rng = random.Random(seed)
+    fake = Faker()
+    fake.seed_instance(seed)
+    names = ([fake.first_name() for _ in range(NAME_POOL_SIZE)],
+             [fake.last_name() for _ in range(NAME_POOL_SIZE)])
+
+    own_conn = conn is None
+    if own_conn:
+        conn = psycopg2.connect(**DB_CONFIG)
+    cur = conn.cursor()
+    timings = {}
+    started = time.perf_counter()
+
+    try:
+        cur.execute(f"TRUNCATE {', '.join(TABLES)} RESTART IDENTITY CASCADE")
+        restore = drop_indexes_and_constraints(cur, TABLES)
+        timings["prepare"] = time.perf_counter() - started
+
+        # REFERENCE DATA
+        step = time.perf_counter()
+        formation_rows = plan_formations(formations, rng)
+        module_rows, modules_by_formation = plan_modules(formation_rows, rng)
+
+        copy_rows(cur, "departements", ("id", "nom"), enumerate(DEPARTMENTS, start=1))
+        copy_rows(cur, "formations", ("id", "nom", "cycle", "niveau", "departement_id"), formation_rows)
+        copy_rows(cur, "modules", ("id", "nom", "formation_id", "semestre", "credits"), module_rows)
+        copy_rows(cur, "professeurs", ("id", "nom", "prenom", "specialite", "departement_id"),
+                  ((i, rng.choice(names[1]), rng.choice(names[0]), "Science",
+                    rng.randint(1, len(DEPARTMENTS)))
+                   for i in range(1, professors + 1)))
+
+        staff_hash = hashlib.sha256("password123".encode()).hexdigest()
+        staff = []
+        for i in range(1, NB_STAFF + 1):
+            prenom, nom = rng.choice(names[0]), rng.choice(names[1])
+            role = rng.choice(STAFF_ROLES)
+            dept_id = rng.randint(1, len(DEPARTMENTS)) if role == "CHEF_DEPARTEMENT" else None
+            staff.append((i, nom, prenom, f"staff{i}@univ.example", staff_hash, role, dept_id))
+        copy_rows(cur, "staff", ("id", "nom", "prenom", "email", "password_hash", "role", "departement_id"),
+                  staff)
+
+        copy_rows(cur, "batiments", ("id", "nom"),
+                  ((i, f"Bloc {chr(64 + i)}") for i in range(1, NB_BUILDINGS + 1)))
+        copy_rows(cur, "salles", ("salle_id", "nom", "capacite", "type", "batiment_id"),
+                  ((i, f"Salle_{i}", rng.choice(ROOM_CAPACITIES), "AMPHI" if i % 10 == 0 else "SALLE",
+                    rng.randint(1, NB_BUILDINGS))
+                   for i in range(1, rooms + 1)))
+        timings["reference"] = time.perf_counter() - step
+
+        # STUDENTS + LOGINS + INSCRIPTIONS, streamed in chunks
+        step = time.perf_counter()
+        formation_ids = [f[0] for f in formation_rows]
+        per_formation = [students // len(formation_ids) + (i < students % len(formation_ids))
+                         for i in range(len(formation_ids))]
+        student_formation = [f_id for f_id, n in zip(formation_ids, per_formation) for _ in range(n)]
+
+        inscription_count = 0
+        for start in range(0, students, STUDENT_CHUNK):
+            chunk = list(student_rows(start + 1, student_formation[start:start + STUDENT_CHUNK],
+                                      modules_by_formation, names, rng))
+            copy_rows(cur, "etudiants",
+                      ("id", "matricule", "nom", "prenom", "date_naissance", "formation_id"),
+                      (c[0] for c in chunk))
+            copy_rows(cur, "etudiant_logins", ("etudiant_id", "password_hash"), (c[1] for c in chunk))
+            inscription_count += copy_rows(cur, "inscriptions", ("etudiant_id", "module_id"),
+                                           (row for c in chunk for row in c[2]))
+        timings["students"] = time.perf_counter() - step
+
+        # INDEXES, CONSTRAINTS, SEQUENCES
+        step = time.perf_counter()
+        for ddl in restore:
+            cur.execute(ddl)
+        for table, key in SERIAL_KEYS.items():
+            cur.execute(f"""
+                SELECT setval(pg_get_serial_sequence('{table}', '{key}'), COALESCE(MAX({key}), 0) + 1, false)
+                FROM {table}
+            """)
+        conn.commit()
+        timings["constraints"] = time.perf_counter() - step
+
+        cur.execute(f"ANALYZE {', '.join(TABLES)}")
+        conn.commit()
+
+    except Exception as e:
+        conn.rollback()
+        raise e
+
+    finally:
+        cur.close()
+        if own_conn:
+            conn.close()
+
+    timings["total"] = time.perf_counter() - started
+    return {
+        "formations": len(formation_rows),
+        "modules": len(module_rows),
+        "students": students,
+        "inscriptions": inscription_count,
+        "timings": {k: round(v, 2) for k, v in timings.items()}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk COPY dataset generator")
+    parser.add_argument("--students", type=int, default=13000)
+    parser.add_argument("--formations", type=int, default=None,
+                        help="default: 1-2 per department level, as seed_data.py")
+    parser.add_argument("--rooms", type=int, default=60)
+    parser.add_argument("--professors", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    result = seed_dataset(args.students, args.formations, args.rooms, args.professors, args.seed)
+    print(f"✅ {result['students']} students, {result['formations']} formations, "
+          f"{result['modules']} modules, {result['inscriptions']} inscriptions")
+    print(f"⏱ {result['timings']}")
+
+
+if __name__ == "__main__":
+    main()
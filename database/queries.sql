@@ -6,7 +6,7 @@ FROM examens e
 JOIN modules m ON e.module_id = m.id
 JOIN formations f ON m.formation_id = f.id
 JOIN professeurs p ON e.prof_id = p.id
-JOIN salles s ON e.salle_id = s.id
+JOIN salles s ON e.salle_id = s.salle_id
 ORDER BY f.nom, e.date_exam, e.heure_debut;
 
 -- ===============================
@@ -17,7 +17,7 @@ FROM inscriptions i
 JOIN etudiants st ON i.etudiant_id = st.id
 JOIN examens e ON i.module_id = e.module_id
 JOIN modules m ON e.module_id = m.id
-JOIN salles s ON e.salle_id = s.id
+JOIN salles s ON e.salle_id = s.salle_id
 WHERE st.id = 123;  -- Replace 123 by student_id
 ORDER BY e.date_exam, e.heure_debut;
 
@@ -28,43 +28,36 @@ SELECT p.nom || ' ' || p.prenom AS professeur, m.nom AS module, e.date_exam, e.h
 FROM examens e
 JOIN modules m ON e.module_id = m.id
 JOIN professeurs p ON e.prof_id = p.id
-JOIN salles s ON e.salle_id = s.id
+JOIN salles s ON e.salle_id = s.salle_id
 WHERE p.id = 12   -- Replace 12 by professor_id
 ORDER BY e.date_exam, e.heure_debut;
 
 -- ===============================
 -- 4. Room occupation (total exams per room)
+-- (rollup refreshed on every publish, see schema.sql)
 -- ===============================
-SELECT s.nom AS salle, COUNT(e.id) AS nb_examens, SUM(s.capacite) AS total_capacity
-FROM salles s
-LEFT JOIN examens e ON s.id = e.salle_id
-GROUP BY s.nom
+SELECT salle, nb_examens, total_capacity, nb_etudiants
+FROM rollup_room_usage
 ORDER BY nb_examens DESC;
 
 -- ===============================
 -- 5. Professor workload (exams per professor)
+-- (rollup refreshed on every publish, see schema.sql)
 -- ===============================
-SELECT p.nom || ' ' || p.prenom AS professeur, COUNT(e.id) AS nb_examens
-FROM professeurs p
-LEFT JOIN examens e ON p.id = e.prof_id
-GROUP BY p.id
+SELECT professeur, nb_examens, nb_jours
+FROM rollup_professor_load
 ORDER BY nb_examens DESC;
 
 -- ===============================
 -- 6. Student exam conflicts
 -- Detect students with two exams at the same date/time
+-- (student_exam_day is maintained by triggers, see schema.sql)
 -- ===============================
-SELECT st.nom || ' ' || st.prenom AS student, e1.date_exam, e1.heure_debut, COUNT(*) AS nb_conflicts
-FROM inscriptions i1
-JOIN examens e1 ON i1.module_id = e1.module_id
-JOIN inscriptions i2 ON i1.etudiant_id = i2.etudiant_id
-JOIN examens e2 ON i2.module_id = e2.module_id
-JOIN etudiants st ON i1.etudiant_id = st.id
-WHERE e1.id <> e2.id
-AND e1.date_exam = e2.date_exam
-AND e1.heure_debut = e2.heure_debut
-GROUP BY st.id, e1.date_exam, e1.heure_debut
-HAVING COUNT(*) > 1
+SELECT st.nom || ' ' || st.prenom AS student, d.date_exam, d.heure_debut, d.nb_examens AS nb_conflicts
+FROM student_exam_day d
+JOIN etudiants st ON d.student_id = st.id
+WHERE d.version_id = (SELECT version_id FROM schedule_pointer)
+AND d.nb_examens > 1
 ORDER BY nb_conflicts DESC;
 
 -- ===============================
@@ -89,7 +82,7 @@ ORDER BY nb_conflicts DESC;
 SELECT e.id AS examen_id, m.nom AS module, s.nom AS salle, s.capacite, COUNT(i.etudiant_id) AS registered_students
 FROM examens e
 JOIN modules m ON e.module_id = m.id
-JOIN salles s ON e.salle_id = s.id
+JOIN salles s ON e.salle_id = s.salle_id
 JOIN inscriptions i ON i.module_id = m.id
 GROUP BY e.id, m.nom, s.nom, s.capacite
 HAVING COUNT(i.etudiant_id) > s.capacite
@@ -98,16 +91,10 @@ ORDER BY registered_students DESC;
 -- ===============================
 -- 9. Department exam statistics
 -- Total exams and students per department
+-- (rollup refreshed on every publish, see schema.sql)
 -- ===============================
-SELECT d.nom AS departement,
-       COUNT(DISTINCT e.id) AS total_exams,
-       COUNT(DISTINCT i.etudiant_id) AS total_students
-FROM departements d
-JOIN formations f ON f.departement_id = d.id
-JOIN modules m ON m.formation_id = f.id
-LEFT JOIN examens e ON e.module_id = m.id
-LEFT JOIN inscriptions i ON i.module_id = m.id
-GROUP BY d.nom
+SELECT departement, total_exams, total_students
+FROM rollup_department_stats
 ORDER BY total_exams DESC;
 
 -- ===============================
@@ -131,13 +118,11 @@ AND sl.password_hash='put_hash_here';
 
 -- ===============================
 -- 12. Exams per cycle / level
+-- (rollup refreshed on every publish, see schema.sql)
 -- ===============================
-SELECT f.cycle, f.niveau, COUNT(e.id) AS nb_examens
-FROM examens e
-JOIN modules m ON e.module_id = m.id
-JOIN formations f ON m.formation_id = f.id
-GROUP BY f.cycle, f.niveau
-ORDER BY f.cycle, f.niveau;
+SELECT cycle, niveau, nb_examens
+FROM rollup_exams_per_level
+ORDER BY cycle, niveau;
 
 -- ===============================
 -- 13. Modules per formation
@@ -159,30 +144,29 @@ ORDER BY nb_students DESC;
 
 -- ===============================
 -- 15. Exams scheduled per day
+-- (rollup refreshed on every publish, see schema.sql)
 -- ===============================
-SELECT e.date_exam, COUNT(e.id) AS nb_examens
-FROM examens e
-GROUP BY e.date_exam
-ORDER BY e.date_exam;
+SELECT date_exam, nb_examens
+FROM rollup_exams_per_day
+ORDER BY date_exam;
 
 -- ===============================
 -- 16. Check professor exam distribution fairness
+-- (rollup refreshed on every publish, see schema.sql)
 -- ===============================
-SELECT p.nom || ' ' || p.prenom AS professeur, COUNT(e.id) AS nb_examens
-FROM professeurs p
-LEFT JOIN examens e ON p.id = e.prof_id
-GROUP BY p.id
+SELECT professeur, nb_examens
+FROM rollup_professor_load
 ORDER BY nb_examens;
 
 -- ===============================
 -- 17. Check student maximum 1 exam per day
 -- ===============================
-SELECT st.nom || ' ' || st.prenom AS student, e.date_exam, COUNT(e.id) AS nb_examens
-FROM etudiants st
-JOIN inscriptions i ON st.id = i.etudiant_id
-JOIN examens e ON i.module_id = e.module_id
-GROUP BY st.id, e.date_exam
-HAVING COUNT(e.id) > 1
+SELECT st.nom || ' ' || st.prenom AS student, d.date_exam, SUM(d.nb_examens) AS nb_examens
+FROM student_exam_day d
+JOIN etudiants st ON d.student_id = st.id
+WHERE d.version_id = (SELECT version_id FROM schedule_pointer)
+GROUP BY st.id, d.date_exam
+HAVING SUM(d.nb_examens) > 1
 ORDER BY nb_examens DESC;
 
 -- ===============================
@@ -25,7 +25,8 @@ CREATE TABLE formations (
     nom VARCHAR(120) NOT NULL,
     cycle cycle_type NOT NULL,
     niveau INTEGER NOT NULL,
-    departement_id INTEGER REFERENCES departements(id)
+    departement_id INTEGER REFERENCES departements(id),
+    approved BOOLEAN NOT NULL DEFAULT FALSE
 );
 
 -- ================================
@@ -105,7 +106,7 @@ CREATE TABLE batiments (
 -- ROOMS
 -- ================================
 CREATE TABLE salles (
-    id SERIAL PRIMARY KEY,
+    salle_id SERIAL PRIMARY KEY,
     nom VARCHAR(50),
     capacite INTEGER,
     type room_type,
@@ -113,31 +114,295 @@ CREATE TABLE salles (
 );
 
 -- ================================
--- EXAMS
+-- SCHEDULE VERSIONS
 -- ================================
-CREATE TABLE examens (
+-- Every generation writes a new version; publishing moves the pointer
+CREATE TABLE schedule_versions (
     id SERIAL PRIMARY KEY,
+    status VARCHAR(10) NOT NULL DEFAULT 'staging'
+        CHECK (status IN ('staging','published','retired')),
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    published_at TIMESTAMP
+);
+
+-- Single row: the version every reader sees
+CREATE TABLE schedule_pointer (
+    singleton BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (singleton),
+    version_id INTEGER NOT NULL REFERENCES schedule_versions(id)
+);
+
+-- ================================
+-- EXAMS (one partition per version: exam_versions_v<id>)
+-- ================================
+CREATE TABLE exam_versions (
+    id SERIAL,
+    version_id INTEGER NOT NULL,
     module_id INTEGER REFERENCES modules(id),
     prof_id INTEGER REFERENCES professeurs(id),
-    salle_id INTEGER REFERENCES salles(id),
+    salle_id INTEGER REFERENCES salles(salle_id),
     date_exam DATE NOT NULL,
     heure_debut TIME NOT NULL,
-    duree_minutes INTEGER NOT NULL
-);
+    duree_minutes INTEGER NOT NULL,
+    PRIMARY KEY (version_id, id)
+) PARTITION BY LIST (version_id);
+
+-- ================================
+-- EXAM GROUPS (students seated per exam, exam_group_versions_v<id>)
+-- ================================
+CREATE TABLE exam_group_versions (
+    version_id INTEGER NOT NULL,
+    exam_id INTEGER NOT NULL,
+    student_id INTEGER REFERENCES etudiants(id),
+    PRIMARY KEY (version_id, exam_id, student_id),
+    FOREIGN KEY (version_id, exam_id) REFERENCES exam_versions (version_id, id) ON DELETE CASCADE
+) PARTITION BY LIST (version_id);
+
+-- Readers use examens / exam_groups: the published version only
+-- (partitions of other versions are pruned when the query runs)
+CREATE VIEW examens AS
+SELECT id, module_id, prof_id, salle_id, date_exam, heure_debut, duree_minutes
+FROM exam_versions
+WHERE version_id = (SELECT version_id FROM schedule_pointer);
+
+CREATE VIEW exam_groups AS
+SELECT exam_id, student_id
+FROM exam_group_versions
+WHERE version_id = (SELECT version_id FROM schedule_pointer);
+
+-- ================================
+-- STUDENT EXAM DAY SUMMARY (student_exam_day_v<id>)
+-- ================================
+-- Exams each student sits per slot; nb_examens > 1 is a student conflict.
+-- Staging versions are filled by bulk_insert_schedule, the published one
+-- is kept up to date by the triggers below.
+CREATE TABLE student_exam_day (
+    version_id INTEGER NOT NULL,
+    student_id INTEGER NOT NULL,
+    date_exam DATE NOT NULL,
+    heure_debut TIME NOT NULL,
+    nb_examens INTEGER NOT NULL,
+    PRIMARY KEY (version_id, student_id, date_exam, heure_debut)
+) PARTITION BY LIST (version_id);
+
+-- Conflict panel: only the few conflicting rows are indexed
+CREATE INDEX idx_student_exam_day_conflicts
+ON student_exam_day (version_id) WHERE nb_examens > 1;
+
+-- Initial, empty published version
+INSERT INTO schedule_versions (status, published_at) VALUES ('published', NOW());
+CREATE TABLE exam_versions_v1 PARTITION OF exam_versions FOR VALUES IN (1);
+CREATE TABLE exam_group_versions_v1 PARTITION OF exam_group_versions FOR VALUES IN (1);
+CREATE TABLE student_exam_day_v1 PARTITION OF student_exam_day FOR VALUES IN (1);
+INSERT INTO schedule_pointer (version_id) VALUES (1);
 
 -- ================================
 -- CONSTRAINTS (NO CONFLICTS)
 -- ================================
--- Unique room + date + time
+-- Unique room + date + time (per version)
 CREATE UNIQUE INDEX unique_salle_time
-ON examens (salle_id, date_exam, heure_debut);
+ON exam_versions (version_id, salle_id, date_exam, heure_debut);
 
--- Unique professor + date + time
+-- Unique professor + date + time (per version)
 CREATE UNIQUE INDEX unique_prof_time
-ON examens (prof_id, date_exam, heure_debut);
+ON exam_versions (version_id, prof_id, date_exam, heure_debut);
 
 -- Optional: Unique student exam per day (constraint)
 -- This is an advanced check, can be enforced in code or triggers:
 -- CREATE UNIQUE INDEX unique_student_exam_day
 -- ON examens (etudiant_id, date_exam);  -- requires join with inscriptions
 
+
+-- Student timetable lookups
+CREATE INDEX idx_exam_groups_student
+ON exam_group_versions (version_id, student_id);
+
+-- ================================
+-- STUDENT EXAM DAY TRIGGERS
+-- ================================
+-- A seated student adds one exam to their slot, a removed seat takes it back.
+-- Exams are never moved in place (rescheduling deletes and re-inserts them).
+CREATE FUNCTION track_student_exam_day() RETURNS trigger AS $$
+DECLARE
+    seat RECORD;
+    slot RECORD;
+BEGIN
+    IF TG_OP = 'INSERT' THEN seat := NEW; ELSE seat := OLD; END IF;
+    SELECT date_exam, heure_debut INTO slot
+    FROM exam_versions WHERE version_id = seat.version_id AND id = seat.exam_id;
+    IF NOT FOUND THEN
+        RETURN NULL;    -- cascaded from an exam delete, see release_student_exam_day
+    END IF;
+
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO student_exam_day VALUES
+            (seat.version_id, seat.student_id, slot.date_exam, slot.heure_debut, 1)
+        ON CONFLICT (version_id, student_id, date_exam, heure_debut)
+        DO UPDATE SET nb_examens = student_exam_day.nb_examens + 1;
+    ELSE
+        DELETE FROM student_exam_day
+        WHERE (version_id, student_id, date_exam, heure_debut)
+              = (seat.version_id, seat.student_id, slot.date_exam, slot.heure_debut)
+          AND nb_examens = 1;
+        IF NOT FOUND THEN
+            UPDATE student_exam_day SET nb_examens = nb_examens - 1
+            WHERE (version_id, student_id, date_exam, heure_debut)
+                  = (seat.version_id, seat.student_id, slot.date_exam, slot.heure_debut);
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- A deleted exam releases the slot of all its students (before the cascade
+-- removes its exam_group_versions rows)
+CREATE FUNCTION release_student_exam_day() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM student_exam_day d
+    USING exam_group_versions g
+    WHERE g.version_id = OLD.version_id AND g.exam_id = OLD.id
+      AND (d.version_id, d.student_id, d.date_exam, d.heure_debut)
+          = (OLD.version_id, g.student_id, OLD.date_exam, OLD.heure_debut)
+      AND d.nb_examens = 1;
+    UPDATE student_exam_day d SET nb_examens = d.nb_examens - 1
+    FROM exam_group_versions g
+    WHERE g.version_id = OLD.version_id AND g.exam_id = OLD.id
+      AND (d.version_id, d.student_id, d.date_exam, d.heure_debut)
+          = (OLD.version_id, g.student_id, OLD.date_exam, OLD.heure_debut);
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER student_exam_day_seats
+AFTER INSERT OR DELETE ON exam_group_versions
+FOR EACH ROW EXECUTE FUNCTION track_student_exam_day();
+
+CREATE TRIGGER student_exam_day_exams
+BEFORE DELETE ON exam_versions
+FOR EACH ROW EXECUTE FUNCTION release_student_exam_day();
+
+-- ================================
+-- PUBLISHED STUDENT TIMETABLES
+-- ================================
+-- One denormalized row per student, (re)built when a schedule is approved
+CREATE TABLE student_timetables (
+    student_id INTEGER PRIMARY KEY REFERENCES etudiants(id) ON DELETE CASCADE,
+    timetable JSONB NOT NULL,
+    published_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Keyset pagination of the schedule (date, time, id)
+CREATE INDEX idx_examens_schedule_order
+ON exam_versions (version_id, date_exam, heure_debut, id);
+
+-- ================================
+-- GENERATION RUN REPORTS
+-- ================================
+-- One row per generate_exam_schedule run (phase timers, counters, score)
+CREATE TABLE generation_runs (
+    id SERIAL PRIMARY KEY,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    total_seconds NUMERIC(10, 3),
+    report JSONB NOT NULL
+);
+
+-- ================================
+-- GENERATION JOBS
+-- ================================
+-- Background generate_exam_schedule runs, polled by the admin dashboard
+CREATE TABLE generation_jobs (
+    id SERIAL PRIMARY KEY,
+    status VARCHAR(10) NOT NULL DEFAULT 'queued'
+        CHECK (status IN ('queued','running','done','failed','cancelled')),
+    progress INTEGER NOT NULL DEFAULT 0,
+    phase VARCHAR(20),
+    parameters JSONB NOT NULL,
+    modules_total INTEGER,
+    modules_scheduled INTEGER,
+    modules_unscheduled INTEGER,
+    message TEXT,
+    cancel_requested BOOLEAN NOT NULL DEFAULT FALSE,
+    pid INTEGER,
+    run_id INTEGER REFERENCES generation_runs(id),
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+-- ================================
+-- ANALYTICS ROLLUPS
+-- ================================
+-- Aggregates of the published schedule read by the dashboards and reports.
+-- Every publish (and incremental rescheduling) refreshes them CONCURRENTLY
+-- in its own transaction: readers keep the previous rows meanwhile.
+CREATE MATERIALIZED VIEW rollup_room_usage AS
+SELECT s.salle_id, s.nom AS salle, s.capacite,
+       COUNT(e.id) AS nb_examens,
+       COUNT(e.id) * COALESCE(s.capacite, 0) AS total_capacity,
+       COALESCE(SUM(g.nb_etudiants), 0)::BIGINT AS nb_etudiants
+FROM salles s
+LEFT JOIN examens e ON e.salle_id = s.salle_id
+LEFT JOIN (
+    SELECT exam_id, COUNT(*) AS nb_etudiants FROM exam_groups GROUP BY exam_id
+) g ON g.exam_id = e.id
+GROUP BY s.salle_id, s.nom, s.capacite;
+CREATE UNIQUE INDEX idx_rollup_room_usage ON rollup_room_usage (salle_id);
+
+CREATE MATERIALIZED VIEW rollup_professor_load AS
+SELECT p.id AS prof_id, p.nom || ' ' || p.prenom AS professeur, p.departement_id,
+       COUNT(e.id) AS nb_examens,
+       COUNT(DISTINCT e.date_exam) AS nb_jours
+FROM professeurs p
+LEFT JOIN examens e ON e.prof_id = p.id
+GROUP BY p.id, p.nom, p.prenom, p.departement_id;
+CREATE UNIQUE INDEX idx_rollup_professor_load ON rollup_professor_load (prof_id);
+
+CREATE MATERIALIZED VIEW rollup_department_stats AS
+SELECT d.id AS departement_id, d.nom AS departement,
+       COALESCE(ex.nb_examens, 0) AS total_exams,
+       COALESCE(ex.nb_modules, 0) AS modules_scheduled,
+       COALESCE(st.nb_etudiants, 0) AS total_students
+FROM departements d
+LEFT JOIN (
+    SELECT f.departement_id, COUNT(*) AS nb_examens, COUNT(DISTINCT e.module_id) AS nb_modules
+    FROM examens e
+    JOIN modules m ON e.module_id = m.id
+    JOIN formations f ON m.formation_id = f.id
+    GROUP BY f.departement_id
+) ex ON ex.departement_id = d.id
+LEFT JOIN (
+    SELECT f.departement_id, COUNT(DISTINCT i.etudiant_id) AS nb_etudiants
+    FROM inscriptions i
+    JOIN modules m ON i.module_id = m.id
+    JOIN formations f ON m.formation_id = f.id
+    GROUP BY f.departement_id
+) st ON st.departement_id = d.id;
+CREATE UNIQUE INDEX idx_rollup_department_stats ON rollup_department_stats (departement_id);
+
+CREATE MATERIALIZED VIEW rollup_exams_per_level AS
+SELECT f.cycle, f.niveau, COUNT(e.id) AS nb_examens, COUNT(DISTINCT e.module_id) AS nb_modules
+FROM examens e
+JOIN modules m ON e.module_id = m.id
+JOIN formations f ON m.formation_id = f.id
+GROUP BY f.cycle, f.niveau;
+CREATE UNIQUE INDEX idx_rollup_exams_per_level ON rollup_exams_per_level (cycle, niveau);
+
+-- Seats per day come from the student_exam_day summary
+CREATE MATERIALIZED VIEW rollup_exams_per_day AS
+SELECT e.date_exam, e.nb_examens, COALESCE(d.nb_etudiants, 0) AS nb_etudiants
+FROM (
+    SELECT date_exam, COUNT(*) AS nb_examens FROM examens GROUP BY date_exam
+) e
+LEFT JOIN (
+    SELECT date_exam, SUM(nb_examens)::BIGINT AS nb_etudiants
+    FROM student_exam_day
+    WHERE version_id = (SELECT version_id FROM schedule_pointer)
+    GROUP BY date_exam
+) d ON d.date_exam = e.date_exam;
+CREATE UNIQUE INDEX idx_rollup_exams_per_day ON rollup_exams_per_day (date_exam);
+
+-- Last refresh of every rollup and the schedule version it reflects
+CREATE TABLE rollup_refreshes (
+    name VARCHAR(40) PRIMARY KEY,
+    version_id INTEGER,
+    refreshed_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
@@ -34,6 +34,10 @@ from pages.chef_dashboard import chef_dashboard
 from pages.doyen_dashboard import doyen_dashboard
 from pages.student_dashboard import student_dashboard
 from pages.prof_dashboard import prof_dashboard
+from backend.database import start_schedule_listener
+
+# Keeps this server process's schedule cache in sync with the other processes
+start_schedule_listener()
 
 st.set_page_config(page_title="Exam Planning System", layout="wide")
 
@@ -16,8 +16,66 @@ if PROJECT_ROOT not in sys.path:
 # ==============================
 # IMPORT BACKEND MODULES
 # ==============================
-from backend.database import fetch_admin_dashboard_data
-from backend.optimizer import generate_exam_schedule
+from backend.config import JOB_POLL_SECONDS
+from backend.database import (
+    fetch_admin_dashboard_data,
+    fetch_department_stats,
+    fetch_exams_per_day,
+    fetch_exams_per_level,
+    fetch_generation_jobs,
+    fetch_generation_reports,
+    fetch_schedule_versions,
+    publish_schedule_version
+)
+from backend.jobs import cancel_job, fail_orphaned_jobs, submit_generation_job
+
+
+def show_run_report(report):
+    """Phase timers, counters and score of one generation run"""
+    st.markdown(f"**Last run** · {report['total_seconds']:.2f}s")
+    st.bar_chart({"seconds": report["phases"]})
+    counters = report["counters"]
+    cols = st.columns(4)
+    cols[0].metric("Slots tried", counters.get("slots_tried", 0))
+    cols[1].metric("Room / prof rejections",
+                   f"{counters.get('room_rejections', 0)} / {counters.get('prof_rejections', 0)}")
+    cols[2].metric("Exams inserted", counters.get("inserts", 0))
+    cols[3].metric("Unscheduled modules", counters.get("unscheduled", 0))
+    with st.expander("Run details"):
+        st.json({k: v for k, v in report.items() if k != "profile"})
+        if report.get("profile"):
+            st.code(report["profile"])
+
+
+def show_job_status():
+    """Status of the latest generation job; polled while the job is active"""
+    fail_orphaned_jobs()
+    jobs = fetch_generation_jobs(limit=1)
+    if not jobs:
+        return
+    job = jobs[0]
+
+    if job["status"] in ("queued", "running"):
+        st.session_state["watched_job"] = job["id"]
+        st.progress(job["progress"] / 100,
+                    text=f"Job #{job['id']} · {job['status']} · {job['phase'] or 'waiting'}")
+        if job["modules_total"]:
+            st.caption(f"{job['modules_scheduled'] or 0} / {job['modules_total']} modules scheduled")
+        if st.button("✖️ Cancel generation", disabled=job["cancel_requested"]):
+            cancel_job(job["id"])
+        return
+
+    if job["status"] == "done":
+        st.success(f"✅ Job #{job['id']} done: {job['modules_scheduled']} modules scheduled, "
+                   f"{job['modules_unscheduled']} unscheduled")
+    elif job["status"] == "failed":
+        st.error(f"❌ Job #{job['id']} failed: {job['message']}")
+    else:
+        st.warning(f"⚠️ Job #{job['id']} cancelled, the previous schedule is unchanged")
+
+    # The job we were polling just finished: refresh the whole page (run report)
+    if st.session_state.pop("watched_job", None) == job["id"]:
+        st.rerun()
 
 
 def admin_dashboard(user):
@@ -37,15 +95,70 @@ def admin_dashboard(user):
     with col2:
         end_date = st.date_input("End date")
 
+    starts = st.number_input(
+        "Parallel solves (best schedule is kept)",
+        min_value=1, max_value=64, value=os.cpu_count() or 1
+    )
+
+    improve_seconds = st.number_input(
+        "Improvement time budget per solve (seconds)",
+        min_value=0, max_value=600, value=0
+    )
+
+    decompose = st.checkbox(
+        "Solve departments in parallel (rooms and proctors split between departments)"
+    )
+
+    balance = st.checkbox("Rebalance proctors exactly after the solve (min-cost assignment)")
+
+    profile = st.checkbox("Capture a cProfile summary of the run")
+
     if start_date >= end_date:
         st.warning("⚠️ End date must be after start date")
 
-    if st.button("⚙️ Generate Exam Schedule"):
-        if start_date < end_date:
-            with st.spinner("Generating exam schedule..."):
-                generate_exam_schedule(start_date, end_date)
-            st.success("✅ Exam schedule generated successfully")
-            st.info("📌 The schedule is now available for Chef de Département validation")
+    generate_col, report_col = st.columns([1, 2])
+
+    with generate_col:
+        latest = fetch_generation_jobs(limit=1)
+        active = bool(latest) and latest[0]["status"] in ("queued", "running")
+
+        # Generation runs in a background process; this page only polls its status
+        if st.button("⚙️ Generate Exam Schedule", disabled=active):
+            if start_date < end_date:
+                submit_generation_job(
+                    start_date, end_date,
+                    starts=int(starts), improve_seconds=int(improve_seconds), profile=profile,
+                    decompose=decompose, balance=balance
+                )
+                st.info("📌 Generation started, the schedule will be available for Chef de Département validation")
+                active = True
+
+        st.fragment(run_every=JOB_POLL_SECONDS if active else None)(show_job_status)()
+
+    with report_col:
+        runs = fetch_generation_reports(limit=10)
+        if runs:
+            show_run_report(runs[0]["report"])
+
+    if runs:
+        with st.expander("🕘 Previous generation runs"):
+            st.dataframe([
+                {"run": r["id"], "at": r["created_at"], "seconds": r["total_seconds"],
+                 **r["report"].get("phases", {}),
+                 "unscheduled": r["report"].get("counters", {}).get("unscheduled")}
+                for r in runs
+            ], use_container_width=True)
+
+    versions = fetch_schedule_versions(limit=10)
+    with st.expander("🗂 Schedule versions"):
+        st.dataframe(versions, use_container_width=True)
+        retired = [v["id"] for v in versions if v["status"] == "retired"]
+        if retired:
+            version_id = st.selectbox("Retired version", retired)
+            if st.button("↩️ Publish this version again"):
+                publish_schedule_version(version_id)
+                st.success(f"✅ Version {version_id} is the published schedule again")
+                st.rerun()
 
     st.divider()
 
@@ -53,6 +166,15 @@ def admin_dashboard(user):
     # DASHBOARD ANALYTICS
     # ==============================
     data = fetch_admin_dashboard_data()
+    freshness = data["freshness"]
+    if freshness["refreshed_at"] is None:
+        st.caption("Analytics not computed yet: they are refreshed by the next schedule publication")
+    else:
+        st.caption(f"Analytics as of {freshness['refreshed_at']:%Y-%m-%d %H:%M:%S} "
+                   f"(schedule version {freshness['version_id']})")
+        if freshness["version_id"] != freshness["published_version"]:
+            st.warning(f"Analytics describe version {freshness['version_id']}, "
+                       f"version {freshness['published_version']} is published")
 
     st.subheader("🏫 Room Usage")
     st.dataframe(data["rooms"], use_container_width=True)
@@ -61,4 +183,15 @@ def admin_dashboard(user):
     st.dataframe(data["professors"], use_container_width=True)
 
     st.subheader("⚠️ Students Conflicts")
-    st.dataframe(data["student_conflicts"], use_container_width=True)
\ No newline at end of file
+    st.dataframe(data["student_conflicts"], use_container_width=True)
+
+    st.subheader("🏛 Departments")
+    st.dataframe(fetch_department_stats(), use_container_width=True)
+
+    st.subheader("🎓 Exams per Cycle / Level")
+    st.dataframe(fetch_exams_per_level(), use_container_width=True)
+
+    st.subheader("📅 Exams per Day")
+    days = fetch_exams_per_day()
+    if days:
+        st.bar_chart({"exams": {str(d["date_exam"]): d["nb_examens"] for d in days}})
@@ -4,16 +4,39 @@ import os
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from backend.database import fetch_department_schedule, approve_department_schedule
+from backend.database import (
+    approve_department_schedule,
+    fetch_formations,
+    fetch_modules_by_department,
+    fetch_professors,
+    fetch_rooms
+)
+from backend.incremental import reschedule_incremental
+from utils.filters import schedule_filters, paged_schedule
 
 def chef_dashboard(user):
     st.markdown(f"<h2>Welcome {user['nom']} (Chef de Département)</h2>", unsafe_allow_html=True)
     
-    schedule = fetch_department_schedule(user["departement_id"])
-    
+    department_id = user["departement_id"]
+
     st.write("### Department Exam Schedule")
-    st.dataframe(schedule)
+    formations = [f for f in fetch_formations() if f["departement_id"] == department_id]
+    filters = schedule_filters("chef", formations, fetch_rooms(), fetch_professors())
+    paged_schedule("chef", dict(filters, department_id=department_id))
+
+    modules = {m["id"]: m["nom"] for m in fetch_modules_by_department(department_id)}
+    to_reschedule = st.multiselect(
+        "Modules to reschedule (only these exams are moved)",
+        options=list(modules),
+        format_func=lambda module_id: modules[module_id]
+    )
+    if st.button("Reschedule Selected Modules") and to_reschedule:
+        try:
+            summary = reschedule_incremental(modules=to_reschedule)
+            st.success(f"✅ {summary['exams_written']} exams rewritten, {summary['unscheduled']} modules not placed")
+        except RuntimeError as e:
+            st.warning(f"⏳ {e}")
     
     if st.button("Approve Schedule"):
-        approve_department_schedule(user["departement_id"])
+        approve_department_schedule(department_id)
         st.success("✅ Schedule approved, sent to Doyen")
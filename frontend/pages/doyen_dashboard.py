@@ -4,15 +4,22 @@ import os
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from backend.database import fetch_all_departments_schedule, approve_final_schedule
+from backend.database import (
+    approve_final_schedule,
+    fetch_departments,
+    fetch_formations,
+    fetch_professors,
+    fetch_rooms
+)
+from utils.filters import schedule_filters, paged_schedule
 
 def doyen_dashboard(user):
     st.markdown(f"<h2>Welcome {user['nom']} (Doyen)</h2>", unsafe_allow_html=True)
     
-    schedule = fetch_all_departments_schedule()
-    
     st.write("### All Departments Exam Schedule")
-    st.dataframe(schedule)
+    filters = schedule_filters("doyen", fetch_formations(), fetch_rooms(), fetch_professors(),
+                               departments=fetch_departments())
+    paged_schedule("doyen", filters)
     
     if st.button("Approve All Schedules"):
         approve_final_schedule()
@@ -0,0 +1,84 @@
+import math
+
+import streamlit as st
+
+from backend.config import SCHEDULE_PAGE_SIZE
+from backend.database import fetch_schedule_page
+
+# =====================================
+# SCHEDULE FILTERS
+# =====================================
+
+def _select(label, options, key):
+    """Selectbox over {id: label} with an "All" entry; returns the id or None"""
+    return st.selectbox(
+        label,
+        options=[None] + list(options),
+        format_func=lambda value: "All" if value is None else options[value],
+        key=key
+    )
+
+
+def schedule_filters(key, formations, rooms, professors, departments=None):
+    """
+    Filter widgets above a schedule table.
+    Returns the keyword arguments of fetch_schedule_page.
+    """
+    filters = {}
+    columns = st.columns(5 if departments is not None else 4)
+
+    if departments is not None:
+        with columns[-5]:
+            filters["department_id"] = _select(
+                "Department", {d["id"]: d["nom"] for d in departments}, f"{key}_department")
+    with columns[-4]:
+        filters["formation_id"] = _select(
+            "Formation",
+            {f["id"]: f["nom"] for f in formations
+             if filters.get("department_id") in (None, f["departement_id"])},
+            f"{key}_formation")
+    with columns[-3]:
+        dates = st.date_input("Exam dates", value=(), key=f"{key}_dates")
+        filters["date_from"] = dates[0] if len(dates) > 0 else None
+        filters["date_to"] = dates[1] if len(dates) > 1 else None
+    with columns[-2]:
+        filters["salle_id"] = _select(
+            "Room", {r["salle_id"]: r["nom"] for r in rooms}, f"{key}_room")
+    with columns[-1]:
+        filters["prof_id"] = _select(
+            "Professor", {p["id"]: f"{p['nom']} {p['prenom'] or ''}".strip() for p in professors},
+            f"{key}_prof")
+
+    return filters
+
+# =====================================
+# PAGED SCHEDULE TABLE
+# =====================================
+
+def paged_schedule(key, filters):
+    """
+    Shows one page of the filtered schedule with Previous / Next buttons.
+    The keyset cursors of the pages already seen are kept in the session,
+    and reset whenever the filters change. Returns the rows shown.
+    """
+    state = st.session_state.setdefault(f"{key}_pages", {"filters": None, "cursors": []})
+    if state["filters"] != filters:
+        state["filters"] = filters
+        state["cursors"] = []
+
+    cursors = state["cursors"]
+    page = fetch_schedule_page(**filters, after=cursors[-1] if cursors else None)
+    pages = max(1, math.ceil(page["total"] / SCHEDULE_PAGE_SIZE))
+
+    st.caption(f"Page {len(cursors) + 1} of {pages} · {page['total']} exams")
+    st.dataframe(page["rows"])
+
+    previous, following = st.columns(2)
+    with previous:
+        st.button("⬅️ Previous", key=f"{key}_previous", disabled=not cursors,
+                  on_click=cursors.pop)
+    with following:
+        st.button("Next ➡️", key=f"{key}_next", disabled=page["next"] is None,
+                  on_click=cursors.append, args=(page["next"],))
+
+    return page["rows"]